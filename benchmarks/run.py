@@ -0,0 +1,479 @@
+"""
+This benchmark suite measures the command throughput, call latency, CPU cost and command spacing of the
+VSTLight module against simulated controllers on loopback. Run it from the root of the repository:
+
+    python -m benchmarks.run --output results.json --baseline benchmarks/baseline.json
+
+Results are saved as JSON. When a baseline is given, the throughput, median latency and mean spacing are
+compared to the baseline and the suite exits with status 1 if any of them is worse by more than the tolerance.
+Save the results of a run as `benchmarks/baseline.json` to update the baseline. Metrics ending in `_per_s`
+are better when higher, all other metrics are better when lower.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+import timeit
+from typing import Any, Callable, Dict, List
+
+from src.VSTLight.fleet import ControllerFleet
+from src.VSTLight.io_engine import IOEngine
+from src.VSTLight.network_controller import NetworkController
+from src.VSTLight.protocol import INTENSITY_FRAMES, encode_command
+from src.VSTLight.rate_limiter import RateLimiter
+from src.VSTLight.simulator import Simulator, SimulatorThread, VirtualController
+
+# Number of controllers and threads in the many-controller and many-thread benchmarks
+CONTROLLERS = 8
+THREADS = 8
+
+# Number of threads sharing a single thread-safe controller
+PRODUCERS = 16
+
+# Calls per benchmark, and in quick mode as used in CI
+ROUNDS = 250
+QUICK_ROUNDS = 50
+
+# Default relative change of a metric tolerated before it is flagged as a regression
+TOLERANCE = 0.25
+
+# Metrics compared to the baseline. Tail latencies, jitter and CPU times are reported but vary too
+# much between runs on shared machines to flag regressions on. Encoding times are absolute CPU times
+# of well below a microsecond, which depend on the machine more than on the code
+COMPARED = ("commands_per_s", "latency_p50_ms", "spacing_mean_ms")
+
+Metrics = Dict[str, float]
+
+
+def latency_metrics(latencies: List[float]) -> Metrics:
+    """
+    Summarize the latencies of a number of calls.
+
+    Args:
+    -----
+        latencies (List[float]) [s]: The duration of every call.
+
+    Returns:
+    --------
+        Metrics: The median, 95th and 99th percentile and maximum latency in milliseconds.
+    """
+    ordered = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1e3
+
+    return {
+        "latency_p50_ms": percentile(0.5),
+        "latency_p95_ms": percentile(0.95),
+        "latency_p99_ms": percentile(0.99),
+        "latency_max_ms": ordered[-1] * 1e3,
+    }
+
+
+def spacing_metrics(lights: NetworkController, virtual: VirtualController) -> Metrics:
+    """
+    Summarize the spacing of the commands, as measured by the rate limiter of the controller and as
+    received by the virtual controller.
+
+    Args:
+    -----
+        lights (NetworkController): The controller sending the commands.
+        virtual (VirtualController): The virtual controller receiving the commands.
+
+    Returns:
+    --------
+        Metrics: The mean, standard deviation, minimum and maximum spacing in milliseconds.
+    """
+    stats = lights.limiter.stats
+    received = [record.spacing for record in virtual.records[1:]]
+
+    return {
+        "spacing_mean_ms": stats.mean * 1e3,
+        "spacing_stdev_ms": stats.stdev * 1e3,
+        "spacing_min_ms": stats.minimum * 1e3,
+        "spacing_max_ms": stats.maximum * 1e3,
+        "received_spacing_stdev_ms": (
+            statistics.pstdev(received) * 1e3 if received else 0.0
+        ),
+    }
+
+
+def run_calls(call: Callable[[int], object], rounds: int) -> List[float]:
+    """
+    Run a call a number of times and record the duration of every call.
+
+    Args:
+    -----
+        call (Callable[[int], object]): The call to run, passed the round number.
+        rounds (int): The number of calls.
+
+    Returns:
+    --------
+        List[float]: The duration of every call in seconds.
+    """
+    latencies = []
+
+    for i in range(rounds):
+        start = time.perf_counter()
+        call(i)
+        latencies.append(time.perf_counter() - start)
+
+    return latencies
+
+
+def bench_single(simulator: Simulator, rounds: int, method: str) -> Metrics:
+    """
+    Benchmark a method updating all channels of a single controller.
+
+    Args:
+    -----
+        simulator (Simulator): The running simulator.
+        rounds (int): The number of calls.
+        method (str): `set_all_intensities` or `toggle_all`.
+
+    Returns:
+    --------
+        Metrics: The throughput, latency and spacing of the commands.
+    """
+    virtual = simulator.controllers[0]
+    lights = NetworkController(4, simulator.host, virtual.port)
+    lights.set_all_intensities(128)
+    lights.set_all_on()
+
+    lights.limiter.reset_stats()
+    virtual.records.clear()
+
+    if method == "toggle_all":
+        call: Callable[[int], object] = lambda i: lights.toggle_all()
+    else:
+        call = lambda i: lights.set_all_intensities(i % 255 + 1)
+
+    start = time.perf_counter()
+    latencies = run_calls(call, rounds)
+    elapsed = time.perf_counter() - start
+
+    metrics = {"commands_per_s": 4 * rounds / elapsed}
+    metrics.update(latency_metrics(latencies))
+    metrics.update(spacing_metrics(lights, virtual))
+
+    lights.destroy()
+
+    return metrics
+
+
+def bench_encoding(simulator: Simulator, rounds: int) -> Metrics:
+    """
+    Benchmark the CPU cost of preparing and sending a command, without the 5ms spacing.
+
+    Args:
+    -----
+        simulator (Simulator): The running simulator.
+        rounds (int): The number of commands sent.
+
+    Returns:
+    --------
+        Metrics: The time to look up and to encode a frame, and the CPU time per command sent.
+    """
+    # Best of several repeats, as slower repeats only measure interference from other processes
+    number = 20_000
+
+    # The table lookup done by the controller for every intensity command, `encode_command` is not on the send path
+    lookup = (
+        min(timeit.repeat(lambda: INTENSITY_FRAMES[1][128], number=number)) / number
+    )
+    encode = (
+        min(timeit.repeat(lambda: encode_command("01F128"), number=number)) / number
+    )
+
+    virtual = simulator.controllers[0]
+    lights = NetworkController(
+        4, simulator.host, virtual.port, limiter=RateLimiter(0), reset=False
+    )
+    lights.set_on(2)
+
+    start = time.thread_time()
+    for i in range(20 * rounds):
+        lights.set_intensity(2, i % 256)
+    cpu = (time.thread_time() - start) / (20 * rounds)
+
+    lights.destroy()
+
+    return {
+        "frame_lookup_us": lookup * 1e6,
+        "frame_encode_us": encode * 1e6,
+        "command_cpu_us": cpu * 1e6,
+    }
+
+
+def bench_fleet(simulator: Simulator, rounds: int) -> Metrics:
+    """
+    Benchmark updating all channels of many controllers through a `ControllerFleet`.
+
+    Args:
+    -----
+        simulator (Simulator): The running simulator.
+        rounds (int): The number of calls.
+
+    Returns:
+    --------
+        Metrics: The aggregate throughput and the latency of the calls.
+    """
+    controllers = [
+        NetworkController(4, simulator.host, virtual.port)
+        for virtual in simulator.controllers
+    ]
+    fleet = ControllerFleet(controllers)
+    fleet.set_all_on()
+
+    start = time.perf_counter()
+    latencies = run_calls(lambda i: fleet.set_all_intensities(i % 255 + 1), rounds)
+    elapsed = time.perf_counter() - start
+
+    metrics = {"commands_per_s": 4 * len(controllers) * rounds / elapsed}
+    metrics.update(latency_metrics(latencies))
+
+    fleet.destroy()
+
+    return metrics
+
+
+def bench_engine(simulator: Simulator, rounds: int) -> Metrics:
+    """
+    Benchmark updating all channels of many controllers sharing an `IOEngine`.
+
+    Args:
+    -----
+        simulator (Simulator): The running simulator.
+        rounds (int): The number of updates of every controller.
+
+    Returns:
+    --------
+        Metrics: The aggregate throughput.
+    """
+    engine = IOEngine()
+    controllers = [
+        NetworkController(4, simulator.host, virtual.port, engine=engine)
+        for virtual in simulator.controllers
+    ]
+
+    for lights in controllers:
+        for future in lights.set_all_on():
+            future.result()
+
+    futures: List[Any] = []
+    start = time.perf_counter()
+
+    for i in range(rounds):
+        for lights in controllers:
+            futures.extend(lights.set_all_intensities(i % 255 + 1))
+
+    for future in futures:
+        future.result()
+
+    elapsed = time.perf_counter() - start
+
+    for lights in controllers:
+        lights.destroy()
+
+    engine.shutdown()
+
+    return {"commands_per_s": len(futures) / elapsed}
+
+
+def bench_threads(simulator: Simulator, rounds: int) -> Metrics:
+    """
+    Benchmark many threads, each updating all channels of its own controller.
+
+    Args:
+    -----
+        simulator (Simulator): The running simulator.
+        rounds (int): The number of calls in every thread.
+
+    Returns:
+    --------
+        Metrics: The aggregate throughput and the latency of the calls in all threads.
+    """
+    controllers = [
+        NetworkController(4, simulator.host, virtual.port)
+        for virtual in simulator.controllers[:THREADS]
+    ]
+    latencies: List[float] = []
+
+    def worker(lights: NetworkController) -> None:
+        latencies.extend(
+            run_calls(lambda i: lights.set_all_strobe_modes(i % 10 + 1), rounds)
+        )
+
+    threads = [threading.Thread(target=worker, args=(c,)) for c in controllers]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    metrics = {"commands_per_s": 4 * len(controllers) * rounds / elapsed}
+    metrics.update(latency_metrics(latencies))
+
+    for lights in controllers:
+        lights.destroy()
+
+    return metrics
+
+
+def bench_shared(simulator: Simulator, rounds: int) -> Metrics:
+    """
+    Benchmark many threads sharing a single thread-safe controller in queued mode.
+
+    Args:
+    -----
+        simulator (Simulator): The running simulator.
+        rounds (int): The number of commands, shared between the threads.
+
+    Returns:
+    --------
+        Metrics: The throughput and the latency of handing a command to the sender thread.
+    """
+    virtual = simulator.controllers[0]
+    lights = NetworkController(
+        4, simulator.host, virtual.port, queued=True, thread_safe=True
+    )
+    latencies: List[float] = []
+    calls = max(1, rounds // PRODUCERS)
+
+    def worker(channel_id: int) -> None:
+        latencies.extend(
+            run_calls(lambda i: lights.set_strobe_mode(channel_id, i % 10 + 1), calls)
+        )
+
+    threads = [
+        threading.Thread(target=worker, args=(i % 4 + 1,)) for i in range(PRODUCERS)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    lights.wait_settled()
+    elapsed = time.perf_counter() - start
+
+    metrics = {"commands_per_s": PRODUCERS * calls / elapsed}
+    metrics.update(latency_metrics(latencies))
+
+    lights.destroy()
+
+    return metrics
+
+
+def run(rounds: int) -> Dict[str, Any]:
+    """
+    Run all benchmarks against a simulator in a background thread.
+
+    Args:
+    -----
+        rounds (int): The number of calls per benchmark.
+
+    Returns:
+    --------
+        Dict[str, Any]: The results, with the metrics of every benchmark under `benchmarks`.
+    """
+    simulator = Simulator(max(CONTROLLERS, THREADS), reply=False)
+    benchmarks: Dict[str, Metrics] = {}
+
+    with SimulatorThread(simulator):
+        benchmarks["single_set_all_intensities"] = bench_single(
+            simulator, rounds, "set_all_intensities"
+        )
+        benchmarks["single_toggle_all"] = bench_single(simulator, rounds, "toggle_all")
+        benchmarks["encoding"] = bench_encoding(simulator, rounds)
+        benchmarks["fleet_set_all_intensities"] = bench_fleet(simulator, rounds)
+        benchmarks["engine_set_all_intensities"] = bench_engine(simulator, rounds)
+        benchmarks["threads_set_all_strobe_modes"] = bench_threads(simulator, rounds)
+        benchmarks["shared_set_strobe_mode"] = bench_shared(simulator, rounds)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rounds": rounds,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "benchmarks": benchmarks,
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """
+    Compare the metrics listed in `COMPARED` to a baseline. Metrics missing from either side, or 0 in
+    the baseline, are skipped.
+
+    Args:
+    -----
+        results (Dict[str, Any]): The results of the current run.
+        baseline (Dict[str, Any]): The stored results to compare to.
+        tolerance (float): The relative change of a metric tolerated, e.g. 0.25 for 25%.
+
+    Returns:
+    --------
+        List[str]: A description of every metric worse than the baseline by more than the tolerance.
+    """
+    regressions = []
+
+    for name, metrics in baseline["benchmarks"].items():
+        for metric, base in metrics.items():
+            current = results["benchmarks"].get(name, {}).get(metric)
+
+            if metric not in COMPARED or current is None or base == 0:
+                continue
+
+            change = (current - base) / base
+            worse = -change if metric.endswith("_per_s") else change
+
+            if worse > tolerance:
+                regressions.append(
+                    f"{name}.{metric}: {base:.4g} -> {current:.4g} ({change:+.1%})"
+                )
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the VSTLight module.")
+    parser.add_argument("--quick", action="store_true", help="Run fewer rounds")
+    parser.add_argument("--output", help="File to save the results to as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    results = run(QUICK_ROUNDS if args.quick else ROUNDS)
+
+    for name, metrics in results["benchmarks"].items():
+        print(name)
+        for metric, value in metrics.items():
+            print(f"    {metric}: {value:.4g}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+
+        for regression in regressions:
+            print(f"Regression: {regression}")
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,31 @@
 from .network_controller import NetworkController
+from .async_network_controller import AsyncNetworkController
+from .channel import ChannelBank
+from .client import ControllerClient
+from .command_queue import Backpressure, Priority
+from .fleet import ControllerFleet
+from .io_engine import IOEngine
+from .metrics import Metrics, Stage
+from .mirror import StateMirror
+from .protocol import CommandResult, ResponseStatus
+from .rate_limiter import RateLimiter
+from .scene import ChannelSetting, Scene
 
-__all__ = ["NetworkController"]
+__all__ = [
+    "NetworkController",
+    "AsyncNetworkController",
+    "Backpressure",
+    "ChannelBank",
+    "ChannelSetting",
+    "CommandResult",
+    "ControllerClient",
+    "ControllerFleet",
+    "IOEngine",
+    "Metrics",
+    "Priority",
+    "RateLimiter",
+    "ResponseStatus",
+    "Scene",
+    "Stage",
+    "StateMirror",
+]
@@ -0,0 +1,331 @@
+import asyncio
+import time
+from typing import Optional
+from .channel import ChannelBank
+from .protocol import INTENSITY_FRAMES, MAX_STROBE_MODE, STROBE_FRAMES, WAIT_TIME
+from .utils import validate_ip_format, async_compare_and_wait
+
+# Timeout in seconds when establishing the connection to the controller
+CONNECT_TIMEOUT = 5
+
+
+class AsyncNetworkController:
+    """
+    Class representing a VLP light controller for use with asyncio. Provides the same interface
+    as `NetworkController`, but all methods that communicate with the controller are coroutines.
+    Commands are written using asyncio streams and the 5ms spacing between commands is awaited,
+    so the event loop is never blocked while waiting on the controller.
+    """
+
+    def __init__(
+        self,
+        channels: int,
+        ip: str = "192.168.11.20",
+        port: int = 1000,
+        bank: Optional[ChannelBank] = None,
+    ) -> None:
+        """
+        Initialize the AsyncNetworkController object. Init will throw `ValueErrors` if the IP
+        address is invalid or the specified number of channels is not supported by the controller.
+
+        The connection to the controller is not opened by init, as this requires a running event
+        loop. Call and await `connect` before sending any commands to the controller:
+
+        ```python
+        lights = AsyncNetworkController(4)
+        await lights.connect()
+        ```
+
+        The physical VLP light controller has a limit to the number of commands it can
+        process continously. To avoid overloading the controller, commands are limited
+        to one every 5ms. If a command is sent before this time has passed, the calling
+        coroutine is suspended until the time has passed. Commands issued concurrently from
+        several tasks are sent one at a time in the order they were issued.
+
+        Args:
+        -----
+            channels (int): The number of channels the controller object should have. Must be between 1 and 4.
+            ip (str): The IP address of the controller. Defaults to the native IP address of the VLP controllers.
+            port (int): The port of the controller [0-65535]. Hard coded to 1000 in the VLP controllers.
+            bank (Optional[ChannelBank]): Bank storing the channel state, shared with other controllers. Defaults to a bank of its own.
+        """
+        # Validate arguments
+        if not validate_ip_format(ip):
+            raise ValueError(f"Invalid IP address: {ip}")
+
+        if not 0 <= port <= 65535:
+            raise ValueError(f"Invalid port: {port} - Must be a positive integer")
+
+        if channels not in [1, 2, 3, 4]:
+            raise ValueError(
+                f"Invalid number of channels: {channels} - Must be between 1 and 4"
+            )
+
+        # Set internal variables, the stream and send lock are created on connect
+        self.__ip = ip
+        self.__channel_count = channels
+        self.__bank = bank if bank is not None else ChannelBank()
+        self.__offset = self.__bank.allocate(channels)
+        self.__port = port
+        self.__writer: Optional[asyncio.StreamWriter] = None
+        self.__send_lock: Optional[asyncio.Lock] = None
+        self.__last_cmd_time = 0.0
+
+    async def connect(self, reset: bool = True) -> None:
+        """
+        Connect to the controller and initialize all channels to off with strobe mode 1. If the
+        controller is unreachable within 5 seconds a `ConnectionError` will be raised. Connecting
+        many controllers concurrently, e.g. with `asyncio.gather`, takes as long as connecting one.
+
+        Args:
+        -----
+            reset (bool): Initialize the channels. If False, no commands are sent and the local state
+                assumes the defaults regardless of the actual state of the controller.
+        """
+        try:
+            _, self.__writer = await asyncio.wait_for(
+                asyncio.open_connection(self.__ip, self.__port), CONNECT_TIMEOUT
+            )
+        except Exception as e:
+            raise ConnectionError(
+                f"Failed to connect to controller with IP: {self.__ip}"
+            ) from e
+
+        # The lock must be created while the event loop is running (Python < 3.10)
+        self.__send_lock = asyncio.Lock()
+
+        if not reset:
+            return
+
+        # Initialize all controller channels to intensity 0 (off)
+        for i in range(self.__channel_count):
+            await self.set_off(i + 1)
+            await self.set_strobe_mode(i + 1, 1)
+
+    async def destroy(self) -> None:
+        """
+        Destroys the AsyncNetworkController object. All channels are set to off and the connection to the controller is closed.
+        """
+        for i in range(self.__channel_count):
+            await self.set_off(i + 1)
+
+        if self.__writer is not None:
+            self.__writer.close()
+            await self.__writer.wait_closed()
+            self.__writer = None
+
+    async def set_intensity(self, channel_id: int, value: int) -> None:
+        """
+        Set the light intensity of a channel. If the channel is off, the intensity will be set locally but not transmitted
+        to the controller. If the channel is on, the intensity will additionally be transmitted to the controller.
+
+        Args:
+        -----
+            channel_id (int): The channel to set the intensity of. Corresponds to the channel number on the controller [1-4].
+            value (int): The intensity to update the channel with. Only 8 bit values are accepted [0-255].
+        """
+        # Validate arguments
+        self.__verify_channel_id(channel_id)
+
+        if not 0 <= value <= 255:
+            raise ValueError("Channel intensity must be between 0 and 255")
+
+        # Convert channel ID to index
+        channel_idx = channel_id - 1
+
+        # Update the stored channel intensity
+        self.__bank.set_intensity(self.__offset + channel_idx, value)
+
+        # Update the value on the controller if the channel is on
+        if self.__bank.get_state(self.__offset + channel_idx):
+            await self.__send_command(INTENSITY_FRAMES[channel_idx][value])
+
+    def get_intensity(self, channel_id: int) -> int:
+        """
+        Get the current intensity of a channel. The value is read from the local channel state,
+        so this method is not a coroutine.
+
+        Args:
+        -----
+            channel_id (int): The channel to get the intensity of. Corresponds to the channel number on the controller [1-4].
+
+        Returns:
+        --------
+            int: The current intensity of the channel.
+        """
+        # Validate arguments
+        self.__verify_channel_id(channel_id)
+
+        return self.__bank.get_intensity(self.__offset + channel_id - 1)
+
+    async def set_on(self, channel_id: int) -> None:
+        """
+        Set the state of a channel on the controller.
+
+        Args:
+        -----
+            channel_id (int): The channel to turn on. Corresponds to the channel number on the controller [1-4].
+        """
+        # Validate arguments
+        self.__verify_channel_id(channel_id)
+
+        # Convert channel ID to index
+        channel_idx = channel_id - 1
+
+        # Update the stored channel state and send the command if the intensity is greater than 0
+        self.__bank.set_state(self.__offset + channel_idx, True)
+        intensity = self.__bank.get_intensity(self.__offset + channel_idx)
+
+        if intensity > 0:
+            await self.__send_command(INTENSITY_FRAMES[channel_idx][intensity])
+
+    async def set_off(self, channel_id: int) -> None:
+        """
+        Set the state of a channel on the controller.
+
+        Args:
+        -----
+            channel_id (int): The channel to turn off. Corresponds to the channel number on the controller [1-4].
+        """
+        # Validate arguments
+        self.__verify_channel_id(channel_id)
+
+        # Convert channel ID to index
+        channel_idx = channel_id - 1
+
+        # Update the stored channel state and send the command
+        self.__bank.set_state(self.__offset + channel_idx, False)
+        await self.__send_command(INTENSITY_FRAMES[channel_idx][0])
+
+    async def toggle(self, channel_id: int) -> None:
+        """
+        Toggle the state of a channel on the controller between on and off (Inverting current state).
+
+        Args:
+        -----
+            channel_id (int): The channel to toggle. Corresponds to the channel number on the controller [1-4].
+        """
+        # Validate arguments
+        self.__verify_channel_id(channel_id)
+
+        # Toggle the state of the channel
+        if self.__bank.get_state(self.__offset + channel_id - 1):
+            await self.set_off(channel_id)
+        else:
+            await self.set_on(channel_id)
+
+    async def set_strobe_mode(self, channel_id: int, mode: int) -> None:
+        """
+        Set the strobe mode of a channel on the controller. Refer to `NetworkController.set_strobe_mode`
+        for a list of the available strobe modes.
+
+        Args:
+        -----
+            channel_id (int): The channel to set the strobe mode of. Corresponds to the channel number on the controller [1-4].
+            mode (int): The strobe mode to set [1-10]. Leading zeros are not required.
+        """
+        # Validate arguments
+        self.__verify_channel_id(channel_id)
+
+        if not 0 < mode <= MAX_STROBE_MODE:
+            raise ValueError(
+                f"Strobe mode identifyer must be integer between 1 and 10, got: {mode}"
+            )
+
+        # Convert channel ID to index
+        channel_idx = channel_id - 1
+
+        # Update the stored channel strobe mode and send the command
+        self.__bank.set_strobe_mode(self.__offset + channel_idx, mode)
+        await self.__send_command(STROBE_FRAMES[channel_idx][mode - 1])
+
+    def get_strobe_mode(self, channel_id: int) -> int:
+        """
+        Get the strobe mode of a channel on the controller. The value is read from the local
+        channel state, so this method is not a coroutine.
+
+        Returns:
+        --------
+            int: Strobe mode of the specified channel
+        """
+        # Validate arguments
+        self.__verify_channel_id(channel_id)
+
+        return self.__bank.get_strobe_mode(self.__offset + channel_id - 1)
+
+    async def set_all_intensities(self, value: int) -> None:
+        """
+        Set the intensity of all channels to the same value.
+
+        Args:
+        -----
+            value (int): The intensity to set all channels to. Only 8 bit values are accepted [0-255].
+        """
+        for i in range(self.__channel_count):
+            await self.set_intensity(i + 1, value)
+
+    async def set_all_on(self) -> None:
+        """
+        Set all channels to the on state.
+        """
+        for i in range(self.__channel_count):
+            await self.set_on(i + 1)
+
+    async def set_all_off(self) -> None:
+        """
+        Set all channels to the off state.
+        """
+        for i in range(self.__channel_count):
+            await self.set_off(i + 1)
+
+    async def toggle_all(self) -> None:
+        """
+        Toggle the state of all channels on the controller between on and off (Inverting current state).
+        """
+        for i in range(self.__channel_count):
+            await self.toggle(i + 1)
+
+    async def set_all_strobe_modes(self, mode: int) -> None:
+        """
+        Set the strobe mode of all channels on the controller. Refer to `NetworkController.set_strobe_mode`
+        for a list of the available strobe modes.
+
+        Args:
+        -----
+            mode (int): The strobe mode to set [1-10]. Leading zeros are not required.
+        """
+        for i in range(self.__channel_count):
+            await self.set_strobe_mode(i + 1, mode)
+
+    def __verify_channel_id(self, channel_id: int) -> None:
+        """
+        Verify that a channel ID is valid. Throws a ValueError if the channel ID if not.
+
+        Args:
+        -----
+            channel_id (int): The channel ID to verify.
+        """
+        if not 1 <= channel_id <= self.__channel_count:
+            raise ValueError(f"Channel ID must be between 1 and {self.__channel_count}")
+
+    async def __send_command(self, frame: bytes) -> None:
+        """
+        Write a frame in the VLP IP protocol format to the controller stream. Frames are looked up
+        in the precomputed tables of the `protocol` module, so no encoding takes place here.
+
+        Args:
+        -----
+            frame (bytes): The encoded frame to send to the controller.
+        """
+        if self.__writer is None or self.__send_lock is None:
+            raise ConnectionError(
+                f"Not connected to controller with IP: {self.__ip} - Await connect() first"
+            )
+
+        # Only one task at a time may wait for the controller, keeping commands in order and spaced
+        async with self.__send_lock:
+            await async_compare_and_wait(self.__last_cmd_time, WAIT_TIME)
+            self.__last_cmd_time = time.monotonic()
+
+            self.__writer.write(frame)
+            await self.__writer.drain()
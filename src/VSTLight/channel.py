@@ -1,4 +1,8 @@
+import threading
 from enum import Enum
+from typing import List, Sequence
+from .protocol import MAX_INTENSITY, MAX_STROBE_MODE
+from .scene import ChannelSetting, Scene
 
 
 class ChannelState(Enum):
@@ -107,3 +111,387 @@ class Channel:
         Toggle the state of the channel.
         """
         self._state = ChannelState(not self._state.value)
+
+
+# Bytes per channel in a bank: intensity, on-off state and strobe mode
+CHANNEL_SIZE = 3
+_INTENSITY = 0
+_STATE = 1
+_STROBE_MODE = 2
+
+
+class ChannelBank:
+    """
+    Class representing the state of any number of channels, e.g. every channel of every controller of a
+    fleet, packed into a single `bytearray` of 3 bytes per channel: intensity, on-off state and strobe mode.
+    Reading or writing the state of a channel is a single array access, and reading a field of a range of
+    channels a single slice. Controllers allocate a range of channels with `allocate` and address their
+    channels by the returned offset plus the zero-indexed channel. The accessors assume valid arguments,
+    as the controllers validate them. Indexing the bank returns a validated `ChannelView` of a channel.
+    """
+
+    __slots__ = ("_data", "_lock")
+
+    def __init__(self, channels: int = 0) -> None:
+        """
+        Initialize the bank with a number of channels that are off with intensity 0 and strobe mode 1.
+
+        Args:
+        -----
+            channels (int): The number of channels to create. More may be added with `allocate`.
+        """
+        self._data = bytearray()
+        self._lock = threading.Lock()
+
+        if channels:
+            self.allocate(channels)
+
+    def __len__(self) -> int:
+        """
+        Returns:
+        --------
+            int: The number of channels in the bank.
+        """
+        return len(self._data) // CHANNEL_SIZE
+
+    def __getitem__(self, idx: int) -> "ChannelView":
+        """
+        Get a view of a channel, with the interface of `Channel`.
+
+        Args:
+        -----
+            idx (int): The zero-indexed position of the channel in the bank.
+
+        Returns:
+        --------
+            ChannelView: The view reading and writing the channel in the bank.
+        """
+        if not 0 <= idx < len(self):
+            raise IndexError(f"Channel index out of range: {idx}")
+
+        return ChannelView(self, idx)
+
+    def allocate(self, channels: int) -> int:
+        """
+        Add a range of channels that are off with intensity 0 and strobe mode 1 to the end of the bank.
+
+        Args:
+        -----
+            channels (int): The number of channels to add.
+
+        Returns:
+        --------
+            int: The position of the first added channel in the bank.
+        """
+        with self._lock:
+            offset = len(self)
+            self._data += bytes((0, 0, 1)) * channels
+
+        return offset
+
+    def get_intensity(self, idx: int) -> int:
+        """
+        Get the intensity of a channel.
+
+        Args:
+        -----
+            idx (int): The position of the channel in the bank.
+
+        Returns:
+        --------
+            int: The intensity of the channel.
+        """
+        return self._data[idx * CHANNEL_SIZE + _INTENSITY]
+
+    def set_intensity(self, idx: int, value: int) -> None:
+        """
+        Set the intensity of a channel.
+
+        Args:
+        -----
+            idx (int): The position of the channel in the bank.
+            value (int): The intensity of the channel [0-255].
+        """
+        self._data[idx * CHANNEL_SIZE + _INTENSITY] = value
+
+    def get_state(self, idx: int) -> bool:
+        """
+        Get the on-off state of a channel.
+
+        Args:
+        -----
+            idx (int): The position of the channel in the bank.
+
+        Returns:
+        --------
+            bool: The state of the channel [On: True, Off: False].
+        """
+        return self._data[idx * CHANNEL_SIZE + _STATE] == 1
+
+    def set_state(self, idx: int, state: bool) -> None:
+        """
+        Set the on-off state of a channel.
+
+        Args:
+        -----
+            idx (int): The position of the channel in the bank.
+            state (bool): The state of the channel [On: True, Off: False].
+        """
+        self._data[idx * CHANNEL_SIZE + _STATE] = state
+
+    def get_strobe_mode(self, idx: int) -> int:
+        """
+        Get the strobe mode of a channel.
+
+        Args:
+        -----
+            idx (int): The position of the channel in the bank.
+
+        Returns:
+        --------
+            int: The strobe mode of the channel.
+        """
+        return self._data[idx * CHANNEL_SIZE + _STROBE_MODE]
+
+    def set_strobe_mode(self, idx: int, mode: int) -> None:
+        """
+        Set the strobe mode of a channel.
+
+        Args:
+        -----
+            idx (int): The position of the channel in the bank.
+            mode (int): The strobe mode of the channel [1-10].
+        """
+        self._data[idx * CHANNEL_SIZE + _STROBE_MODE] = mode
+
+    def intensities(self, start: int, stop: int) -> bytes:
+        """
+        Get the intensities of a range of channels.
+
+        Args:
+        -----
+            start (int): The position of the first channel in the bank.
+            stop (int): The position following the last channel.
+
+        Returns:
+        --------
+            bytes: The intensity of each channel.
+        """
+        return bytes(self._data[self.__field(start, stop, _INTENSITY)])
+
+    def set_intensities(self, start: int, values: Sequence[int]) -> None:
+        """
+        Set the intensities of a range of channels.
+
+        Args:
+        -----
+            start (int): The position of the first channel in the bank.
+            values (Sequence[int]): The intensity of each channel [0-255].
+        """
+        self._data[self.__field(start, start + len(values), _INTENSITY)] = bytes(values)
+
+    def states(self, start: int, stop: int) -> List[bool]:
+        """
+        Get the on-off states of a range of channels.
+
+        Args:
+        -----
+            start (int): The position of the first channel in the bank.
+            stop (int): The position following the last channel.
+
+        Returns:
+        --------
+            List[bool]: The state of each channel [On: True, Off: False].
+        """
+        return [state == 1 for state in self._data[self.__field(start, stop, _STATE)]]
+
+    def set_states(self, start: int, states: Sequence[bool]) -> None:
+        """
+        Set the on-off states of a range of channels.
+
+        Args:
+        -----
+            start (int): The position of the first channel in the bank.
+            states (Sequence[bool]): The state of each channel [On: True, Off: False].
+        """
+        self._data[self.__field(start, start + len(states), _STATE)] = bytes(states)
+
+    def strobe_modes(self, start: int, stop: int) -> bytes:
+        """
+        Get the strobe modes of a range of channels.
+
+        Args:
+        -----
+            start (int): The position of the first channel in the bank.
+            stop (int): The position following the last channel.
+
+        Returns:
+        --------
+            bytes: The strobe mode of each channel.
+        """
+        return bytes(self._data[self.__field(start, stop, _STROBE_MODE)])
+
+    def set_strobe_modes(self, start: int, modes: Sequence[int]) -> None:
+        """
+        Set the strobe modes of a range of channels.
+
+        Args:
+        -----
+            start (int): The position of the first channel in the bank.
+            modes (Sequence[int]): The strobe mode of each channel [1-10].
+        """
+        self._data[self.__field(start, start + len(modes), _STROBE_MODE)] = bytes(modes)
+
+    def pack(self, start: int, stop: int) -> bytes:
+        """
+        Get the packed state of a range of channels, 3 bytes per channel: intensity, state and strobe mode.
+
+        Args:
+        -----
+            start (int): The position of the first channel in the bank.
+            stop (int): The position following the last channel.
+
+        Returns:
+        --------
+            bytes: The packed state of the channels.
+        """
+        return bytes(self._data[start * CHANNEL_SIZE : stop * CHANNEL_SIZE])
+
+    def capture(self, start: int, stop: int) -> Scene:
+        """
+        Get the state of a range of channels as a scene.
+
+        Args:
+        -----
+            start (int): The position of the first channel in the bank.
+            stop (int): The position following the last channel.
+
+        Returns:
+        --------
+            Scene: The setting of every channel.
+        """
+        data = self._data
+        return Scene(
+            tuple(
+                ChannelSetting(data[i], data[i + 1] == 1, data[i + 2])
+                for i in range(start * CHANNEL_SIZE, stop * CHANNEL_SIZE, CHANNEL_SIZE)
+            )
+        )
+
+    def __field(self, start: int, stop: int, field: int) -> slice:
+        """
+        Get the slice selecting a field of a range of channels.
+
+        Args:
+        -----
+            start (int): The position of the first channel in the bank.
+            stop (int): The position following the last channel.
+            field (int): The offset of the field within a channel.
+
+        Returns:
+        --------
+            slice: The slice of the data.
+        """
+        return slice(start * CHANNEL_SIZE + field, stop * CHANNEL_SIZE, CHANNEL_SIZE)
+
+
+class ChannelView:
+    """
+    Class representing a single channel stored in a `ChannelBank`, with the interface of `Channel`.
+    """
+
+    __slots__ = ("_bank", "_idx")
+
+    def __init__(self, bank: ChannelBank, idx: int) -> None:
+        """
+        Initialize the view. Views are created by indexing a `ChannelBank`.
+
+        Args:
+        -----
+            bank (ChannelBank): The bank storing the channel.
+            idx (int): The position of the channel in the bank.
+        """
+        self._bank = bank
+        self._idx = idx
+
+    @property
+    def intensity(self) -> int:
+        """
+        Get the current intensity of the channel.
+
+        Returns:
+        --------
+            int: The current intensity of the channel.
+        """
+        return self._bank.get_intensity(self._idx)
+
+    @intensity.setter
+    def intensity(self, value: int) -> None:
+        """
+        Set the intensity of the channel. Raises a `ValueError` if the passed value is outside
+        the valid range of values.
+
+        Args:
+        -----
+            value (int): The value to set the channel to. Only 8 bit values are accepted [0-255].
+        """
+        if not 0 <= value <= MAX_INTENSITY:
+            raise ValueError("Channel intensity must be between 0 and 255")
+
+        self._bank.set_intensity(self._idx, value)
+
+    @property
+    def strobe_mode(self) -> int:
+        """
+        Get the current strobe mode of the channel
+
+        Returns:
+        --------
+            int: The current strobe mode of the channel
+        """
+        return self._bank.get_strobe_mode(self._idx)
+
+    @strobe_mode.setter
+    def strobe_mode(self, mode: int) -> None:
+        """
+        Set the strobe mode of the channel
+
+        Args:
+        -----
+            mode (int): The strobe mode to set the channel to. Only values between 1 and 10 are accepted.
+        """
+        if not 0 < mode <= MAX_STROBE_MODE:
+            raise ValueError(
+                f"Strobe mode identifyer must be integer between 1 and 10, got: {mode}"
+            )
+
+        self._bank.set_strobe_mode(self._idx, mode)
+
+    @property
+    def state(self) -> bool:
+        """
+        Get the current state of the channel.
+
+        Returns:
+        --------
+            bool: The current state of the channel [On: True, Off: False].
+        """
+        return self._bank.get_state(self._idx)
+
+    def on(self) -> None:
+        """
+        Set the state of the channel to on.
+        """
+        self._bank.set_state(self._idx, True)
+
+    def off(self) -> None:
+        """
+        Set the state of the channel to off.
+        """
+        self._bank.set_state(self._idx, False)
+
+    def toggle(self) -> None:
+        """
+        Toggle the state of the channel.
+        """
+        self._bank.set_state(self._idx, not self._bank.get_state(self._idx))
@@ -0,0 +1,332 @@
+import itertools
+import socket
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union, cast
+from .ipc import (
+    REPLY,
+    REQUEST,
+    SOCKET_PATH,
+    Method,
+    Outcome,
+    pack_value,
+    receive_message,
+    send_message,
+    unpack_value,
+)
+from .protocol import CommandResult
+from .scene import Scene
+
+# Exceptions raised for the outcomes of failed requests
+_ERRORS = {
+    Outcome.VALUE_ERROR: ValueError,
+    Outcome.CONNECTION_ERROR: ConnectionError,
+    Outcome.ERROR: RuntimeError,
+}
+
+
+class ControllerClient:
+    """
+    Class representing a connection to a `ControllerDaemon`, e.g. from a worker process of a vision pipeline.
+    Index the client to get a proxy of a controller served by the daemon. Requests are pipelined: they are
+    sent right away and their replies are matched to them by a reader thread, so any number of requests
+    may be waiting for their reply.
+
+    ```python
+    with ControllerClient("/tmp/vstlight.sock") as client:
+        lights = client[0]
+        lights.set_intensity(1, 200).result()
+    ```
+    """
+
+    def __init__(self, path: str = SOCKET_PATH) -> None:
+        """
+        Connect to the daemon. Throws a `ConnectionError` if the daemon is not running.
+
+        Args:
+        -----
+            path (str): The path of the Unix domain socket served by the daemon.
+        """
+        self.__sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        try:
+            self.__sock.connect(path)
+        except OSError as e:
+            self.__sock.close()
+            raise ConnectionError(f"Daemon unreachable at {path}") from e
+
+        self.__ids = itertools.count()
+        self.__pending: Dict[int, "Future[Any]"] = {}
+        self.__lock = threading.Lock()
+        self.__closed = False
+
+        self.__reader = threading.Thread(
+            target=self.__read, name="VSTLight-client-reader", daemon=True
+        )
+        self.__reader.start()
+
+    def __enter__(self) -> "ControllerClient":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __getitem__(self, controller_idx: int) -> "ControllerProxy":
+        """
+        Get a proxy of a controller served by the daemon.
+
+        Args:
+        -----
+            controller_idx (int): The index of the controller in the daemon.
+
+        Returns:
+        --------
+            ControllerProxy: The proxy sending the method calls to the controller.
+        """
+        return ControllerProxy(self, controller_idx)
+
+    def request(self, controller_idx: int, method: Method, *args: Any) -> "Future[Any]":
+        """
+        Send a method call to a controller of the daemon. Returns immediately.
+
+        Args:
+        -----
+            controller_idx (int): The index of the controller in the daemon.
+            method (Method): The method to call.
+            *args (Any): The arguments of the method.
+
+        Returns:
+        --------
+            Future[Any]: Future completing with the return value of the method, or holding the exception it raised.
+        """
+        future: "Future[Any]" = Future()
+
+        with self.__lock:
+            if self.__closed:
+                raise ConnectionError("Connection to the daemon is closed")
+
+            request_id = next(self.__ids) & 0xFFFFFFFF
+            self.__pending[request_id] = future
+
+            body = REQUEST.pack(request_id, method.value, controller_idx)
+            send_message(self.__sock, body + pack_value(list(args)))
+
+        return future
+
+    def close(self) -> None:
+        """
+        Close the connection to the daemon. Requests still waiting for their reply fail with a `ConnectionError`.
+        """
+        with self.__lock:
+            self.__closed = True
+
+        try:
+            self.__sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+        self.__reader.join()
+        self.__sock.close()
+
+    def __read(self) -> None:
+        """
+        Reader thread main loop. Completes the futures of the requests with their replies until the connection closes.
+        """
+        try:
+            while True:
+                message = receive_message(self.__sock)
+                if message is None:
+                    break
+
+                request_id, outcome = REPLY.unpack_from(message)
+                value, _ = unpack_value(message, REPLY.size)
+
+                with self.__lock:
+                    future = self.__pending.pop(request_id, None)
+
+                # Replies not matching a request waiting for its reply are ignored
+                if future is None:
+                    continue
+
+                if outcome == Outcome.OK.value:
+                    future.set_result(value)
+                else:
+                    future.set_exception(_ERRORS[Outcome(outcome)](value))
+        except OSError:
+            pass
+
+        with self.__lock:
+            self.__closed = True
+            pending, self.__pending = self.__pending, {}
+
+        for future in pending.values():
+            future.set_exception(ConnectionError("Connection to the daemon closed"))
+
+
+class ControllerProxy:
+    """
+    Class representing a controller served by a `ControllerDaemon`, with the methods of `NetworkController`.
+    Methods sending commands return immediately with a future, completing with a `CommandResult` once the
+    command has been sent by the daemon, or with a list of results for methods sending several commands.
+    `fade` and `ramp` return a future as well instead of blocking. Methods reading the state block until
+    the reply has been received. Times in the results are `time.perf_counter` times of the daemon, which
+    share the clock of the client on Linux.
+    """
+
+    def __init__(self, client: ControllerClient, controller_idx: int) -> None:
+        """
+        Initialize the proxy. Proxies are created by indexing a `ControllerClient`.
+
+        Args:
+        -----
+            client (ControllerClient): The connection to the daemon.
+            controller_idx (int): The index of the controller in the daemon.
+        """
+        self.__client = client
+        self.__idx = controller_idx
+
+    def set_intensity(self, channel_id: int, value: int) -> "Future[CommandResult]":
+        """
+        Set the light intensity of a channel. Refer to `NetworkController.set_intensity`.
+        """
+        return self.__request(Method.SET_INTENSITY, channel_id, value)
+
+    def get_intensity(self, channel_id: int) -> int:
+        """
+        Get the current intensity of a channel. Refer to `NetworkController.get_intensity`.
+        """
+        return cast(int, self.__request(Method.GET_INTENSITY, channel_id).result())
+
+    def set_on(self, channel_id: int) -> "Future[CommandResult]":
+        """
+        Turn a channel on. Refer to `NetworkController.set_on`.
+        """
+        return self.__request(Method.SET_ON, channel_id)
+
+    def set_off(self, channel_id: int) -> "Future[CommandResult]":
+        """
+        Turn a channel off. Refer to `NetworkController.set_off`.
+        """
+        return self.__request(Method.SET_OFF, channel_id)
+
+    def toggle(self, channel_id: int) -> "Future[CommandResult]":
+        """
+        Toggle the state of a channel. Refer to `NetworkController.toggle`.
+        """
+        return self.__request(Method.TOGGLE, channel_id)
+
+    def set_strobe_mode(self, channel_id: int, mode: int) -> "Future[CommandResult]":
+        """
+        Set the strobe mode of a channel. Refer to `NetworkController.set_strobe_mode`.
+        """
+        return self.__request(Method.SET_STROBE_MODE, channel_id, mode)
+
+    def get_strobe_mode(self, channel_id: int) -> int:
+        """
+        Get the strobe mode of a channel. Refer to `NetworkController.get_strobe_mode`.
+        """
+        return cast(int, self.__request(Method.GET_STROBE_MODE, channel_id).result())
+
+    def set_all_intensities(self, value: int) -> "Future[List[CommandResult]]":
+        """
+        Set the intensity of all channels. Refer to `NetworkController.set_all_intensities`.
+        """
+        return self.__request(Method.SET_ALL_INTENSITIES, value)
+
+    def set_all_on(self) -> "Future[List[CommandResult]]":
+        """
+        Turn all channels on. Refer to `NetworkController.set_all_on`.
+        """
+        return self.__request(Method.SET_ALL_ON)
+
+    def set_all_off(self) -> "Future[List[CommandResult]]":
+        """
+        Turn all channels off. Refer to `NetworkController.set_all_off`.
+        """
+        return self.__request(Method.SET_ALL_OFF)
+
+    def toggle_all(self) -> "Future[List[CommandResult]]":
+        """
+        Toggle the state of all channels. Refer to `NetworkController.toggle_all`.
+        """
+        return self.__request(Method.TOGGLE_ALL)
+
+    def set_all_strobe_modes(self, mode: int) -> "Future[List[CommandResult]]":
+        """
+        Set the strobe mode of all channels. Refer to `NetworkController.set_all_strobe_modes`.
+        """
+        return self.__request(Method.SET_ALL_STROBE_MODES, mode)
+
+    def set_intensities(self, values: Sequence[int]) -> "Future[List[CommandResult]]":
+        """
+        Set the intensity of every channel to its own value. Refer to `NetworkController.set_intensities`.
+        """
+        return self.__request(Method.SET_INTENSITIES, list(values))
+
+    def set_strobe_modes(self, modes: Sequence[int]) -> "Future[List[CommandResult]]":
+        """
+        Set the strobe mode of every channel to its own mode. Refer to `NetworkController.set_strobe_modes`.
+        """
+        return self.__request(Method.SET_STROBE_MODES, list(modes))
+
+    def fade(
+        self, channel_id: int, target: int, duration: float
+    ) -> "Future[List[CommandResult]]":
+        """
+        Fade the intensity of a channel to a target over a duration. Refer to `NetworkController.fade`.
+        """
+        return self.__request(Method.FADE, channel_id, target, float(duration))
+
+    def ramp(
+        self, targets: Mapping[int, int], duration: float
+    ) -> "Future[List[CommandResult]]":
+        """
+        Fade the intensity of several channels to their targets. Refer to `NetworkController.ramp`.
+        """
+        return self.__request(Method.RAMP, dict(targets), float(duration))
+
+    def capture_scene(self) -> Scene:
+        """
+        Capture the state of all channels as a scene. Refer to `NetworkController.capture_scene`.
+        """
+        return cast(Scene, self.__request(Method.CAPTURE_SCENE).result())
+
+    def save_scene(self, name: str, scene: Optional[Scene] = None) -> Scene:
+        """
+        Store a scene by name in the daemon. Refer to `NetworkController.save_scene`.
+        """
+        return cast(Scene, self.__request(Method.SAVE_SCENE, name, scene).result())
+
+    def delete_scene(self, name: str) -> None:
+        """
+        Remove a scene stored in the daemon. Refer to `NetworkController.delete_scene`.
+        """
+        self.__request(Method.DELETE_SCENE, name).result()
+
+    def apply_scene(self, scene: Union[str, Scene]) -> "Future[List[CommandResult]]":
+        """
+        Switch all channels to a scene. Refer to `NetworkController.apply_scene`.
+        """
+        return self.__request(Method.APPLY_SCENE, scene)
+
+    def force_resync(self) -> "Future[List[CommandResult]]":
+        """
+        Send the full state of all channels to the controller. Refer to `NetworkController.force_resync`.
+        """
+        return self.__request(Method.FORCE_RESYNC)
+
+    def wait_settled(self, deadline: Optional[float] = None) -> bool:
+        """
+        Blocking function call! Wait until all commands issued to the controller by any client have settled.
+        Refer to `NetworkController.wait_settled`.
+        """
+        timeout = None if deadline is None else deadline - time.perf_counter()
+
+        return cast(bool, self.__request(Method.WAIT_SETTLED, timeout).result())
+
+    def __request(self, method: Method, *args: Any) -> "Future[Any]":
+        """
+        Send a method call to the controller. Refer to `ControllerClient.request`.
+        """
+        return self.__client.request(self.__idx, method, *args)
@@ -0,0 +1,326 @@
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from enum import Enum
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+class Backpressure(Enum):
+    """
+    Enum representing the possible behaviours when a command is added to a full queue.
+    """
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    RAISE = "raise"
+
+
+class Priority(Enum):
+    """
+    Enum representing the lanes of the command queue, from the most to the least urgent.
+    """
+
+    CRITICAL = "critical"
+    NORMAL = "normal"
+    BULK = "bulk"
+
+
+# Lanes in the order they are served
+_LANES = (Priority.CRITICAL, Priority.NORMAL, Priority.BULK)
+
+
+class _Entry:
+    """
+    A frame waiting in the queue together with the futures of the commands it represents.
+    """
+
+    __slots__ = ("frame", "key", "priority", "futures")
+
+    def __init__(
+        self, frame: bytes, key: Optional[Hashable], priority: Priority
+    ) -> None:
+        self.frame = frame
+        self.key = key
+        self.priority = priority
+        self.futures: List["Future[Any]"] = []
+
+
+class CommandQueue(Generic[T]):
+    """
+    Class representing a bounded queue of encoded command frames, served by a dedicated sender
+    thread. Frames are passed to the send function one at a time in the order they were added,
+    and the send function is responsible for spacing the frames according to the controller limit.
+    If the send function returns a future, e.g. completing when the controller has acknowledged the
+    frame, the futures of the queue complete with the result of that future instead of on sending.
+
+    With coalescing enabled, a frame added with the same key as a frame still waiting in the queue
+    replaces the waiting frame in its place instead of being added behind it (last write wins).
+
+    Frames are added to one of three lanes. The sender thread always takes the oldest frame of
+    the most urgent non-empty lane, so a `CRITICAL` frame is sent as soon as the frame currently
+    being sent is done, regardless of the number of `NORMAL` and `BULK` frames waiting. A frame
+    cancels the frames with the same key waiting in less urgent lanes, as these are stale and would
+    undo it when sent later. `CRITICAL` frames never wait for a free slot, the queue size only
+    bounds the other lanes.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bytes], Optional["Future[T]"]],
+        maxsize: int = 64,
+        backpressure: Backpressure = Backpressure.BLOCK,
+        name: str = "VSTLight-sender",
+        coalesce: bool = False,
+    ) -> None:
+        """
+        Initialize the queue and start the sender thread.
+
+        Args:
+        -----
+            send (Callable[[bytes], Optional[Future[T]]]): Function sending a single frame to the controller, optionally
+                returning a future completing with the outcome of the frame. Called from the sender thread only.
+            maxsize (int): The maximum number of frames waiting to be sent. Must be at least 1.
+            backpressure (Backpressure): Behaviour when a frame is added to a full queue. `BLOCK` waits for a free slot,
+                `DROP_OLDEST` cancels the oldest waiting frame and `RAISE` raises a `queue.Full` exception.
+            name (str): Name of the sender thread.
+            coalesce (bool): Replace waiting frames with newer frames added with the same key.
+        """
+        if maxsize < 1:
+            raise ValueError(f"Invalid queue size: {maxsize} - Must be at least 1")
+
+        self.__send = send
+        self.__maxsize = maxsize
+        self.__backpressure = backpressure
+        self.__coalesce = coalesce
+        self.__lanes: Dict[Priority, Deque[_Entry]] = {
+            priority: deque() for priority in _LANES
+        }
+        self.__waiting: Dict[Hashable, _Entry] = {}
+        self.__condition = threading.Condition()
+        self.__closed = False
+
+        self.__thread = threading.Thread(target=self.__run, name=name, daemon=True)
+        self.__thread.start()
+
+    def __len__(self) -> int:
+        """
+        Returns:
+        --------
+            int: The number of frames currently waiting to be sent.
+        """
+        return sum(len(lane) for lane in self.__lanes.values())
+
+    def put(
+        self,
+        frame: bytes,
+        key: Optional[Hashable] = None,
+        priority: Priority = Priority.NORMAL,
+    ) -> "Future[Optional[T]]":
+        """
+        Add a frame to the queue. Returns immediately unless the queue is full and the backpressure
+        policy is `BLOCK`.
+
+        If coalescing is enabled and a frame with the same key is still waiting, that frame is
+        replaced and the returned future completes together with the futures of the replaced frame.
+        Only frames in the same lane are replaced, frames with the same key in less urgent lanes are cancelled.
+
+        Args:
+        -----
+            frame (bytes): The encoded frame to send to the controller.
+            key (Optional[Hashable]): Key identifying frames that may replace each other. Frames without a key are never replaced.
+            priority (Priority): The lane to add the frame to.
+
+        Returns:
+        --------
+            Future[Optional[T]]: Future completing when the frame has been sent (with the outcome returned by the send
+                function, if any), or holding the exception raised while sending it.
+        """
+        future: "Future[Optional[T]]" = Future()
+
+        with self.__condition:
+            if self.__closed:
+                raise RuntimeError("Cannot add commands to a closed queue")
+
+            # Replace a waiting frame with the same key, keeping its place in the queue
+            waiting = self.__waiting.get(key) if self.__coalesce else None
+            if waiting is not None and waiting.priority is priority:
+                waiting.frame = frame
+                waiting.futures.append(future)
+
+                return future
+
+            if key is not None:
+                self.__cancel_stale(key, priority)
+
+            if priority is not Priority.CRITICAL and self.__bounded() >= self.__maxsize:
+                if self.__backpressure is Backpressure.RAISE:
+                    raise queue.Full(
+                        f"Command queue is full ({self.__maxsize} frames waiting)"
+                    )
+                elif self.__backpressure is Backpressure.DROP_OLDEST:
+                    for dropped in self.__drop().futures:
+                        dropped.cancel()
+                else:
+                    self.__condition.wait_for(
+                        lambda: self.__bounded() < self.__maxsize or self.__closed
+                    )
+
+                    if self.__closed:
+                        raise RuntimeError("Cannot add commands to a closed queue")
+
+            entry = _Entry(frame, key, priority)
+            entry.futures.append(future)
+
+            self.__lanes[priority].append(entry)
+            if self.__coalesce and key is not None:
+                self.__waiting[key] = entry
+
+            self.__condition.notify_all()
+
+        return future
+
+    def close(self) -> None:
+        """
+        Stop accepting new frames, send all frames still waiting and stop the sender thread.
+        """
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+
+        self.__thread.join()
+
+    def __run(self) -> None:
+        """
+        Sender thread main loop. Sends frames until the queue is closed and empty.
+        """
+        while True:
+            with self.__condition:
+                self.__condition.wait_for(lambda: len(self) or self.__closed)
+
+                if not len(self):
+                    return
+
+                entry = self.__pop()
+                self.__condition.notify_all()
+
+            # Skip frames where all commands were cancelled while waiting
+            futures = [f for f in entry.futures if f.set_running_or_notify_cancel()]
+            if not futures:
+                continue
+
+            try:
+                outcome = self.__send(entry.frame)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+
+            if outcome is None:
+                for future in futures:
+                    future.set_result(None)
+            else:
+                outcome.add_done_callback(partial(_chain, futures))
+
+    def __bounded(self) -> int:
+        """
+        Count the frames waiting in the lanes bounded by the queue size. Must be called while holding the condition lock.
+
+        Returns:
+        --------
+            int: The number of `NORMAL` and `BULK` frames waiting.
+        """
+        return len(self.__lanes[Priority.NORMAL]) + len(self.__lanes[Priority.BULK])
+
+    def __pop(self) -> _Entry:
+        """
+        Remove the oldest entry of the most urgent non-empty lane. Must be called while holding the condition lock.
+
+        Returns:
+        --------
+            _Entry: The next entry to send.
+        """
+        lane = next(lane for lane in self.__lanes.values() if lane)
+
+        return self.__forget(lane.popleft())
+
+    def __drop(self) -> _Entry:
+        """
+        Remove the oldest entry of the least urgent non-empty bounded lane. Must be called while holding the condition lock.
+
+        Returns:
+        --------
+            _Entry: The dropped entry.
+        """
+        lanes = (self.__lanes[Priority.BULK], self.__lanes[Priority.NORMAL])
+        lane = next(lane for lane in lanes if lane)
+
+        return self.__forget(lane.popleft())
+
+    def __cancel_stale(self, key: Hashable, priority: Priority) -> None:
+        """
+        Cancel the frames waiting with a key in the lanes less urgent than a priority. Must be called while
+        holding the condition lock.
+
+        Args:
+        -----
+            key (Hashable): The key of the frames to cancel.
+            priority (Priority): The lane of the frame superseding them.
+        """
+        for lower in _LANES[_LANES.index(priority) + 1 :]:
+            lane = self.__lanes[lower]
+            stale = [entry for entry in lane if entry.key == key]
+
+            for entry in stale:
+                lane.remove(entry)
+
+                for future in self.__forget(entry).futures:
+                    future.cancel()
+
+    def __forget(self, entry: _Entry) -> _Entry:
+        """
+        Stop coalescing into an entry removed from the queue. Must be called while holding the condition lock.
+
+        Args:
+        -----
+            entry (_Entry): The removed entry.
+
+        Returns:
+        --------
+            _Entry: The same entry.
+        """
+        if entry.key is not None and self.__waiting.get(entry.key) is entry:
+            del self.__waiting[entry.key]
+
+        return entry
+
+
+def _chain(futures: List["Future[Any]"], source: "Future[Any]") -> None:
+    """
+    Complete a number of futures with the outcome of a completed future.
+
+    Args:
+    -----
+        futures (List[Future[Any]]): The futures to complete.
+        source (Future[Any]): The completed future.
+    """
+    error = source.exception()
+
+    for future in futures:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(source.result())
@@ -0,0 +1,216 @@
+import socket
+import threading
+from typing import Callable, Optional
+
+# Timeout in seconds when establishing the connection to the controller and sending to it
+TIMEOUT = 5
+
+# Waiting time in seconds before the first reconnect attempt, and the longest waiting time between
+# attempts. The waiting time doubles after every failed attempt
+INITIAL_BACKOFF = 0.1
+MAX_BACKOFF = 5.0
+
+
+class ControllerConnection:
+    """
+    Class representing the TCP connection to a VLP light controller.
+
+    With reconnection enabled, the connection acts as a circuit breaker. The first failure to send
+    to the controller closes the socket and opens the breaker: later sends fail immediately with a
+    `ConnectionError` instead of blocking on the socket timeout. Meanwhile, a background thread
+    reconnects with exponential backoff. Once reconnected, the breaker closes and the `on_reconnect`
+    callback is called from the background thread, e.g. to restore the state of the controller.
+    """
+
+    def __init__(
+        self,
+        ip: str,
+        port: int,
+        reconnect: bool = False,
+        initial_backoff: float = INITIAL_BACKOFF,
+        max_backoff: float = MAX_BACKOFF,
+    ) -> None:
+        """
+        Initialize the connection object. The connection is opened by `connect`.
+
+        Args:
+        -----
+            ip (str): The IP address of the controller.
+            port (int): The port of the controller.
+            reconnect (bool): Reconnect in the background if sending to the controller fails.
+            initial_backoff (float) [s]: The waiting time before the first reconnect attempt.
+            max_backoff (float) [s]: The longest waiting time between two reconnect attempts.
+        """
+        self.__ip = ip
+        self.__port = port
+        self.__reconnect = reconnect
+        self.__initial_backoff = initial_backoff
+        self.__max_backoff = max_backoff
+
+        self.__sock: Optional[socket.socket] = None
+        self.__lock = threading.Lock()
+        self.__closed = threading.Event()
+        self.__reconnector: Optional[threading.Thread] = None
+
+        self.on_reconnect: Optional[Callable[[], None]] = None
+
+    @property
+    def sock(self) -> socket.socket:
+        """
+        Get the socket of the current connection.
+
+        Returns:
+        --------
+            socket.socket: The connected socket.
+        """
+        sock = self.__sock
+
+        if sock is None:
+            raise ConnectionError(
+                f"Connection to controller with IP: {self.__ip} is down"
+            )
+
+        return sock
+
+    @property
+    def connected(self) -> bool:
+        """
+        Get the state of the connection.
+
+        Returns:
+        --------
+            bool: True if connected to the controller, False while reconnecting or after closing.
+        """
+        return self.__sock is not None
+
+    def connect(self) -> None:
+        """
+        Open the connection to the controller. Blocks for up to 5 seconds before raising a `ConnectionError`
+        if the controller is unreachable.
+        """
+        self.__sock = self.__open()
+
+    def send(self, frame: bytes) -> None:
+        """
+        Send a frame to the controller. With reconnection enabled, a failure to send opens the breaker
+        and starts reconnecting, and sends fail immediately with a `ConnectionError` until reconnected.
+
+        Args:
+        -----
+            frame (bytes): The encoded frame to send.
+        """
+        if not self.__reconnect:
+            self.sock.send(frame)
+            return
+
+        sock = self.sock
+
+        try:
+            sock.send(frame)
+        except OSError as e:
+            self.__trip(sock)
+            raise ConnectionError(
+                f"Lost connection to controller with IP: {self.__ip} - Reconnecting"
+            ) from e
+
+    def fail(self, sock: socket.socket) -> None:
+        """
+        Report a failure of a socket detected outside of `send`, e.g. by a thread reading the replies.
+        With reconnection enabled, the breaker opens and reconnecting starts as if sending had failed.
+
+        Args:
+        -----
+            sock (socket.socket): The socket that failed.
+        """
+        if self.__reconnect:
+            self.__trip(sock)
+
+    def close(self) -> None:
+        """
+        Close the connection and stop reconnecting.
+        """
+        self.__closed.set()
+
+        with self.__lock:
+            sock, self.__sock = self.__sock, None
+            reconnector = self.__reconnector
+
+        if sock is not None:
+            sock.close()
+
+        if reconnector is not None and reconnector is not threading.current_thread():
+            reconnector.join()
+
+    def __open(self) -> socket.socket:
+        """
+        Open a socket connected to the controller.
+
+        Returns:
+        --------
+            socket.socket: The connected socket.
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(TIMEOUT)
+
+        try:
+            sock.connect((self.__ip, self.__port))
+        except Exception as e:
+            sock.close()
+            raise ConnectionError(
+                f"Failed to connect to controller with IP: {self.__ip}"
+            ) from e
+
+        return sock
+
+    def __trip(self, sock: socket.socket) -> None:
+        """
+        Open the breaker after a failure on a socket and start reconnecting in the background.
+        Failures on sockets that have already been replaced are ignored.
+
+        Args:
+        -----
+            sock (socket.socket): The socket that failed.
+        """
+        with self.__lock:
+            if self.__sock is not sock or self.__closed.is_set():
+                return
+
+            self.__sock = None
+            self.__reconnector = threading.Thread(
+                target=self.__run_reconnect,
+                name=f"VSTLight-reconnect-{self.__ip}:{self.__port}",
+                daemon=True,
+            )
+            self.__reconnector.start()
+
+        sock.close()
+
+    def __run_reconnect(self) -> None:
+        """
+        Reconnect thread main loop. Attempts to reconnect with exponential backoff until connected
+        or closed, then closes the breaker and calls the `on_reconnect` callback.
+        """
+        backoff = self.__initial_backoff
+
+        while not self.__closed.wait(backoff):
+            try:
+                sock = self.__open()
+            except ConnectionError:
+                backoff = min(backoff * 2, self.__max_backoff)
+                continue
+
+            with self.__lock:
+                if self.__closed.is_set():
+                    sock.close()
+                    return
+
+                self.__sock = sock
+
+            if self.on_reconnect is not None:
+                try:
+                    self.on_reconnect()
+                except ConnectionError:
+                    # The connection failed again during the callback, a new reconnect has started
+                    pass
+
+            return
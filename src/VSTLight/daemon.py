@@ -0,0 +1,370 @@
+import argparse
+import os
+import socket
+import threading
+import time
+from concurrent.futures import Future
+from functools import partial
+from typing import Any, Callable, List, Sequence
+from .ipc import (
+    REPLY,
+    REQUEST,
+    SOCKET_PATH,
+    Method,
+    Outcome,
+    pack_value,
+    receive_message,
+    send_message,
+    unpack_value,
+)
+from .network_controller import NetworkController
+
+# Methods blocking the calling thread, run in a thread of their own so later requests are not delayed
+BLOCKING = (Method.FADE, Method.RAMP, Method.WAIT_SETTLED)
+
+
+class ControllerDaemon:
+    """
+    Class representing a daemon owning the connections to a number of controllers and serving them to
+    other processes on a Unix domain socket. Clients send binary requests naming the controller by its
+    index and a `NetworkController` method, and may send any number of requests before the replies
+    arrive. Replies are sent once the commands of a request have been sent (or acknowledged, when the
+    controller reads responses), so they may arrive out of order.
+
+    The controllers are called from one thread per client and must be created with `thread_safe=True`,
+    and usually `queued=True`, so the clients share the controllers at the full rate of the hardware.
+
+    ```python
+    lights = NetworkController(4, queued=True, thread_safe=True)
+
+    with ControllerDaemon([lights], "/tmp/vstlight.sock"):
+        ...
+    ```
+    """
+
+    def __init__(
+        self, controllers: Sequence[NetworkController], path: str = SOCKET_PATH
+    ) -> None:
+        """
+        Initialize the daemon and start serving the socket, replacing any existing socket file.
+
+        Args:
+        -----
+            controllers (Sequence[NetworkController]): The controllers to serve, addressed by their index.
+            path (str): The path of the Unix domain socket.
+        """
+        self.__controllers = list(controllers)
+        self.__path = path
+        self.__clients: List[socket.socket] = []
+        self.__lock = threading.Lock()
+
+        if os.path.exists(path):
+            os.unlink(path)
+
+        self.__server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__server.bind(path)
+        self.__server.listen()
+
+        self.__thread = threading.Thread(
+            target=self.__accept, name="VSTLight-daemon", daemon=True
+        )
+        self.__thread.start()
+
+    def __enter__(self) -> "ControllerDaemon":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stop serving, disconnect all clients and remove the socket file. The controllers are not destroyed.
+        """
+        # Shutting down the listening socket wakes the accept thread
+        try:
+            self.__server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.__server.close()
+        self.__thread.join()
+
+        with self.__lock:
+            clients, self.__clients = self.__clients, []
+
+        for client in clients:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+        if os.path.exists(self.__path):
+            os.unlink(self.__path)
+
+    def __accept(self) -> None:
+        """
+        Accept thread main loop. Starts a thread serving every client until the server socket is closed.
+        """
+        while True:
+            try:
+                client, _ = self.__server.accept()
+            except OSError:
+                return
+
+            with self.__lock:
+                self.__clients.append(client)
+
+            threading.Thread(
+                target=self.__serve, args=(client,), name="VSTLight-client", daemon=True
+            ).start()
+
+    def __serve(self, client: socket.socket) -> None:
+        """
+        Client thread main loop. Handles the requests of a client until it disconnects.
+
+        Args:
+        -----
+            client (socket.socket): The connected client socket.
+        """
+        write_lock = threading.Lock()
+
+        try:
+            while True:
+                message = receive_message(client)
+                if message is None:
+                    break
+
+                self.__handle(client, write_lock, message)
+        except OSError:
+            pass
+        finally:
+            with self.__lock:
+                if client in self.__clients:
+                    self.__clients.remove(client)
+            client.close()
+
+    def __handle(
+        self, client: socket.socket, write_lock: threading.Lock, message: bytes
+    ) -> None:
+        """
+        Decode a request and call the method, replying once its outcome is known.
+
+        Args:
+        -----
+            client (socket.socket): The client socket to reply on.
+            write_lock (threading.Lock): Serializes the replies to the client.
+            message (bytes): The encoded request.
+        """
+        request_id, code, controller_idx = REQUEST.unpack_from(message)
+        reply = partial(self.__reply, client, write_lock, request_id)
+
+        try:
+            method = Method(code)
+            args, _ = unpack_value(message, REQUEST.size)
+
+            if not 0 <= controller_idx < len(self.__controllers):
+                raise ValueError(f"Unknown controller: {controller_idx}")
+
+            call = getattr(self.__controllers[controller_idx], method.name.lower())
+
+            # Deadlines are sent as the remaining time, as clocks are not shared between processes
+            if method is Method.WAIT_SETTLED and args[0] is not None:
+                args[0] += time.perf_counter()
+        except Exception as e:
+            reply(_outcome(e), str(e))
+            return
+
+        if method in BLOCKING:
+            threading.Thread(
+                target=self.__run, args=(call, args, reply), daemon=True
+            ).start()
+        else:
+            self.__run(call, args, reply)
+
+    def __run(
+        self,
+        call: Callable[..., Any],
+        args: List[Any],
+        reply: Callable[[Outcome, Any], None],
+    ) -> None:
+        """
+        Call a method and reply with its return value, once the commands it returned futures for have completed.
+
+        Args:
+        -----
+            call (Callable[..., Any]): The bound method of the controller.
+            args (List[Any]): The decoded arguments.
+            reply (Callable[[Outcome, Any], None]): Function sending the reply.
+        """
+        try:
+            value = call(*args)
+        except Exception as e:
+            reply(_outcome(e), str(e))
+            return
+
+        if isinstance(value, Future):
+            value.add_done_callback(partial(_complete, reply))
+        elif isinstance(value, list) and value and isinstance(value[0], Future):
+            _gather(value).add_done_callback(partial(_complete, reply))
+        else:
+            reply(Outcome.OK, value)
+
+    def __reply(
+        self,
+        client: socket.socket,
+        write_lock: threading.Lock,
+        request_id: int,
+        outcome: Outcome,
+        value: Any,
+    ) -> None:
+        """
+        Send a reply to a client. Called from the client thread and from the threads completing the futures.
+
+        Args:
+        -----
+            client (socket.socket): The client socket.
+            write_lock (threading.Lock): Serializes the replies to the client.
+            request_id (int): The id of the request.
+            outcome (Outcome): The outcome of the request.
+            value (Any): The return value, or the error message.
+        """
+        body = REPLY.pack(request_id, outcome.value) + pack_value(value)
+
+        try:
+            with write_lock:
+                send_message(client, body)
+        except OSError:
+            # The client has disconnected, its thread cleans up
+            pass
+
+
+def _outcome(error: BaseException) -> Outcome:
+    """
+    Get the outcome reporting an exception to the client.
+
+    Args:
+    -----
+        error (BaseException): The exception raised by the request.
+
+    Returns:
+    --------
+        Outcome: The outcome matching the exception type.
+    """
+    if isinstance(error, ValueError):
+        return Outcome.VALUE_ERROR
+    if isinstance(error, ConnectionError):
+        return Outcome.CONNECTION_ERROR
+
+    return Outcome.ERROR
+
+
+def _complete(reply: Callable[[Outcome, Any], None], future: "Future[Any]") -> None:
+    """
+    Reply with the outcome of a completed future.
+
+    Args:
+    -----
+        reply (Callable[[Outcome, Any], None]): Function sending the reply.
+        future (Future[Any]): The completed future.
+    """
+    if future.cancelled():
+        reply(Outcome.ERROR, "Command was cancelled")
+        return
+
+    error = future.exception()
+    if error is not None:
+        reply(_outcome(error), str(error))
+    else:
+        reply(Outcome.OK, future.result())
+
+
+def _gather(futures: List["Future[Any]"]) -> "Future[List[Any]]":
+    """
+    Combine futures into a single future completing with the list of their results once all have completed.
+
+    Args:
+    -----
+        futures (List[Future[Any]]): The futures to combine.
+
+    Returns:
+    --------
+        Future[List[Any]]: The combined future, holding the first exception if any future failed.
+    """
+    combined: "Future[List[Any]]" = Future()
+    remaining = len(futures)
+    lock = threading.Lock()
+
+    def done(_: "Future[Any]") -> None:
+        nonlocal remaining
+
+        with lock:
+            remaining -= 1
+            if remaining:
+                return
+
+        for future in futures:
+            if future.cancelled():
+                combined.set_exception(RuntimeError("Command was cancelled"))
+                return
+
+            error = future.exception()
+            if error is not None:
+                combined.set_exception(error)
+                return
+
+        combined.set_result([future.result() for future in futures])
+
+    for future in futures:
+        future.add_done_callback(done)
+
+    return combined
+
+
+def main() -> None:
+    """
+    Run the daemon from the command line:
+    `python -m VSTLight.daemon --controller 4@192.168.11.20 --controller 2@192.168.11.21:1000`.
+    """
+    parser = argparse.ArgumentParser(
+        description="Serve VLP light controllers to other processes."
+    )
+    parser.add_argument(
+        "--controller",
+        action="append",
+        required=True,
+        help="Channels and address of a controller, e.g. 4@192.168.11.20:1000",
+    )
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    args = parser.parse_args()
+
+    controllers = []
+    for spec in args.controller:
+        channels, address = spec.split("@")
+        ip, _, port = address.partition(":")
+        controllers.append(
+            NetworkController(
+                int(channels),
+                ip,
+                int(port or 1000),
+                queued=True,
+                reconnect=True,
+                thread_safe=True,
+            )
+        )
+
+    daemon = ControllerDaemon(controllers, args.socket)
+    for idx, controller in enumerate(args.controller):
+        print(f"Controller {idx}: {controller}")
+    print(f"Serving on {args.socket}")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+        for lights in controllers:
+            lights.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import math
+from typing import Dict, List, NamedTuple
+
+
+class FadeStep(NamedTuple):
+    """
+    A single intensity command of a fade. Steps are due `offset` seconds after the start of the
+    fade. A step is dropped if the next step of the same channel is already due when it is reached,
+    which happens if the steps cannot be sent in time.
+    """
+
+    offset: float
+    channel_idx: int
+    value: int
+    next_offset: float
+
+
+def plan_ramp(
+    starts: Dict[int, int], targets: Dict[int, int], duration: float, interval: float
+) -> List[FadeStep]:
+    """
+    Compute the steps of a linear fade of several channels sharing the command budget of one
+    controller. The fade is divided into slots of one interval each, and the slots are handed
+    to the channels in turn. Each step sets the intensity the linear fade reaches at the end of
+    its slot, and the last turn of every channel sets its target, so every channel reaches its
+    target no later than the end of the fade. Steps not changing the intensity are left out.
+
+    Args:
+    -----
+        starts (Dict[int, int]): The intensity of each fading channel at the start, by zero-indexed channel.
+        targets (Dict[int, int]): The intensity to reach for each fading channel, by zero-indexed channel.
+        duration (float) [s]: The duration of the fade.
+        interval (float) [s]: The minimum time between two commands sent to the controller.
+
+    Returns:
+    --------
+        List[FadeStep]: The steps of the fade, ordered by their offset.
+    """
+    channels = sorted(targets)
+    slots = max(1, math.floor(duration / interval)) if interval > 0 else len(channels)
+    slot_time = duration / slots
+
+    steps: List[FadeStep] = []
+    last = dict(starts)
+
+    total = max(slots, len(channels))
+
+    for slot in range(total):
+        channel_idx = channels[slot % len(channels)]
+        start, target = starts[channel_idx], targets[channel_idx]
+
+        # Value due at the end of the slot, or the target in the last turn of the channel
+        progress = 1.0 if slot >= total - len(channels) else (slot + 1) / slots
+        value = round(start + (target - start) * progress)
+
+        if value != last[channel_idx]:
+            last[channel_idx] = value
+            steps.append(
+                FadeStep(min(slot * slot_time, duration), channel_idx, value, math.inf)
+            )
+
+    # Link every step to the next step of the same channel
+    following: Dict[int, float] = {}
+    for i in reversed(range(len(steps))):
+        step = steps[i]
+        steps[i] = step._replace(next_offset=following.get(step.channel_idx, math.inf))
+        following[step.channel_idx] = step.offset
+
+    return steps
@@ -0,0 +1,399 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
+from operator import methodcaller
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Sequence,
+    Tuple,
+    Union,
+)
+from .network_controller import NetworkController
+
+# A channel in the fleet, addressed by the name of its controller and the channel number on it
+Address = Tuple[Hashable, int]
+
+
+class ControllerFleet:
+    """
+    Class representing a group of VLP light controllers, e.g. all controllers of an inspection cell.
+    Channels are addressed as `(controller, channel)` tuples. Commands are grouped per controller
+    and the command streams of the controllers are run concurrently, each paced by the 5ms limit
+    of its own controller. Updating every light of the fleet therefore takes as long as updating
+    a single controller, instead of the sum over all controllers.
+
+    The fleet is not thread-safe. Method calls block until the commands of all controllers have been sent,
+    also for controllers sending from a queue or an I/O engine, or until their replies have been received
+    for controllers reading the replies. All addresses are verified before any command is run.
+    """
+
+    def __init__(
+        self,
+        controllers: Union[
+            Mapping[Hashable, NetworkController], Sequence[NetworkController]
+        ],
+    ) -> None:
+        """
+        Initialize the ControllerFleet object from a set of connected controllers.
+
+        Args:
+        -----
+            controllers (Mapping[Hashable, NetworkController] | Sequence[NetworkController]): The controllers of the fleet,
+                by name. If a sequence is passed, the controllers are named by their index in the sequence.
+        """
+        if isinstance(controllers, Mapping):
+            self.__controllers: Dict[Hashable, NetworkController] = dict(controllers)
+        else:
+            self.__controllers = dict(enumerate(controllers))
+
+        if not self.__controllers:
+            raise ValueError("A fleet must contain at least one controller")
+
+        # One worker per controller, so all command streams can run at the same time
+        self.__executor = ThreadPoolExecutor(
+            max_workers=len(self.__controllers), thread_name_prefix="VSTLight-fleet"
+        )
+
+    def __getitem__(self, name: Hashable) -> NetworkController:
+        """
+        Get a controller of the fleet by name.
+
+        Args:
+        -----
+            name (Hashable): The name of the controller.
+
+        Returns:
+        --------
+            NetworkController: The controller with the given name.
+        """
+        self.__verify_controller(name)
+
+        return self.__controllers[name]
+
+    def __len__(self) -> int:
+        """
+        Returns:
+        --------
+            int: The number of controllers in the fleet.
+        """
+        return len(self.__controllers)
+
+    def destroy(self) -> None:
+        """
+        Destroys all controllers of the fleet. All channels are set to off and the connections to the controllers are closed.
+        """
+        self.__run({name: [c.destroy] for name, c in self.__controllers.items()})
+        self.__executor.shutdown()
+
+    def set_intensities(self, values: Mapping[Address, int]) -> None:
+        """
+        Set the light intensity of a number of channels. Refer to `NetworkController.set_intensity`.
+
+        Args:
+        -----
+            values (Mapping[Address, int]): The intensity to set for each `(controller, channel)` address [0-255].
+        """
+        self.__run(
+            self.__group_channels(
+                (address, methodcaller("set_intensity", address[1], v))
+                for address, v in values.items()
+            )
+        )
+
+    def set_on(self, channels: Iterable[Address]) -> None:
+        """
+        Turn on a number of channels.
+
+        Args:
+        -----
+            channels (Iterable[Address]): The `(controller, channel)` addresses of the channels to turn on.
+        """
+        self.__run(
+            self.__group_channels(
+                (address, methodcaller("set_on", address[1])) for address in channels
+            )
+        )
+
+    def set_off(self, channels: Iterable[Address]) -> None:
+        """
+        Turn off a number of channels.
+
+        Args:
+        -----
+            channels (Iterable[Address]): The `(controller, channel)` addresses of the channels to turn off.
+        """
+        self.__run(
+            self.__group_channels(
+                (address, methodcaller("set_off", address[1])) for address in channels
+            )
+        )
+
+    def toggle(self, channels: Iterable[Address]) -> None:
+        """
+        Toggle the state of a number of channels between on and off (Inverting current state).
+
+        Args:
+        -----
+            channels (Iterable[Address]): The `(controller, channel)` addresses of the channels to toggle.
+        """
+        self.__run(
+            self.__group_channels(
+                (address, methodcaller("toggle", address[1])) for address in channels
+            )
+        )
+
+    def set_strobe_modes(self, modes: Mapping[Address, int]) -> None:
+        """
+        Set the strobe mode of a number of channels. Refer to `NetworkController.set_strobe_mode`
+        for a list of the available strobe modes.
+
+        Args:
+        -----
+            modes (Mapping[Address, int]): The strobe mode to set for each `(controller, channel)` address [1-10].
+        """
+        self.__run(
+            self.__group_channels(
+                (address, methodcaller("set_strobe_mode", address[1], m))
+                for address, m in modes.items()
+            )
+        )
+
+    def ramp(self, targets: Mapping[Address, int], duration: float) -> None:
+        """
+        Blocking function call! Fade the intensity of a number of channels linearly to their targets
+        over the same duration. Refer to `NetworkController.ramp`. The fades of the controllers run
+        concurrently, each within the command budget of its own controller.
+
+        Args:
+        -----
+            targets (Mapping[Address, int]): The intensity to reach for each `(controller, channel)` address [0-255].
+            duration (float) [s]: The duration of the fade.
+        """
+        per_controller: Dict[Hashable, Dict[int, int]] = {}
+        for (name, ch), v in targets.items():
+            self.__verify_address((name, ch))
+            per_controller.setdefault(name, {})[ch] = v
+
+        self.__run(
+            self.__group(
+                (name, methodcaller("ramp", channel_targets, duration))
+                for name, channel_targets in per_controller.items()
+            )
+        )
+
+    def apply_scene(self, name: str) -> None:
+        """
+        Switch all controllers to the scene stored under the same name on each controller, sending only the
+        commands changing their output. Refer to `NetworkController.apply_scene`.
+
+        Args:
+        -----
+            name (str): The name of the scene, stored on every controller with `NetworkController.save_scene`.
+        """
+        self.__run_all(methodcaller("apply_scene", name))
+
+    def set_all_intensities(self, value: int) -> None:
+        """
+        Set the intensity of all channels of all controllers to the same value.
+
+        Args:
+        -----
+            value (int): The intensity to set all channels to. Only 8 bit values are accepted [0-255].
+        """
+        self.__run_all(methodcaller("set_all_intensities", value))
+
+    def set_all_on(self) -> None:
+        """
+        Set all channels of all controllers to the on state.
+        """
+        self.__run_all(methodcaller("set_all_on"))
+
+    def set_all_off(self) -> None:
+        """
+        Set all channels of all controllers to the off state.
+        """
+        self.__run_all(methodcaller("set_all_off"))
+
+    def toggle_all(self) -> None:
+        """
+        Toggle the state of all channels of all controllers between on and off (Inverting current state).
+        """
+        self.__run_all(methodcaller("toggle_all"))
+
+    def set_all_strobe_modes(self, mode: int) -> None:
+        """
+        Set the strobe mode of all channels of all controllers. Refer to `NetworkController.set_strobe_mode`
+        for a list of the available strobe modes.
+
+        Args:
+        -----
+            mode (int): The strobe mode to set [1-10].
+        """
+        self.__run_all(methodcaller("set_all_strobe_modes", mode))
+
+    def __verify_controller(self, name: Hashable) -> None:
+        """
+        Verify that a controller name is part of the fleet. Throws a ValueError if not.
+
+        Args:
+        -----
+            name (Hashable): The controller name to verify.
+        """
+        if name not in self.__controllers:
+            raise ValueError(f"Unknown controller: {name!r}")
+
+    def __verify_address(self, address: Address) -> None:
+        """
+        Verify that a `(controller, channel)` address is part of the fleet. Throws a ValueError if not.
+
+        Args:
+        -----
+            address (Address): The address to verify.
+        """
+        name, channel_id = address
+        self.__verify_controller(name)
+
+        channels = self.__controllers[name].channels
+        if not 1 <= channel_id <= channels:
+            raise ValueError(
+                f"Invalid channel of controller {name!r}: {channel_id} - Must be between 1 and {channels}"
+            )
+
+    def __group_channels(
+        self, commands: Iterable[Tuple[Address, Callable[[NetworkController], object]]]
+    ) -> Dict[Hashable, List[Callable[[], object]]]:
+        """
+        Group commands addressed to channels by controller, keeping the order of the commands for each
+        controller. All addresses are verified before any command is run.
+
+        Args:
+        -----
+            commands (Iterable[Tuple[Address, Callable[[NetworkController], object]]]): Channel addresses and the
+                commands to run on their controllers.
+
+        Returns:
+        --------
+            Dict[Hashable, List[Callable[[], object]]]: The commands of each controller, bound to the controller.
+        """
+        verified: List[Tuple[Hashable, Callable[[NetworkController], object]]] = []
+
+        for address, command in commands:
+            self.__verify_address(address)
+            verified.append((address[0], command))
+
+        return self.__group(verified)
+
+    def __group(
+        self, commands: Iterable[Tuple[Hashable, Callable[[NetworkController], object]]]
+    ) -> Dict[Hashable, List[Callable[[], object]]]:
+        """
+        Group commands by controller, keeping the order of the commands for each controller.
+        All controller names are verified before any command is run.
+
+        Args:
+        -----
+            commands (Iterable[Tuple[Hashable, Callable[[NetworkController], object]]]): Controller names and the
+                commands to run on them.
+
+        Returns:
+        --------
+            Dict[Hashable, List[Callable[[], object]]]: The commands of each controller, bound to the controller.
+        """
+        jobs: Dict[Hashable, List[Callable[[], object]]] = {}
+
+        for name, command in commands:
+            self.__verify_controller(name)
+
+            controller = self.__controllers[name]
+            jobs.setdefault(name, []).append(partial(command, controller))
+
+        return jobs
+
+    def __run_all(self, command: Callable[[NetworkController], object]) -> None:
+        """
+        Run the same command on every controller of the fleet concurrently.
+
+        Args:
+        -----
+            command (Callable[[NetworkController], object]): The command to run on each controller.
+        """
+        self.__run(self.__group((name, command) for name in self.__controllers))
+
+    def __run(self, jobs: Dict[Hashable, List[Callable[[], object]]]) -> None:
+        """
+        Run the commands of each controller in order, with the controllers running concurrently.
+        Blocks until all commands have completed and the futures they returned are done, i.e. the
+        frames have been sent or answered. If any command fails, the first exception is raised once
+        all controllers are done.
+
+        Args:
+        -----
+            jobs (Dict[Hashable, List[Callable[[], object]]]): The commands to run for each controller.
+        """
+
+        def run_stream(stream: List[Callable[[], object]]) -> List["Future[Any]"]:
+            sent: List["Future[Any]"] = []
+            for command in stream:
+                sent.extend(_futures(command()))
+
+            return sent
+
+        # Run a single stream in the calling thread to avoid the hand-off to a worker
+        if len(jobs) == 1:
+            _settle(run_stream(next(iter(jobs.values()))))
+            return
+
+        futures = [
+            self.__executor.submit(run_stream, stream) for stream in jobs.values()
+        ]
+
+        errors = [f.exception() for f in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+
+        _settle([sent for f in futures for sent in f.result()])
+
+
+def _futures(result: object) -> List["Future[Any]"]:
+    """
+    Collect the futures returned by a controller method, which returns a future, a list of futures or None.
+
+    Args:
+    -----
+        result (object): The value returned by the method.
+
+    Returns:
+    --------
+        List[Future[Any]]: The futures returned.
+    """
+    if isinstance(result, Future):
+        return [result]
+
+    if isinstance(result, list):
+        return [f for f in result if isinstance(f, Future)]
+
+    return []
+
+
+def _settle(futures: List["Future[Any]"]) -> None:
+    """
+    Wait for the futures of the commands run by the fleet. Raises the first exception held by a future.
+    Cancelled futures belong to commands superseded by newer commands and are ignored.
+
+    Args:
+    -----
+        futures (List[Future[Any]]): The futures to wait for.
+    """
+    wait(futures)
+
+    for future in futures:
+        if not future.cancelled():
+            error = future.exception()
+            if error is not None:
+                raise error
@@ -0,0 +1,448 @@
+import heapq
+import itertools
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Deque, Hashable, List, Optional, Tuple
+from .command_queue import Priority
+from .protocol import WAIT_TIME, CommandResult
+
+# Time in seconds before retrying a frame that did not fit in the send buffer of the socket
+RETRY_TIME = 0.001
+
+
+class EngineConnection:
+    """
+    Class representing a controller socket owned by an `IOEngine`. Frames added to the
+    connection are sent by the engine thread, spaced according to the controller limit.
+    """
+
+    def __init__(self, engine: "IOEngine", sock: socket.socket) -> None:
+        """
+        Initialize the connection. Connections are created by `IOEngine.attach`.
+
+        Args:
+        -----
+            engine (IOEngine): The engine owning the connection.
+            sock (socket.socket): The connected controller socket.
+        """
+        self.engine = engine
+        self.sock = sock
+        self.pending: Deque[
+            Tuple[bytes, Optional[Hashable], "Future[CommandResult]"]
+        ] = deque()
+        self.partial: Optional[Tuple[bytes, "Future[CommandResult]", int]] = None
+        self.critical = 0
+        self.next_send = 0.0
+        self.registered = False
+        self.scheduled = False
+        self.closing = False
+        self.closed = threading.Event()
+
+    def __len__(self) -> int:
+        """
+        Returns:
+        --------
+            int: The number of frames currently waiting to be sent.
+        """
+        return len(self.pending)
+
+    def put(
+        self,
+        frame: bytes,
+        key: Optional[Hashable] = None,
+        priority: Priority = Priority.NORMAL,
+    ) -> "Future[CommandResult]":
+        """
+        Add a frame to the connection. Returns immediately.
+
+        Args:
+        -----
+            frame (bytes): The encoded frame to send to the controller.
+            key (Optional[Hashable]): Identifies frames that supersede each other, e.g. the channel and command type.
+            priority (Priority): `CRITICAL` frames are sent before all other waiting frames and cancel the waiting frames
+                with the same key. Other priorities are sent in order.
+
+        Returns:
+        --------
+            Future[CommandResult]: Future completing with the time the frame was sent, or holding the exception
+                raised while sending it. Replies are not read by the engine.
+        """
+        return self.engine.send(self, frame, priority is Priority.CRITICAL, key)
+
+    def close(self) -> None:
+        """
+        Send all frames still waiting, then unregister and close the socket. Blocks until done.
+        """
+        self.engine.close(self)
+        self.closed.wait()
+
+
+class IOEngine:
+    """
+    Class representing a single-threaded I/O engine owning the sockets of many controllers.
+    The engine thread multiplexes all sockets with a selector (epoll on Linux) and paces each
+    controller using a heap keyed by the next time the controller may receive a command. This
+    allows every controller to run at its full rate without a thread per controller.
+
+    Replies from the controllers are read and discarded, so they never fill up the receive buffers.
+    """
+
+    def __init__(self, wait_time: float = WAIT_TIME) -> None:
+        """
+        Initialize the engine and start the engine thread.
+
+        Args:
+        -----
+            wait_time (float) [s]: The minimum time between two commands sent to the same controller.
+        """
+        self.__wait_time = wait_time
+        self.__selector = selectors.DefaultSelector()
+        self.__lock = threading.Lock()
+        self.__running = True
+
+        # Connections with new frames or close requests, handed to the engine thread
+        self.__ready: List[EngineConnection] = []
+
+        # Connections with frames waiting, keyed by the time of their next allowed send.
+        # Only accessed by the engine thread. The counter breaks ties between equal times
+        self.__heap: List[Tuple[float, int, EngineConnection]] = []
+        self.__counter = itertools.count()
+
+        # Socket pair used to wake up the engine thread when it is waiting in the selector
+        self.__wake_r, self.__wake_w = socket.socketpair()
+        self.__wake_r.setblocking(False)
+        self.__wake_w.setblocking(False)
+        self.__selector.register(self.__wake_r, selectors.EVENT_READ, None)
+
+        self.__thread = threading.Thread(
+            target=self.__run, name="VSTLight-engine", daemon=True
+        )
+        self.__thread.start()
+
+    def attach(self, sock: socket.socket) -> EngineConnection:
+        """
+        Hand over a connected controller socket to the engine. The engine takes ownership of the
+        socket and switches it to non-blocking mode.
+
+        Args:
+        -----
+            sock (socket.socket): The connected controller socket.
+
+        Returns:
+        --------
+            EngineConnection: The connection used to send frames to the controller.
+        """
+        connection = EngineConnection(self, sock)
+        sock.setblocking(False)
+
+        with self.__lock:
+            if not self.__running:
+                raise RuntimeError("Cannot attach sockets to a stopped engine")
+
+            connection.scheduled = True
+            self.__ready.append(connection)
+
+        self.__wake()
+
+        return connection
+
+    def send(
+        self,
+        connection: EngineConnection,
+        frame: bytes,
+        critical: bool = False,
+        key: Optional[Hashable] = None,
+    ) -> "Future[CommandResult]":
+        """
+        Add a frame to the frames waiting to be sent on a connection. Returns immediately.
+
+        Args:
+        -----
+            connection (EngineConnection): The connection to send the frame on.
+            frame (bytes): The encoded frame to send to the controller.
+            critical (bool): Send the frame before all waiting frames that are not critical, and cancel the waiting
+                frames that are not critical with the same key.
+            key (Optional[Hashable]): Identifies frames that supersede each other, e.g. the channel and command type.
+
+        Returns:
+        --------
+            Future[CommandResult]: Future completing with the time the frame was sent, or holding the exception
+                raised while sending it. Replies are not read by the engine.
+        """
+        future: "Future[CommandResult]" = Future()
+        stale: List["Future[CommandResult]"] = []
+
+        with self.__lock:
+            if connection.closing:
+                raise RuntimeError("Cannot add commands to a closed connection")
+
+            # Critical frames are kept in order at the front of the waiting frames, and cancel the
+            # frames they supersede, e.g. intensity commands that would turn a channel back on
+            if critical:
+                if key is not None:
+                    stale = self.__cancel_stale(connection, key)
+
+                connection.pending.insert(connection.critical, (frame, key, future))
+                connection.critical += 1
+            else:
+                connection.pending.append((frame, key, future))
+
+            # Connections already scheduled pick up the frame when their turn comes
+            wake = not connection.scheduled
+            if wake:
+                connection.scheduled = True
+                self.__ready.append(connection)
+
+        if wake:
+            self.__wake()
+
+        for cancelled in stale:
+            cancelled.cancel()
+
+        return future
+
+    def close(self, connection: EngineConnection) -> None:
+        """
+        Request a connection to be closed once all its waiting frames have been sent. Returns
+        immediately, use `EngineConnection.close` to wait for the socket to be closed.
+
+        Args:
+        -----
+            connection (EngineConnection): The connection to close.
+        """
+        with self.__lock:
+            connection.closing = True
+
+            wake = not connection.scheduled
+            if wake:
+                connection.scheduled = True
+                self.__ready.append(connection)
+
+        if wake:
+            self.__wake()
+
+    def shutdown(self) -> None:
+        """
+        Send all frames still waiting, close all connections and stop the engine thread.
+        """
+        with self.__lock:
+            self.__running = False
+
+        self.__wake()
+        self.__thread.join()
+
+        self.__selector.close()
+        self.__wake_r.close()
+        self.__wake_w.close()
+
+    def __cancel_stale(
+        self, connection: EngineConnection, key: Hashable
+    ) -> List["Future[CommandResult]"]:
+        """
+        Remove the frames waiting with a key that are not critical. Must be called while holding the lock.
+
+        Args:
+        -----
+            connection (EngineConnection): The connection the frames are waiting on.
+            key (Hashable): The key of the frames to remove.
+
+        Returns:
+        --------
+            List[Future[CommandResult]]: The futures of the removed frames, to be cancelled.
+        """
+        critical = list(itertools.islice(connection.pending, connection.critical))
+        stale = []
+        waiting = []
+
+        for entry in itertools.islice(connection.pending, connection.critical, None):
+            if entry[1] == key:
+                stale.append(entry[2])
+            else:
+                waiting.append(entry)
+
+        if stale:
+            connection.pending = deque(critical + waiting)
+
+        return stale
+
+    def __wake(self) -> None:
+        """
+        Wake up the engine thread if it is waiting in the selector.
+        """
+        try:
+            self.__wake_w.send(b"\0")
+        except BlockingIOError:
+            # The engine thread has not yet consumed earlier wake-ups, so it will wake up anyway
+            pass
+
+    def __run(self) -> None:
+        """
+        Engine thread main loop. Waits for socket events or the next allowed send time, whichever
+        comes first, and sends one frame on every connection whose time has come.
+        """
+        while True:
+            timeout = None
+            if self.__heap:
+                timeout = max(0.0, self.__heap[0][0] - time.monotonic())
+
+            for key, _ in self.__selector.select(timeout):
+                if key.data is None:
+                    self.__wake_r.recv(4096)
+                else:
+                    self.__read(key.data)
+
+            with self.__lock:
+                ready, self.__ready = self.__ready, []
+                running = self.__running
+
+            for connection in ready:
+                self.__schedule(connection)
+
+            now = time.monotonic()
+            while self.__heap and self.__heap[0][0] <= now:
+                _, _, connection = heapq.heappop(self.__heap)
+                self.__send_next(connection)
+                self.__schedule(connection)
+
+            if not running and not self.__heap:
+                break
+
+        # Close the connections that were never asked to close
+        for key in list(self.__selector.get_map().values()):
+            if key.data is not None:
+                self.__finish(key.data, None)
+
+    def __schedule(self, connection: EngineConnection) -> None:
+        """
+        Register a new connection with the selector and place it on the heap if it has frames
+        waiting. Connections without frames are closed if requested, or left unscheduled.
+
+        Args:
+        -----
+            connection (EngineConnection): The connection to schedule.
+        """
+        if connection.closed.is_set():
+            return
+
+        if not connection.registered:
+            self.__selector.register(connection.sock, selectors.EVENT_READ, connection)
+            connection.registered = True
+
+        with self.__lock:
+            has_pending = bool(connection.pending) or connection.partial is not None
+            if not has_pending:
+                connection.scheduled = False
+
+        if has_pending:
+            heapq.heappush(
+                self.__heap, (connection.next_send, next(self.__counter), connection)
+            )
+        elif connection.closing:
+            self.__finish(connection, None)
+
+    def __send_next(self, connection: EngineConnection) -> None:
+        """
+        Send the oldest frame waiting on a connection, or the rest of a partially sent frame.
+
+        Args:
+        -----
+            connection (EngineConnection): The connection to send on.
+        """
+        # The connection may have been closed by the controller while on the heap
+        if connection.closed.is_set():
+            return
+
+        offset = 0
+        if connection.partial is not None:
+            frame, future, offset = connection.partial
+            connection.partial = None
+        else:
+            with self.__lock:
+                frame, _, future = connection.pending.popleft()
+                connection.critical = max(0, connection.critical - 1)
+
+            if not future.set_running_or_notify_cancel():
+                return
+
+        try:
+            sent = offset + connection.sock.send(frame[offset:])
+        except BlockingIOError:
+            sent = offset
+        except OSError as e:
+            future.set_exception(e)
+            self.__finish(connection, e)
+            return
+
+        if sent < len(frame):
+            # The send buffer is full, send the rest of the frame once there is room
+            connection.partial = (frame, future, sent)
+            connection.next_send = time.monotonic() + RETRY_TIME
+            return
+
+        connection.next_send = time.monotonic() + self.__wait_time
+        future.set_result(CommandResult(frame, None, None, time.perf_counter(), None))
+
+    def __read(self, connection: EngineConnection) -> None:
+        """
+        Read and discard the replies waiting on a connection. Closes the connection if the
+        controller has closed it.
+
+        Args:
+        -----
+            connection (EngineConnection): The connection to read from.
+        """
+        try:
+            data = connection.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self.__finish(connection, e)
+            return
+
+        if not data:
+            self.__finish(
+                connection, ConnectionError("Connection closed by the controller")
+            )
+
+    def __finish(
+        self, connection: EngineConnection, error: Optional[BaseException]
+    ) -> None:
+        """
+        Unregister and close a connection. Frames still waiting fail with the given error.
+
+        Args:
+        -----
+            connection (EngineConnection): The connection to close.
+            error (Optional[BaseException]): The reason the connection is closed, None if requested.
+        """
+        if connection.closed.is_set():
+            return
+
+        if connection.registered:
+            self.__selector.unregister(connection.sock)
+            connection.registered = False
+
+        connection.sock.close()
+
+        with self.__lock:
+            connection.closing = True
+            pending, connection.pending = connection.pending, deque()
+            connection.critical = 0
+
+        if connection.partial is not None:
+            connection.partial[1].set_exception(
+                error or ConnectionError("Connection closed before sending")
+            )
+            connection.partial = None
+
+        for _, _, future in pending:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(
+                    error or ConnectionError("Connection closed before sending")
+                )
+
+        connection.closed.set()
@@ -0,0 +1,286 @@
+import math
+import operator
+import socket
+import struct
+from enum import Enum
+from typing import Any, List, Mapping, Optional, Tuple
+from .protocol import CommandResult, ResponseStatus
+from .scene import ChannelSetting, Scene
+
+# Default path of the Unix domain socket served by the daemon
+SOCKET_PATH = "/tmp/vstlight.sock"
+
+# Every message is prefixed with its length
+LENGTH = struct.Struct("<I")
+
+# Request: request id, method and controller index, followed by the tagged arguments
+REQUEST = struct.Struct("<IBB")
+
+# Reply: request id and outcome, followed by the tagged return value or the error message
+REPLY = struct.Struct("<IB")
+
+# Tags of the encoded values
+_NONE = b"N"
+_BOOL = b"?"
+_INT = b"i"
+_FLOAT = b"d"
+_STR = b"s"
+_LIST = b"["
+_MAPPING = b"{"
+_SCENE = b"S"
+_RESULT = b"R"
+
+_INT_VALUE = struct.Struct("<q")
+_FLOAT_VALUE = struct.Struct("<d")
+_COUNT = struct.Struct("<H")
+_RESULT_TIMES = struct.Struct("<Bddd")
+
+# Statuses of a result, 0 meaning no status
+_STATUSES = (None, ResponseStatus.ACK, ResponseStatus.NAK, ResponseStatus.TIMEOUT)
+
+
+class Method(Enum):
+    """
+    Enum representing the `NetworkController` methods a client may call through the daemon. The
+    value is the code of the method in a request.
+    """
+
+    SET_INTENSITY = 1
+    GET_INTENSITY = 2
+    SET_ON = 3
+    SET_OFF = 4
+    TOGGLE = 5
+    SET_STROBE_MODE = 6
+    GET_STROBE_MODE = 7
+    SET_ALL_INTENSITIES = 8
+    SET_ALL_ON = 9
+    SET_ALL_OFF = 10
+    TOGGLE_ALL = 11
+    SET_ALL_STROBE_MODES = 12
+    SET_INTENSITIES = 13
+    SET_STROBE_MODES = 14
+    FADE = 15
+    RAMP = 16
+    CAPTURE_SCENE = 17
+    SAVE_SCENE = 18
+    DELETE_SCENE = 19
+    APPLY_SCENE = 20
+    FORCE_RESYNC = 21
+    WAIT_SETTLED = 22
+
+
+class Outcome(Enum):
+    """
+    Enum representing the outcome of a request. Errors carry the message of the exception raised by the
+    controller, and are raised again by the client as the same exception type.
+    """
+
+    OK = 0
+    VALUE_ERROR = 1
+    CONNECTION_ERROR = 2
+    ERROR = 3
+
+
+def pack_value(value: Any) -> bytes:
+    """
+    Encode an argument or return value of a method as a tag followed by its binary representation.
+    Supported are None, bools, ints, floats, strings, scenes, command results, and lists and mappings
+    of these. Other integral values and sequences, e.g. NumPy integers and arrays, are sent as ints and lists.
+
+    Args:
+    -----
+        value (Any): The value to encode.
+
+    Returns:
+    --------
+        bytes: The encoded value.
+    """
+    if value is None:
+        return _NONE
+    if isinstance(value, bool):
+        return _BOOL + bytes((value,))
+    if isinstance(value, int):
+        return _INT + _INT_VALUE.pack(value)
+    if isinstance(value, float):
+        return _FLOAT + _FLOAT_VALUE.pack(value)
+    if isinstance(value, str):
+        data = value.encode("utf-8")
+        return _STR + _COUNT.pack(len(data)) + data
+    if isinstance(value, Scene):
+        return (
+            _SCENE
+            + bytes((len(value.channels),))
+            + b"".join(
+                bytes((s.intensity, s.state, s.strobe_mode)) for s in value.channels
+            )
+        )
+    if isinstance(value, CommandResult):
+        frame = value.frame if value.frame is not None else b""
+        return (
+            _RESULT
+            + bytes((len(frame),))
+            + frame
+            + _RESULT_TIMES.pack(
+                _STATUSES.index(value.status),
+                _nan(value.scheduled),
+                _nan(value.sent),
+                _nan(value.acked),
+            )
+        )
+    if isinstance(value, (list, tuple)):
+        return _LIST + _COUNT.pack(len(value)) + b"".join(map(pack_value, value))
+    if isinstance(value, Mapping):
+        return (
+            _MAPPING
+            + _COUNT.pack(len(value))
+            + b"".join(pack_value(k) + pack_value(v) for k, v in value.items())
+        )
+
+    if hasattr(value, "__index__"):
+        return pack_value(operator.index(value))
+
+    try:
+        items = list(value)
+    except TypeError:
+        raise ValueError(
+            f"Cannot encode value of type {type(value).__name__}"
+        ) from None
+
+    return pack_value(items)
+
+
+def unpack_value(data: bytes, offset: int = 0) -> Tuple[Any, int]:
+    """
+    Decode a value encoded by `pack_value`.
+
+    Args:
+    -----
+        data (bytes): The buffer holding the value.
+        offset (int): The position of the tag of the value in the buffer.
+
+    Returns:
+    --------
+        Tuple[Any, int]: The value and the position following it.
+    """
+    tag = data[offset : offset + 1]
+    offset += 1
+
+    if tag == _NONE:
+        return None, offset
+    if tag == _BOOL:
+        return bool(data[offset]), offset + 1
+    if tag == _INT:
+        return _INT_VALUE.unpack_from(data, offset)[0], offset + _INT_VALUE.size
+    if tag == _FLOAT:
+        return _FLOAT_VALUE.unpack_from(data, offset)[0], offset + _FLOAT_VALUE.size
+    if tag == _STR:
+        (length,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        return data[offset : offset + length].decode("utf-8"), offset + length
+    if tag == _SCENE:
+        count = data[offset]
+        offset += 1
+        channels = tuple(
+            ChannelSetting(data[i], bool(data[i + 1]), data[i + 2])
+            for i in range(offset, offset + 3 * count, 3)
+        )
+        return Scene(channels), offset + 3 * count
+    if tag == _RESULT:
+        length = data[offset]
+        frame = data[offset + 1 : offset + 1 + length]
+        offset += 1 + length
+        status, scheduled, sent, acked = _RESULT_TIMES.unpack_from(data, offset)
+        result = CommandResult(
+            frame or None,
+            _STATUSES[status],
+            _none(scheduled),
+            _none(sent),
+            _none(acked),
+        )
+        return result, offset + _RESULT_TIMES.size
+    if tag == _LIST:
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        items: List[Any] = []
+        for _ in range(count):
+            item, offset = unpack_value(data, offset)
+            items.append(item)
+        return items, offset
+    if tag == _MAPPING:
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        mapping = {}
+        for _ in range(count):
+            key, offset = unpack_value(data, offset)
+            mapping[key], offset = unpack_value(data, offset)
+        return mapping, offset
+
+    raise ValueError(f"Unknown value tag: {tag!r}")
+
+
+def send_message(sock: socket.socket, body: bytes) -> None:
+    """
+    Send a length-prefixed message. Calls on the same socket must be serialized by the caller.
+
+    Args:
+    -----
+        sock (socket.socket): The connected socket.
+        body (bytes): The encoded request or reply.
+    """
+    sock.sendall(LENGTH.pack(len(body)) + body)
+
+
+def receive_message(sock: socket.socket) -> Optional[bytes]:
+    """
+    Blocking function call! Receive a length-prefixed message.
+
+    Args:
+    -----
+        sock (socket.socket): The connected socket.
+
+    Returns:
+    --------
+        Optional[bytes]: The body of the message, or None if the peer closed the connection.
+    """
+    header = _receive_exactly(sock, LENGTH.size)
+    if header is None:
+        return None
+
+    return _receive_exactly(sock, LENGTH.unpack(header)[0])
+
+
+def _receive_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    """
+    Receive a number of bytes from a socket.
+
+    Args:
+    -----
+        sock (socket.socket): The connected socket.
+        size (int): The number of bytes to receive.
+
+    Returns:
+    --------
+        Optional[bytes]: The received bytes, or None if the peer closed the connection first.
+    """
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+
+    return bytes(data)
+
+
+def _nan(value: Optional[float]) -> float:
+    """
+    Encode an optional time, with NaN standing for None.
+    """
+    return math.nan if value is None else value
+
+
+def _none(value: float) -> Optional[float]:
+    """
+    Decode an optional time encoded by `_nan`.
+    """
+    return None if math.isnan(value) else value
@@ -0,0 +1,306 @@
+import bisect
+import math
+import threading
+from enum import Enum
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+# Upper bounds in seconds of the histogram buckets, from the cost of a table lookup to a blocked socket
+BUCKETS = (
+    1e-6,
+    5e-6,
+    1e-5,
+    5e-5,
+    1e-4,
+    5e-4,
+    1e-3,
+    2.5e-3,
+    5e-3,
+    1e-2,
+    2.5e-2,
+    5e-2,
+    0.1,
+    0.5,
+    math.inf,
+)
+
+
+class Stage(Enum):
+    """
+    Enum representing the timed stages of sending a command.
+
+    - `VALIDATION`: Checking the arguments, updating the local state and looking up the encoded frame.
+    - `LOCK`: Waiting for a free in-flight slot when reading replies, and for the send lock.
+    - `LIMITER`: Waiting in the rate limiter for the 5ms spacing.
+    - `SEND`: The send syscall.
+    """
+
+    VALIDATION = "validation"
+    LOCK = "lock"
+    LIMITER = "limiter"
+    SEND = "send"
+
+
+class CommandTiming(NamedTuple):
+    """
+    The time in seconds spent in each stage of sending a command. Stages that were not timed are None:
+    the validation of commands sent by a sender thread is timed in the calling thread and only added to
+    the histogram, and commands sent by resynchronization are not validated.
+    """
+
+    frame: bytes
+    validation: Optional[float]
+    lock: float
+    limiter: float
+    send: float
+
+
+class HistogramSnapshot(NamedTuple):
+    """
+    The state of a histogram. `buckets` holds the upper bound of every bucket together with the
+    cumulative number of observations up to that bound, as in the Prometheus format.
+    """
+
+    buckets: Tuple[Tuple[float, int], ...]
+    samples: int
+    total: float
+
+
+class Metrics:
+    """
+    Class collecting the timing and counters of the commands sent by one or more controllers. Pass
+    it to `NetworkController` to enable the instrumentation, which costs a single attribute check per
+    command when disabled. Counters and histograms may be read at any time from any thread, and the
+    hooks are called with the `CommandTiming` of every command sent by the thread sending it.
+    """
+
+    def __init__(
+        self, namespace: str = "vstlight", labels: Optional[Mapping[str, str]] = None
+    ) -> None:
+        """
+        Initialize the Metrics object with all counters and histograms at 0.
+
+        Args:
+        -----
+            namespace (str): The prefix of the metric names in the Prometheus format.
+            labels (Optional[Mapping[str, str]]): Labels added to every metric in the Prometheus format,
+                e.g. `{"controller": "192.168.11.20"}`.
+        """
+        self.__namespace = namespace
+        self.__labels = dict(labels) if labels is not None else {}
+        self.__lock = threading.Lock()
+        self.__hooks: List[Callable[[CommandTiming], None]] = []
+
+        self.__sent = 0
+        self.__suppressed = 0
+        self.__errors = 0
+        self.__buckets: Dict[Stage, List[int]] = {
+            stage: [0] * len(BUCKETS) for stage in Stage
+        }
+        self.__sums: Dict[Stage, float] = {stage: 0.0 for stage in Stage}
+
+    @property
+    def sent(self) -> int:
+        """
+        Get the number of commands handed to the controller, i.e. sent, queued or handed to the I/O engine.
+
+        Returns:
+        --------
+            int: The number of commands.
+        """
+        return self.__sent
+
+    @property
+    def suppressed(self) -> int:
+        """
+        Get the number of method calls that did not send a command, as it would not change the output of the
+        controller, e.g. setting the intensity of a channel that is off or repeated values in diff-only mode.
+
+        Returns:
+        --------
+            int: The number of suppressed commands.
+        """
+        return self.__suppressed
+
+    @property
+    def errors(self) -> int:
+        """
+        Get the number of commands that failed to send.
+
+        Returns:
+        --------
+            int: The number of failed commands.
+        """
+        return self.__errors
+
+    def add_hook(self, hook: Callable[[CommandTiming], None]) -> None:
+        """
+        Register a function called with the timing of every command sent. Hooks are called by the thread
+        sending the command, after the command was sent, and should return quickly.
+
+        Args:
+        -----
+            hook (Callable[[CommandTiming], None]): The function to call.
+        """
+        with self.__lock:
+            self.__hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[CommandTiming], None]) -> None:
+        """
+        Unregister a function registered with `add_hook`.
+
+        Args:
+        -----
+            hook (Callable[[CommandTiming], None]): The function to unregister.
+        """
+        with self.__lock:
+            self.__hooks.remove(hook)
+
+    def histogram(self, stage: Stage) -> HistogramSnapshot:
+        """
+        Get the distribution of the time spent in a stage.
+
+        Args:
+        -----
+            stage (Stage): The stage to get the histogram of.
+
+        Returns:
+        --------
+            HistogramSnapshot: The cumulative bucket counts, number of observations and total time in seconds.
+        """
+        with self.__lock:
+            counts = list(self.__buckets[stage])
+            total = self.__sums[stage]
+
+        cumulative = []
+        running = 0
+        for bound, count in zip(BUCKETS, counts):
+            running += count
+            cumulative.append((bound, running))
+
+        return HistogramSnapshot(tuple(cumulative), running, total)
+
+    def observe(self, stage: Stage, seconds: float) -> None:
+        """
+        Add the time spent in a stage by a command to its histogram.
+
+        Args:
+        -----
+            stage (Stage): The stage the time was spent in.
+            seconds (float) [s]: The time spent.
+        """
+        idx = bisect.bisect_left(BUCKETS, seconds)
+
+        with self.__lock:
+            self.__buckets[stage][idx] += 1
+            self.__sums[stage] += seconds
+
+    def record(self, timing: CommandTiming) -> None:
+        """
+        Add the timing of a command sent to the histograms and pass it to the hooks.
+
+        Args:
+        -----
+            timing (CommandTiming): The timing of the command.
+        """
+        if timing.validation is not None:
+            self.observe(Stage.VALIDATION, timing.validation)
+
+        self.observe(Stage.LOCK, timing.lock)
+        self.observe(Stage.LIMITER, timing.limiter)
+        self.observe(Stage.SEND, timing.send)
+
+        for hook in list(self.__hooks):
+            hook(timing)
+
+    def count_sent(self) -> None:
+        """
+        Count a command handed to the controller.
+        """
+        with self.__lock:
+            self.__sent += 1
+
+    def count_suppressed(self) -> None:
+        """
+        Count a method call that did not need to send a command.
+        """
+        with self.__lock:
+            self.__suppressed += 1
+
+    def count_error(self) -> None:
+        """
+        Count a command that failed to send.
+        """
+        with self.__lock:
+            self.__errors += 1
+
+    def prometheus(self) -> str:
+        """
+        Get a snapshot of all metrics in the Prometheus text exposition format.
+
+        Returns:
+        --------
+            str: The metrics, ending with a newline.
+        """
+        name = self.__namespace
+        lines = []
+
+        counters = (
+            ("commands_sent_total", "Commands handed to the controller.", self.sent),
+            (
+                "commands_suppressed_total",
+                "Commands not sent as they would not change the output.",
+                self.suppressed,
+            ),
+            ("command_errors_total", "Commands that failed to send.", self.errors),
+        )
+
+        for metric, description, value in counters:
+            lines.append(f"# HELP {name}_{metric} {description}")
+            lines.append(f"# TYPE {name}_{metric} counter")
+            lines.append(f"{name}_{metric}{self.__format_labels()} {value}")
+
+        lines.append(
+            f"# HELP {name}_command_stage_seconds Time spent in each stage of sending a command."
+        )
+        lines.append(f"# TYPE {name}_command_stage_seconds histogram")
+
+        for stage in Stage:
+            histogram = self.histogram(stage)
+
+            for bound, count in histogram.buckets:
+                le = "+Inf" if bound == math.inf else repr(bound)
+                labels = self.__format_labels(stage=stage.value, le=le)
+                lines.append(f"{name}_command_stage_seconds_bucket{labels} {count}")
+
+            labels = self.__format_labels(stage=stage.value)
+            lines.append(f"{name}_command_stage_seconds_sum{labels} {histogram.total}")
+            lines.append(
+                f"{name}_command_stage_seconds_count{labels} {histogram.samples}"
+            )
+
+        return "\n".join(lines) + "\n"
+
+    def __format_labels(self, **extra: str) -> str:
+        """
+        Format the labels of a metric in the Prometheus format.
+
+        Args:
+        -----
+            **extra (str): Labels added to the labels of the object.
+
+        Returns:
+        --------
+            str: The labels in braces, or an empty string if there are none.
+        """
+        labels = {**self.__labels, **extra}
+
+        if not labels:
+            return ""
+
+        # Backslashes, quotes and newlines must be escaped in label values
+        escaped = {
+            k: v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            for k, v in labels.items()
+        }
+
+        return "{" + ",".join(f'{k}="{v}"' for k, v in escaped.items()) + "}"
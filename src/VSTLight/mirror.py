@@ -0,0 +1,261 @@
+import os
+import struct
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Set, cast
+from .protocol import MAX_CHANNELS
+from .scene import ChannelSetting, Scene
+
+# Identifies mirror segments and the version of their layout
+MAGIC = b"VSTMIR01"
+
+# Header: magic, number of channels and sequence number. The sequence is odd while an update is written
+HEADER = struct.Struct("<8sH6xQ")
+SEQUENCE = struct.Struct("<Q")
+SEQUENCE_OFFSET = 16
+
+# Channel: intensity, on-off state and strobe mode, as packed by `ChannelBank`
+CHANNEL = struct.Struct("<BBB")
+
+# Names of the segments created by this process, which attaching must not untrack
+_created: Set[str] = set()
+
+
+class StateMirror:
+    """
+    Class representing a copy of the channel state of a controller in a `multiprocessing.shared_memory`
+    segment, readable by other processes without system calls or round-trips to the owning process.
+    Pass it to `NetworkController` to publish the state of the controller every time it changes, and
+    attach to it by name in the reading processes.
+
+    Updates are guarded by a sequence lock: the owner makes the sequence number odd, writes the state and
+    makes it even again, and readers retry until they copied the state between two reads of the same even
+    sequence number. Readers therefore never see a partially written update, and never block the owner.
+
+    ```python
+    mirror = StateMirror(4, "vstlight-lab")
+    lights = NetworkController(4, mirror=mirror)
+
+    # In another process
+    print(StateMirror.attach("vstlight-lab").get_intensity(1))
+    ```
+    """
+
+    def __init__(self, channels: int, name: Optional[str] = None) -> None:
+        """
+        Create the shared memory segment, holding channels that are off with intensity 0 and strobe mode 1.
+
+        Args:
+        -----
+            channels (int): The number of channels of the controller [1-4].
+            name (Optional[str]): The name of the segment. Defaults to a unique name chosen by the OS.
+        """
+        if not 1 <= channels <= MAX_CHANNELS:
+            raise ValueError(
+                f"Invalid number of channels: {channels} - Must be between 1 and {MAX_CHANNELS}"
+            )
+
+        self.__memory = shared_memory.SharedMemory(
+            name, create=True, size=HEADER.size + channels * CHANNEL.size
+        )
+        self.__buf = cast(memoryview, self.__memory.buf)
+        self.__owner = True
+        self.__channels = channels
+        self.__sequence = 0
+        _created.add(self.__memory.name)
+
+        # Serializes the writers of the owning process, e.g. the startup and the calling threads
+        self.__write_lock = threading.Lock()
+
+        HEADER.pack_into(self.__buf, 0, MAGIC, channels, 0)
+        for channel_idx in range(channels):
+            CHANNEL.pack_into(
+                self.__buf, HEADER.size + channel_idx * CHANNEL.size, 0, 0, 1
+            )
+
+    @classmethod
+    def attach(cls, name: str) -> "StateMirror":
+        """
+        Attach to a mirror created by another process, for reading.
+
+        Args:
+        -----
+            name (str): The name of the segment.
+
+        Returns:
+        --------
+            StateMirror: The attached mirror.
+        """
+        memory = shared_memory.SharedMemory(name)
+
+        buf = cast(memoryview, memory.buf)
+
+        # Only the owner may remove the segment, readers must not unlink it when they exit
+        if os.name == "posix" and memory.name not in _created:
+            resource_tracker.unregister(f"/{memory.name}", "shared_memory")
+
+        magic, channels, _ = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            memory.close()
+            raise ValueError(f"Not a VSTLight state mirror: {name}")
+
+        mirror = cls.__new__(cls)
+        mirror.__memory = memory
+        mirror.__buf = buf
+        mirror.__owner = False
+        mirror.__channels = channels
+        mirror.__sequence = 0
+
+        return mirror
+
+    def __enter__(self) -> "StateMirror":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    @property
+    def name(self) -> str:
+        """
+        Get the name of the shared memory segment, to attach to it from other processes.
+
+        Returns:
+        --------
+            str: The name of the segment.
+        """
+        return self.__memory.name
+
+    @property
+    def channels(self) -> int:
+        """
+        Get the number of channels of the mirrored controller.
+
+        Returns:
+        --------
+            int: The number of channels.
+        """
+        return self.__channels
+
+    def publish(self, data: bytes) -> None:
+        """
+        Write the state of all channels. Only the process creating the mirror may publish.
+
+        Args:
+        -----
+            data (bytes): The packed state of the channels of the controller, as returned by `ChannelBank.pack`.
+        """
+        if not self.__owner:
+            raise RuntimeError("Only the process creating a state mirror may publish")
+
+        if len(data) != self.__channels * CHANNEL.size:
+            raise ValueError(
+                f"Expected the state of {self.__channels} channels, got {len(data)} bytes"
+            )
+
+        buf = self.__buf
+
+        with self.__write_lock:
+            SEQUENCE.pack_into(buf, SEQUENCE_OFFSET, self.__sequence + 1)
+            buf[HEADER.size : HEADER.size + len(data)] = data
+            SEQUENCE.pack_into(buf, SEQUENCE_OFFSET, self.__sequence + 2)
+
+            self.__sequence += 2
+
+    def read(self) -> Scene:
+        """
+        Read a consistent copy of the state of all channels, retrying while an update is being written.
+
+        Returns:
+        --------
+            Scene: The setting of every channel.
+        """
+        buf = self.__buf
+        end = HEADER.size + self.__channels * CHANNEL.size
+
+        while True:
+            (before,) = SEQUENCE.unpack_from(buf, SEQUENCE_OFFSET)
+            data = bytes(buf[HEADER.size : end])
+            (after,) = SEQUENCE.unpack_from(buf, SEQUENCE_OFFSET)
+
+            if before == after and not before & 1:
+                break
+
+            # Let the owner finish the update
+            time.sleep(0)
+
+        return Scene(
+            tuple(
+                ChannelSetting(data[i], bool(data[i + 1]), data[i + 2])
+                for i in range(0, len(data), CHANNEL.size)
+            )
+        )
+
+    def get_intensity(self, channel_id: int) -> int:
+        """
+        Get the current intensity of a channel.
+
+        Args:
+        -----
+            channel_id (int): The channel to get the intensity of [1-4].
+
+        Returns:
+        --------
+            int: The intensity of the channel.
+        """
+        self.__verify_channel_id(channel_id)
+
+        return self.read().channels[channel_id - 1].intensity
+
+    def get_strobe_mode(self, channel_id: int) -> int:
+        """
+        Get the strobe mode of a channel.
+
+        Args:
+        -----
+            channel_id (int): The channel to get the strobe mode of [1-4].
+
+        Returns:
+        --------
+            int: The strobe mode of the channel.
+        """
+        self.__verify_channel_id(channel_id)
+
+        return self.read().channels[channel_id - 1].strobe_mode
+
+    def get_state(self, channel_id: int) -> bool:
+        """
+        Get the on-off state of a channel.
+
+        Args:
+        -----
+            channel_id (int): The channel to get the state of [1-4].
+
+        Returns:
+        --------
+            bool: The state of the channel [On: True, Off: False].
+        """
+        self.__verify_channel_id(channel_id)
+
+        return self.read().channels[channel_id - 1].state
+
+    def __verify_channel_id(self, channel_id: int) -> None:
+        """
+        Verify that a channel ID is valid. Throws a ValueError if not.
+
+        Args:
+        -----
+            channel_id (int): The channel ID to verify.
+        """
+        if not 1 <= channel_id <= self.__channels:
+            raise ValueError(f"Channel ID must be between 1 and {self.__channels}")
+
+    def close(self) -> None:
+        """
+        Detach from the segment. The owner also removes the segment, readers attached keep their mapping.
+        """
+        self.__memory.close()
+
+        if self.__owner:
+            _created.discard(self.__memory.name)
+            self.__memory.unlink()
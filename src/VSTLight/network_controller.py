@@ -1,11 +1,45 @@
-import socket
+import operator
+import threading
 import time
-from .channel import Channel
-from .utils import validate_ip_format, compare_and_wait
-
-# Waiting time between commands in seconds (5ms) to avoid overloading the controller.
-# Dictated by the VLP controller specsheet
-WAIT_TIME = 0.005
+from contextlib import nullcontext
+from concurrent.futures import Future, wait
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ContextManager,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+    cast,
+)
+from .channel import ChannelBank
+from .command_queue import Backpressure, CommandQueue, Priority
+from .connection import INITIAL_BACKOFF, MAX_BACKOFF, ControllerConnection
+from .fade import plan_ramp
+from .io_engine import EngineConnection, IOEngine
+from .metrics import CommandTiming, Metrics, Stage
+from .mirror import StateMirror
+from .protocol import (
+    INTENSITY_FRAMES,
+    MAX_STROBE_MODE,
+    NO_COMMAND,
+    STROBE_FRAMES,
+    CommandResult,
+    ResponseStatus,
+)
+from .rate_limiter import RateLimiter
+from .response_reader import ResponseReader
+from .scene import CaptureStep, Scene, plan_scene
+from .utils import validate_ip_format
+
+# Only imported for type checking, so `python -m VSTLight.recorder` does not find it imported already
+if TYPE_CHECKING:
+    from .recorder import Recorder
 
 
 class NetworkController:
@@ -16,7 +50,29 @@ class NetworkController:
     """
 
     def __init__(
-        self, channels: int, ip: str = "192.168.11.20", port: int = 1000
+        self,
+        channels: int,
+        ip: str = "192.168.11.20",
+        port: int = 1000,
+        queued: bool = False,
+        queue_size: int = 64,
+        backpressure: Backpressure = Backpressure.BLOCK,
+        coalesce: bool = False,
+        diff_only: bool = False,
+        engine: Optional[IOEngine] = None,
+        max_in_flight: int = 0,
+        response_timeout: float = 0.1,
+        reconnect: bool = False,
+        initial_backoff: float = INITIAL_BACKOFF,
+        max_backoff: float = MAX_BACKOFF,
+        lazy: bool = False,
+        reset: bool = True,
+        limiter: Optional[RateLimiter] = None,
+        metrics: Optional[Metrics] = None,
+        recorder: Optional["Recorder"] = None,
+        thread_safe: bool = False,
+        mirror: Optional[StateMirror] = None,
+        bank: Optional[ChannelBank] = None,
     ) -> None:
         """
         Initialize the NetworkController object and connect to the controller itself.
@@ -31,13 +87,119 @@ class NetworkController:
         The physical VLP light controller has a limit to the number of commands it can
         process continously. To avoid overloading the controller, commands are limited
         to one every 5ms. If a command is sent before this time has passed, the call will
-        block until the time has passed.
+        block until the time has passed. The spacing is enforced by a `RateLimiter`, which may
+        be passed to add a safety margin and whose `stats` report the actual spacing achieved.
+
+        In queued mode (`queued=True`) the object owns a dedicated sender thread. Methods update
+        the local channel state, add the encoded command to a bounded queue and return immediately
+        with a `concurrent.futures.Future` completing once the command has been sent. Methods
+        updating all channels return a list of futures, one per command. The `backpressure` argument
+        decides what happens when `queue_size` commands are already waiting: `Backpressure.BLOCK`
+        waits for a free slot, `Backpressure.DROP_OLDEST` cancels the oldest waiting command and
+        `Backpressure.RAISE` raises a `queue.Full` exception.
+
+        In all modes, methods changing the state return a future completing with a `CommandResult`,
+        or a list of futures for methods sending several commands. The result holds the frame sent, the
+        `time.perf_counter` time the rate limiter scheduled it for, the time `send` returned and the time
+        its reply was received, so e.g. a camera can be triggered as soon as a new intensity is on the
+        wire. Outside queued mode, futures of commands not awaiting a reply are already complete when the
+        method returns. Calls that do not need to send a command complete with a result without frame.
+        `wait_settled` blocks until all commands issued so far have been sent, or replied to.
+
+        The queue has three lanes. Turning channels off (and restoring the state with `force_resync`)
+        is critical: these commands are sent before all other waiting commands, never wait for a free
+        slot and cancel the waiting intensity commands of the channel, bounding the time from a stop
+        request to dark lights to the command being sent plus one 5ms slot per critical command. Strobe
+        mode changes and the steps of fades are bulk commands, sent after all other commands.
+
+        With `coalesce=True` in queued mode, a new intensity (including on/off) or strobe mode
+        command for a channel replaces the command of the same type still waiting in the queue for
+        that channel, so only the latest value is sent. The futures of replaced commands complete
+        together with the command replacing them. This bounds the delay to about one 5ms slot per
+        updated channel, regardless of how often the values are changed.
+
+        With `diff_only=True`, commands that would not change the output of the controller are
+        not sent. The effective output of each channel (its intensity, or 0 when off) and its strobe
+        mode are compared to the last values sent to the controller, so e.g. turning off a channel
+        that is already off costs no 5ms slot. If the controller may have been changed by other means,
+        e.g. a power cycle, call `force_resync` to send the full local state again.
+
+        Passing an `IOEngine` hands the socket of the controller over to the engine, which sends the
+        commands of many controllers from a single thread. Methods then behave as in queued mode
+        and return futures, but without a sender thread per controller. Commands are not coalesced.
+
+        With `max_in_flight` greater than 0, the replies of the controller are read by a dedicated
+        reader thread and matched to the commands in the order they were sent. Up to `max_in_flight`
+        commands may await their reply at a time, so commands are pipelined rather than waiting for a
+        round-trip each. The futures then complete once the reply is received, with the status
+        `ResponseStatus.ACK` or `ResponseStatus.NAK` as reported by the controller, or with
+        `ResponseStatus.TIMEOUT` if no reply was received within `response_timeout` seconds. Without
+        reading responses, the status of the results is None.
+
+        With `reconnect=True`, a lost connection is detected once: the call failing to send raises a
+        `ConnectionError`, and later calls fail immediately with a `ConnectionError` instead of blocking
+        on the socket timeout, while the local channel state is still updated. Meanwhile, the object
+        reconnects in the background, waiting `initial_backoff` seconds before the first attempt and
+        doubling the wait after every failed attempt, up to `max_backoff` seconds. Once reconnected,
+        the local state of all channels is sent to the controller as with `force_resync`.
+
+        With `lazy=True`, init returns immediately and the connection is opened by a background
+        thread. The `ready` future completes once the controller is connected and initialized, or
+        holds the `ConnectionError` if the controller is unreachable. Methods may be called right
+        away: the local channel state is updated, while commands block until the controller is ready.
+        With `reset=False`, the channels are not initialized to off with strobe mode 1 on startup,
+        saving two 5ms commands per channel. The local state then assumes these defaults regardless
+        of the actual state of the controller, until set by the methods or `force_resync`.
+
+        Passing a `Metrics` object enables the instrumentation of the commands: the time spent validating
+        each command, waiting for the send lock, waiting in the rate limiter and in the send syscall is
+        added to its histograms and passed to its hooks, and commands sent, suppressed and failed are
+        counted. A `Metrics` object may be shared by several controllers to aggregate their metrics.
+
+        Passing a `Recorder` records every frame sent to the controller with the time it was sent, under
+        the name `ip:port`. A `Recorder` may be shared by several controllers.
+
+        With `thread_safe=True`, the methods may be called from any number of threads at once. Each call
+        updates the local channel state and hands its commands on under a state lock, so the values last sent
+        to the controller match the local state however the calls of the threads interleave. Methods updating
+        all channels are applied as a whole. Combined with queued mode or an I/O engine,
+        the lock is only held to update the state and add the commands to the queue, and a single thread sends
+        them at the full rate of the controller. Otherwise the calling threads take turns sending, each holding
+        the lock for up to one 5ms slot per command.
+
+        Passing a `StateMirror` publishes the state of all channels to shared memory every time a command is
+        handed on (sent, or added to the queue in queued mode and with an I/O engine) or a method call changes
+        the local state without a command, so other processes can read it without asking this process.
+
+        The state of the channels is stored in a `ChannelBank`. Passing the same bank to all controllers of a
+        fleet packs the state of every channel of the fleet into a single array, read in batches with the
+        accessors of the bank. By default every controller stores its channels in a bank of its own.
 
         Args:
         -----
             channels (int): The number of channels the controller object should have. Must be between 1 and 4.
             ip (str): The IP address of the controller. Defaults to the native IP address of the VLP controllers.
             port (int): The port of the controller [0-65535]. Hard coded to 1000 in the VLP controllers.
+            queued (bool): Send commands from a dedicated sender thread instead of the calling thread.
+            queue_size (int): The maximum number of commands waiting to be sent in queued mode.
+            backpressure (Backpressure): Behaviour when a command is issued while the queue is full.
+            coalesce (bool): Replace waiting commands with newer commands of the same type for the same channel. Requires queued mode.
+            diff_only (bool): Skip commands that would not change the output of the controller.
+            engine (Optional[IOEngine]): Engine sending the commands instead of the calling thread. Excludes queued mode.
+            max_in_flight (int): The maximum number of commands awaiting their reply. 0 disables reading the replies.
+            response_timeout (float) [s]: The time to wait for the reply to a command before reporting a timeout.
+            reconnect (bool): Reconnect in the background and restore the channel state if the connection is lost. Excludes the I/O engine.
+            initial_backoff (float) [s]: The waiting time before the first reconnect attempt.
+            max_backoff (float) [s]: The longest waiting time between two reconnect attempts.
+            lazy (bool): Connect to the controller in the background instead of blocking init.
+            reset (bool): Initialize all channels to off with strobe mode 1 on startup.
+            limiter (Optional[RateLimiter]): Rate limiter spacing the commands. Defaults to the 5ms limit. Excludes the I/O engine,
+                which paces the commands itself.
+            metrics (Optional[Metrics]): Metrics collecting the timing and counters of the commands. None disables the instrumentation.
+            recorder (Optional[Recorder]): Recorder of the frames sent. Excludes the I/O engine, which sends the frames itself.
+            thread_safe (bool): Allow the methods to be called from several threads at once.
+            mirror (Optional[StateMirror]): Shared memory mirror of the channel state, for readers in other processes.
+            bank (Optional[ChannelBank]): Bank storing the channel state, shared with other controllers. Defaults to a bank of its own.
         """
         # Validate arguments
         if not validate_ip_format(ip):
@@ -51,39 +213,175 @@ class NetworkController:
                 f"Invalid number of channels: {channels} - Must be between 1 and 4"
             )
 
-        # Validate number of channels
-        # Set internal variables and create socket
+        if coalesce and not queued:
+            raise ValueError("Coalescing of commands requires queued mode")
+
+        if queued and engine is not None:
+            raise ValueError("Queued mode cannot be combined with an I/O engine")
+
+        if max_in_flight < 0:
+            raise ValueError(
+                f"Invalid number of commands in flight: {max_in_flight} - Must be positive"
+            )
+
+        if max_in_flight and engine is not None:
+            raise ValueError("Responses cannot be read when using an I/O engine")
+
+        if reconnect and engine is not None:
+            raise ValueError("Reconnecting is not supported when using an I/O engine")
+
+        if limiter is not None and engine is not None:
+            raise ValueError("A rate limiter cannot be used with an I/O engine")
+
+        if recorder is not None and engine is not None:
+            raise ValueError("A recorder cannot be used with an I/O engine")
+
+        if mirror is not None and mirror.channels != channels:
+            raise ValueError(
+                f"Invalid state mirror: {mirror.channels} channels - Must match the controller"
+            )
+
+        # Set internal variables and create the connection
         self.__ip = ip
-        self.__channels = [Channel() for _ in range(channels)]
+        self.__channel_count = channels
+        self.__bank = bank if bank is not None else ChannelBank()
+        self.__offset = self.__bank.allocate(channels)
         self.__port = port
-        self.__sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.__sock.settimeout(5)
-        self.__last_cmd_time = 0.0
+        self.__connection = ControllerConnection(
+            ip, port, reconnect, initial_backoff, max_backoff
+        )
+        self.__limiter = limiter if limiter is not None else RateLimiter()
+
+        # Instrumentation of the commands
+        self.__metrics = metrics
+
+        # Recording of the frames sent, with the id of the controller in the recording
+        self.__recorder = recorder
+        self.__recorder_id = recorder.register(f"{ip}:{port}") if recorder else 0
+
+        # Shared memory copy of the channel state, published whenever it changes
+        self.__mirror = mirror
+
+        # Serializes sending between the calling thread and the reconnect thread
+        self.__send_lock = threading.Lock()
+
+        # Serializes the state updates of the calling threads with the commands handed on
+        self.__state_lock: ContextManager[object] = (
+            threading.RLock() if thread_safe else nullcontext()
+        )
+
+        # Last frame handed to the controller per channel and command type, used in diff-only mode
+        self.__diff_only = diff_only
+        self.__wire: Dict[bytes, bytes] = {}
+
+        # Scenes stored by name
+        self.__scenes: Dict[str, Scene] = {}
+
+        # Futures of the commands not settled yet, i.e. not sent or awaiting their reply
+        self.__pending: Set["Future[CommandResult]"] = set()
+        self.__pending_lock = threading.Lock()
+
+        # Set by the startup sequence
+        self.__max_in_flight = max_in_flight
+        self.__response_timeout = response_timeout
+        self.__reader: Optional[ResponseReader] = None
+        self.__queue: Optional[Union[CommandQueue[CommandResult], EngineConnection]] = (
+            None
+        )
+
+        # Completes once the controller is connected and initialized
+        self.__ready: "Future[None]" = Future()
+        self.__started = False
+
+        startup = partial(
+            self.__start,
+            queued,
+            queue_size,
+            backpressure,
+            coalesce,
+            engine,
+            reset,
+        )
+
+        if lazy:
+            threading.Thread(
+                target=startup, name=f"VSTLight-connect-{ip}:{port}", daemon=True
+            ).start()
+        else:
+            startup()
+            self.__ready.result()
 
-        # Connect to the controller
-        try:
-            self.__sock.connect((self.__ip, self.__port))
-        except Exception as e:
-            raise ConnectionError(
-                f"Failed to connect to controller with IP: {ip}"
-            ) from e
+    @property
+    def channels(self) -> int:
+        """
+        Get the number of channels of the controller.
+
+        Returns:
+        --------
+            int: The number of channels.
+        """
+        return self.__channel_count
+
+    @property
+    def limiter(self) -> RateLimiter:
+        """
+        Get the rate limiter spacing the commands, e.g. to read its spacing statistics.
+
+        Returns:
+        --------
+            RateLimiter: The rate limiter of the controller.
+        """
+        return self.__limiter
 
-        # Initialize all controller channels to intensity 0 (off)
-        for i in range(channels):
-            self.set_off(i + 1)
-            self.set_strobe_mode(i + 1, 1)
+    @property
+    def metrics(self) -> Optional[Metrics]:
+        """
+        Get the metrics collecting the timing and counters of the commands.
+
+        Returns:
+        --------
+            Optional[Metrics]: The metrics of the controller, or None if the instrumentation is disabled.
+        """
+        return self.__metrics
+
+    @property
+    def ready(self) -> "Future[None]":
+        """
+        Get the startup state of the controller. Use `asyncio.wrap_future` to await it.
+
+        Returns:
+        --------
+            Future[None]: Future completing once the controller is connected and initialized, or holding the
+                `ConnectionError` raised if the controller is unreachable.
+        """
+        return self.__ready
 
     def destroy(self) -> None:
         """
         Destroys the NetworkController object. All channels are set to off and the connection to the controller is closed.
+        In queued mode, all commands still waiting are sent before the connection is closed.
         """
-        for i in range(len(self.__channels)):
-            self.set_off(i + 1)
+        # Wait for a lazy startup to finish, there is nothing to turn off if it failed
+        if self.__ready.exception() is not None:
+            self.__connection.close()
+            del self
+            return
+
+        # Channels cannot be turned off while the connection is down
+        if self.__connection.connected:
+            for i in range(self.__channel_count):
+                self.set_off(i + 1)
 
-        self.__sock.close()
+        if self.__queue is not None:
+            self.__queue.close()
+
+        if self.__reader is not None:
+            self.__reader.close()
+
+        self.__connection.close()
         del self
 
-    def set_intensity(self, channel_id: int, value: int) -> None:
+    def set_intensity(self, channel_id: int, value: int) -> "Future[CommandResult]":
         """
         Set the light intensity of a channel. If the channel is off, the intensity will be set locally but not transmitted
         to the controller. If the channel is on, the intensity will additionally be transmitted to the controller.
@@ -92,22 +390,33 @@ class NetworkController:
         -----
             channel_id (int): The channel to set the intensity of. Corresponds to the channel number on the controller [1-4].
             value (int): The intensity to update the channel with. Only 8 bit values are accepted [0-255].
+
+        Returns:
+        --------
+            Future[CommandResult]: Future completing with the result of the command.
         """
-        # Validate arguments
-        self.__verify_channel_id(channel_id)
+        start = self.__start_call()
 
-        if not 0 <= value <= 255:
-            raise ValueError("Channel intensity must be between 0 and 255")
+        with self.__state_lock:
+            # Validate arguments
+            self.__verify_channel_id(channel_id)
 
-        # Convert channel ID to index
-        channel_idx = channel_id - 1
+            if not 0 <= value <= 255:
+                raise ValueError("Channel intensity must be between 0 and 255")
+
+            # Convert channel ID to index
+            channel_idx = channel_id - 1
 
-        # Update the stored channel intensity and send the command
-        self.__channels[channel_idx].intensity = value
+            # Update the stored channel intensity and send the command
+            self.__bank.set_intensity(self.__offset + channel_idx, value)
 
-        # Update the value on the controller if the channel is on
-        if self.__channels[channel_idx].state:
-            self.__send_command(f"{channel_idx:02}F{value:03}")
+            # Update the value on the controller if the channel is on
+            if self.__bank.get_state(self.__offset + channel_idx):
+                return self.__send_command(
+                    INTENSITY_FRAMES[channel_idx][value], start=start
+                )
+
+            return self.__no_command()
 
     def get_intensity(self, channel_id: int) -> int:
         """
@@ -127,69 +436,93 @@ class NetworkController:
         # Convert channel ID to index
         channel_idx = channel_id - 1
 
-        return self.__channels[channel_idx].intensity
+        return self.__bank.get_intensity(self.__offset + channel_idx)
 
-    def set_on(self, channel_id: int) -> None:
+    def set_on(self, channel_id: int) -> "Future[CommandResult]":
         """
         Set the state of a channel on the controller.
 
         Args:
         -----
             channel_id (int): The channel to turn on. Corresponds to the channel number on the controller [1-4].
+
+        Returns:
+        --------
+            Future[CommandResult]: Future completing with the result of the command.
         """
-        # Validate arguments
-        self.__verify_channel_id(channel_id)
+        start = self.__start_call()
 
-        # Convert channel ID to index
-        channel_idx = channel_id - 1
+        with self.__state_lock:
+            # Validate arguments
+            self.__verify_channel_id(channel_id)
 
-        # Update the stored channel state and send the command if the intensity is greater than 0
-        self.__channels[channel_idx].on()
+            # Convert channel ID to index
+            channel_idx = channel_id - 1
 
-        if self.__channels[channel_idx].intensity > 0:
-            self.__send_command(
-                f"{channel_idx:02}F{self.__channels[channel_idx].intensity:03}"
-            )
+            # Update the stored channel state and send the command if the intensity is greater than 0
+            self.__bank.set_state(self.__offset + channel_idx, True)
+            intensity = self.__bank.get_intensity(self.__offset + channel_idx)
+
+            if intensity > 0:
+                return self.__send_command(
+                    INTENSITY_FRAMES[channel_idx][intensity], start=start
+                )
 
-    def set_off(self, channel_id: int) -> None:
+            return self.__no_command()
+
+    def set_off(self, channel_id: int) -> "Future[CommandResult]":
         """
         Set the state of a channel on the controller.
 
         Args:
         -----
             channel_id (int): The channel to turn off. Corresponds to the channel number on the controller [1-4].
+
+        Returns:
+        --------
+            Future[CommandResult]: Future completing with the result of the command.
         """
-        # Validate arguments
-        self.__verify_channel_id(channel_id)
+        start = self.__start_call()
 
-        # Convert channel ID to index
-        channel_idx = channel_id - 1
+        with self.__state_lock:
+            # Validate arguments
+            self.__verify_channel_id(channel_id)
 
-        # Update the stored channel state and send the command
-        self.__channels[channel_idx].off()
-        self.__send_command(f"{channel_idx:02}F000")
+            # Convert channel ID to index
+            channel_idx = channel_id - 1
+
+            # Update the stored channel state and send the command
+            self.__bank.set_state(self.__offset + channel_idx, False)
+            return self.__send_command(
+                INTENSITY_FRAMES[channel_idx][0], Priority.CRITICAL, start
+            )
 
-    def toggle(self, channel_id: int) -> None:
+    def toggle(self, channel_id: int) -> "Future[CommandResult]":
         """
         Toggle the state of a channel on the controller between on and off (Inverting current state).
 
         Args:
         -----
             channel_id (int): The channel to toggle. Corresponds to the channel number on the controller [1-4].
+
+        Returns:
+        --------
+            Future[CommandResult]: Future completing with the result of the command.
         """
-        # Validate arguments
-        self.__verify_channel_id(channel_id)
+        with self.__state_lock:
+            # Validate arguments
+            self.__verify_channel_id(channel_id)
 
-        # Convert channel ID to index
-        channel_idx = channel_id - 1
+            # Convert channel ID to index
+            channel_idx = channel_id - 1
 
-        # Toggle the state of the channel
-        if self.__channels[channel_idx].state:
-            self.set_off(channel_id)
-        else:
-            self.set_on(channel_id)
+            # Toggle the state of the channel
+            if self.__bank.get_state(self.__offset + channel_idx):
+                return self.set_off(channel_id)
+            else:
+                return self.set_on(channel_id)
 
-    def set_strobe_mode(self, channel_id: int, mode: int) -> None:
+    def set_strobe_mode(self, channel_id: int, mode: int) -> "Future[CommandResult]":
         """
         Set the strobe mode of a channel on the controller. The following strobe modes are available,
         where the time specifies the 'on' time of the channel after a trig signal is recieved. Refer to
@@ -211,16 +544,30 @@ class NetworkController:
         -----
             channel_id (int): The channel to set the strobe mode of. Corresponds to the channel number on the controller [1-4].
             mode (int): The strobe mode to set [1-10]. Refer to list above, leading zeros are not required.
+
+        Returns:
+        --------
+            Future[CommandResult]: Future completing with the result of the command.
         """
-        # Validate arguments
-        self.__verify_channel_id(channel_id)
+        start = self.__start_call()
 
-        # Convert channel ID to index
-        channel_idx = channel_id - 1
+        with self.__state_lock:
+            # Validate arguments
+            self.__verify_channel_id(channel_id)
+
+            if not 0 < mode <= MAX_STROBE_MODE:
+                raise ValueError(
+                    f"Strobe mode identifyer must be integer between 1 and 10, got: {mode}"
+                )
 
-        # Update the stored channel strobe mode and send the command
-        self.__channels[channel_idx].strobe_mode = mode
-        self.__send_command(f"{channel_idx:02}S{mode:02}")
+            # Convert channel ID to index
+            channel_idx = channel_id - 1
+
+            # Update the stored channel strobe mode and send the command
+            self.__bank.set_strobe_mode(self.__offset + channel_idx, mode)
+            return self.__send_command(
+                STROBE_FRAMES[channel_idx][mode - 1], Priority.BULK, start
+            )
 
     def get_strobe_mode(self, channel_id: int) -> int:
         """
@@ -248,41 +595,59 @@ class NetworkController:
         # Convert channel ID to index
         channel_idx = channel_id - 1
 
-        return self.__channels[channel_idx].strobe_mode
+        return self.__bank.get_strobe_mode(self.__offset + channel_idx)
 
-    def set_all_intensities(self, value: int) -> None:
+    def set_all_intensities(self, value: int) -> List["Future[CommandResult]"]:
         """
         Set the intensity of all channels to the same value.
 
         Args:
         -----
             value (int): The intensity to set all channels to. Only 8 bit values are accepted [0-255].
+
+        Returns:
+        --------
+            List[Future[CommandResult]]: Futures completing with the results of the commands.
         """
-        for i in range(len(self.__channels)):
-            self.set_intensity(i + 1, value)
+        with self.__state_lock:
+            return [
+                self.set_intensity(i + 1, value) for i in range(self.__channel_count)
+            ]
 
-    def set_all_on(self) -> None:
+    def set_all_on(self) -> List["Future[CommandResult]"]:
         """
         Set all channels to the on state.
+
+        Returns:
+        --------
+            List[Future[CommandResult]]: Futures completing with the results of the commands.
         """
-        for i in range(len(self.__channels)):
-            self.set_on(i + 1)
+        with self.__state_lock:
+            return [self.set_on(i + 1) for i in range(self.__channel_count)]
 
-    def set_all_off(self) -> None:
+    def set_all_off(self) -> List["Future[CommandResult]"]:
         """
         Set all channels to the off state.
+
+        Returns:
+        --------
+            List[Future[CommandResult]]: Futures completing with the results of the commands.
         """
-        for i in range(len(self.__channels)):
-            self.set_off(i + 1)
+        with self.__state_lock:
+            return [self.set_off(i + 1) for i in range(self.__channel_count)]
 
-    def toggle_all(self) -> None:
+    def toggle_all(self) -> List["Future[CommandResult]"]:
         """
         Toggle the state of all channels on the controller between on and off (Inverting current state).
+
+        Returns:
+        --------
+            List[Future[CommandResult]]: Futures completing with the results of the commands.
         """
-        for i in range(len(self.__channels)):
-            self.toggle(i + 1)
+        with self.__state_lock:
+            return [self.toggle(i + 1) for i in range(self.__channel_count)]
 
-    def set_all_strobe_modes(self, mode: int) -> None:
+    def set_all_strobe_modes(self, mode: int) -> List["Future[CommandResult]"]:
         """
         Set the strobe mode of all channels on the controller. The following strobe modes are available,
         where the time specifies the 'on' time of the channel after a trig signal is recieved. Refer to
@@ -303,9 +668,366 @@ class NetworkController:
         Args:
         -----
             mode (int): The strobe mode to set [1-10]. Refer to list above, leading zeros are not required.
+
+        Returns:
+        --------
+            List[Future[CommandResult]]: Futures completing with the results of the commands.
         """
-        for i in range(len(self.__channels)):
-            self.set_strobe_mode(i + 1, mode)
+        with self.__state_lock:
+            return [
+                self.set_strobe_mode(i + 1, mode) for i in range(self.__channel_count)
+            ]
+
+    def set_intensities(self, values: Sequence[int]) -> List["Future[CommandResult]"]:
+        """
+        Set the intensity of every channel to its own value, e.g. from a NumPy array computed each cycle.
+        The whole batch is validated before any channel is updated, and commands are only sent for the
+        channels that are on and whose intensity changes.
+
+        Args:
+        -----
+            values (Sequence[int]): The intensity of each channel in channel order. Only 8 bit values are accepted [0-255].
+
+        Returns:
+        --------
+            List[Future[CommandResult]]: Futures completing with the results of the commands.
+        """
+        start = self.__start_call()
+
+        with self.__state_lock:
+            batch = self.__verify_batch(values, 0, 255, "Channel intensity")
+
+            stop = self.__offset + self.__channel_count
+            current = self.__bank.intensities(self.__offset, stop)
+            states = self.__bank.states(self.__offset, stop)
+
+            frames = [
+                INTENSITY_FRAMES[channel_idx][value]
+                for channel_idx, value in enumerate(batch)
+                if value != current[channel_idx] and states[channel_idx]
+            ]
+            self.__bank.set_intensities(self.__offset, batch)
+
+            return self.__send_batch(frames, Priority.NORMAL, start)
+
+    def set_strobe_modes(self, modes: Sequence[int]) -> List["Future[CommandResult]"]:
+        """
+        Set the strobe mode of every channel to its own mode. Refer to `set_strobe_mode` for a list of the
+        available strobe modes. The whole batch is validated before any channel is updated, and commands are
+        only sent for the channels whose strobe mode changes.
+
+        Args:
+        -----
+            modes (Sequence[int]): The strobe mode of each channel in channel order [1-10].
+
+        Returns:
+        --------
+            List[Future[CommandResult]]: Futures completing with the results of the commands.
+        """
+        start = self.__start_call()
+
+        with self.__state_lock:
+            batch = self.__verify_batch(modes, 1, 10, "Strobe mode")
+
+            current = self.__bank.strobe_modes(
+                self.__offset, self.__offset + self.__channel_count
+            )
+
+            frames = [
+                STROBE_FRAMES[channel_idx][mode - 1]
+                for channel_idx, mode in enumerate(batch)
+                if mode != current[channel_idx]
+            ]
+            self.__bank.set_strobe_modes(self.__offset, batch)
+
+            return self.__send_batch(frames, Priority.BULK, start)
+
+    def fade(
+        self, channel_id: int, target: int, duration: float
+    ) -> List["Future[CommandResult]"]:
+        """
+        Blocking function call! Fade the intensity of a channel linearly to a target over a duration.
+        Refer to `ramp`.
+
+        Args:
+        -----
+            channel_id (int): The channel to fade. Corresponds to the channel number on the controller [1-4].
+            target (int): The intensity to reach at the end of the fade [0-255].
+            duration (float) [s]: The duration of the fade.
+
+        Returns:
+        --------
+            List[Future[CommandResult]]: Futures completing with the results of the commands.
+        """
+        return self.ramp({channel_id: target}, duration)
+
+    def ramp(
+        self, targets: Mapping[int, int], duration: float
+    ) -> List["Future[CommandResult]"]:
+        """
+        Blocking function call! Fade the intensity of several channels linearly to their targets over
+        the same duration. The steps of all channels are planned in advance, sharing the 5ms command
+        budget of the controller fairly between the channels. The steps are timed against a monotonic
+        clock from the start of the fade, so delays do not accumulate. If a step cannot be sent before
+        the next step of its channel is due, it is dropped rather than delaying the fade, so every
+        channel reaches its target on time. Channels that are off only have their intensity set locally.
+        Channels turned off or set to another intensity by another thread during the fade stop fading.
+
+        Args:
+        -----
+            targets (Mapping[int, int]): The intensity to reach at the end of the fade [0-255], by channel ID [1-4].
+            duration (float) [s]: The duration of the fade.
+
+        Returns:
+        --------
+            List[Future[CommandResult]]: Futures completing with the results of the commands.
+        """
+        # Validate arguments
+        for channel_id, value in targets.items():
+            self.__verify_channel_id(channel_id)
+
+            if not 0 <= value <= 255:
+                raise ValueError("Channel intensity must be between 0 and 255")
+
+        if duration < 0:
+            raise ValueError(f"Invalid fade duration: {duration} - Must be positive")
+
+        futures: List["Future[CommandResult]"] = []
+        starts: Dict[int, int] = {}
+        goals: Dict[int, int] = {}
+
+        for channel_id, value in targets.items():
+            bank_idx = self.__offset + channel_id - 1
+            intensity = self.__bank.get_intensity(bank_idx)
+
+            if self.__bank.get_state(bank_idx) and intensity != value:
+                starts[channel_id - 1] = intensity
+                goals[channel_id - 1] = value
+            else:
+                futures.append(self.set_intensity(channel_id, value))
+
+        if not goals:
+            return futures
+
+        # Intensity last set by the fade per channel, to detect changes made by other threads
+        current = dict(starts)
+
+        start = time.monotonic()
+
+        for step in plan_ramp(starts, goals, duration, self.__limiter.interval):
+            if step.channel_idx not in current:
+                continue
+
+            elapsed = time.monotonic() - start
+
+            if step.offset > elapsed:
+                time.sleep(step.offset - elapsed)
+                elapsed = time.monotonic() - start
+
+            # Behind schedule, the next step of the channel is already due
+            if step.next_offset <= elapsed:
+                continue
+
+            with self.__state_lock:
+                bank_idx = self.__offset + step.channel_idx
+
+                # Another thread took over the channel, sending the step would undo its change
+                if (
+                    not self.__bank.get_state(bank_idx)
+                    or self.__bank.get_intensity(bank_idx) != current[step.channel_idx]
+                ):
+                    del current[step.channel_idx]
+                    continue
+
+                self.__bank.set_intensity(bank_idx, step.value)
+                current[step.channel_idx] = step.value
+                futures.append(
+                    self.__send_command(
+                        INTENSITY_FRAMES[step.channel_idx][step.value], Priority.BULK
+                    )
+                )
+
+        return futures
+
+    @property
+    def scenes(self) -> Dict[str, Scene]:
+        """
+        Get the scenes stored with `save_scene`.
+
+        Returns:
+        --------
+            Dict[str, Scene]: A copy of the stored scenes, by name.
+        """
+        return dict(self.__scenes)
+
+    def capture_scene(self) -> Scene:
+        """
+        Capture the local state of all channels as a scene.
+
+        Returns:
+        --------
+            Scene: The current setting of every channel.
+        """
+        with self.__state_lock:
+            return self.__bank.capture(
+                self.__offset, self.__offset + self.__channel_count
+            )
+
+    def save_scene(self, name: str, scene: Optional[Scene] = None) -> Scene:
+        """
+        Store a scene by name, replacing any scene stored with the same name.
+
+        Args:
+        -----
+            name (str): The name of the scene, e.g. "backlight inspection".
+            scene (Optional[Scene]): The scene to store. Defaults to the current state of all channels.
+
+        Returns:
+        --------
+            Scene: The stored scene.
+        """
+        if scene is None:
+            scene = self.capture_scene()
+        else:
+            self.__verify_scene(scene)
+
+        self.__scenes[name] = scene
+
+        return scene
+
+    def delete_scene(self, name: str) -> None:
+        """
+        Remove a stored scene.
+
+        Args:
+        -----
+            name (str): The name of the scene.
+        """
+        self.__lookup_scene(name)
+        del self.__scenes[name]
+
+    def apply_scene(self, scene: Union[str, Scene]) -> List["Future[CommandResult]"]:
+        """
+        Switch all channels to a scene, sending only the commands changing the output of the controller.
+        Channels getting darker are updated first, then the strobe modes, then the channels getting brighter,
+        so the light never exceeds the brighter of the two scenes during the switch.
+
+        Args:
+        -----
+            scene (Union[str, Scene]): The scene to apply, or the name of a stored scene.
+
+        Returns:
+        --------
+            List[Future[CommandResult]]: Futures completing with the results of the commands.
+        """
+        start = self.__start_call()
+
+        with self.__state_lock:
+            scene = self.__resolve_scene(scene)
+            frames = plan_scene(self.capture_scene(), scene)
+
+            # Update the stored channel states before sending, as the other methods do
+            self.__set_scene(scene)
+
+            return self.__send_batch(frames, Priority.NORMAL, start)
+
+    def capture_sequence(
+        self, scenes: Sequence[Union[str, Scene]], trigger: Callable[[int], object]
+    ) -> List[CaptureStep]:
+        """
+        Blocking function call! Step through a sequence of scenes, e.g. lighting each channel in turn for
+        photometric stereo, and trigger the camera once each scene is lit. The frames of all transitions are
+        planned before the first is sent, as in `apply_scene`. Each transition is sent in the earliest 5ms slots
+        allowed by the rate limiter, and the trigger is called with the index of the step once the frames of the
+        step are on the wire (or acknowledged, when reading responses). The next transition starts when the
+        trigger returns, so the trigger should return once the exposure has finished. With `thread_safe=True`,
+        calls from other threads wait until the sequence has finished, so the planned transitions stay valid.
+
+        Args:
+        -----
+            scenes (Sequence[Union[str, Scene]]): The scenes to step through, or the names of stored scenes.
+            trigger (Callable[[int], object]): Function triggering the camera, called with the index of each step.
+
+        Returns:
+        --------
+            List[CaptureStep]: The timing of every step.
+        """
+        with self.__state_lock:
+            resolved = [self.__resolve_scene(scene) for scene in scenes]
+
+            # Plan every transition up front, starting from the current state
+            plans = []
+            current = self.capture_scene()
+            for scene in resolved:
+                plans.append(plan_scene(current, scene))
+                current = scene
+
+            self.__wait_ready()
+
+            steps = []
+            for idx, (scene, frames) in enumerate(zip(resolved, plans)):
+                start = time.perf_counter()
+
+                self.__set_scene(scene)
+                futures = [self.__dispatch(frame) for frame in frames]
+
+                # Wait for the frames sent by another thread, or for their replies
+                for future in futures:
+                    future.result()
+
+                lit = time.perf_counter()
+                trigger(idx)
+
+                steps.append(
+                    CaptureStep(idx, len(frames), start, lit, time.perf_counter())
+                )
+
+            return steps
+
+    def force_resync(self) -> List["Future[CommandResult]"]:
+        """
+        Send the full local state of all channels to the controller, regardless of the values
+        previously sent. Use this in diff-only mode if the state of the controller may no longer
+        match the values last sent to it, e.g. after a power cycle of the unit.
+
+        Returns:
+        --------
+            List[Future[CommandResult]]: Futures completing with the results of the commands.
+        """
+        with self.__state_lock:
+            self.__wait_ready()
+
+            return self.__resync()
+
+    def wait_settled(self, deadline: Optional[float] = None) -> bool:
+        """
+        Blocking function call! Wait until all commands issued so far have settled, i.e. have been sent, or have
+        received their reply (or timed out) when reading responses. Commands sent directly by the calling thread
+        without reading responses are settled once the method returns.
+
+        ```python
+        result = lights.set_intensity(1, 200).result()
+        lights.wait_settled(time.perf_counter() + 0.02)
+        ```
+
+        Args:
+        -----
+            deadline (Optional[float]): The `time.perf_counter` time in seconds to wait until. None waits indefinitely.
+
+        Returns:
+        --------
+            bool: True if all commands have settled, False if the deadline passed first.
+        """
+        with self.__pending_lock:
+            pending = list(self.__pending)
+
+        timeout = None
+        if deadline is not None:
+            timeout = max(0.0, deadline - time.perf_counter())
+
+        _, not_done = wait(pending, timeout)
+
+        return not not_done
 
     def __verify_channel_id(self, channel_id: int) -> None:
         """
@@ -315,29 +1037,512 @@ class NetworkController:
         -----
             channel_id (int): The channel ID to verify.
         """
-        if not 1 <= channel_id <= len(self.__channels):
-            raise ValueError(f"Channel ID must be between 1 and {len(self.__channels)}")
+        if not 1 <= channel_id <= self.__channel_count:
+            raise ValueError(f"Channel ID must be between 1 and {self.__channel_count}")
+
+    def __verify_batch(
+        self, values: Sequence[int], low: int, high: int, name: str
+    ) -> List[int]:
+        """
+        Verify that a batch holds one integer value per channel, all within a range. Throws a ValueError if not,
+        or a TypeError if a value is not an integer.
+
+        Args:
+        -----
+            values (Sequence[int]): The values of all channels, e.g. a list or a NumPy array of integers.
+            low (int): The lowest valid value.
+            high (int): The highest valid value.
+            name (str): The name of the values in the error message.
+
+        Returns:
+        --------
+            List[int]: The values as Python integers.
+        """
+        if len(values) != self.__channel_count:
+            raise ValueError(
+                f"Expected {self.__channel_count} values, one per channel, got {len(values)}"
+            )
+
+        # operator.index accepts NumPy integers, but rejects floats instead of truncating them
+        batch = [operator.index(value) for value in values]
+
+        if min(batch) < low or max(batch) > high:
+            raise ValueError(f"{name} must be between {low} and {high}")
+
+        return batch
+
+    def __start_call(self) -> Optional[float]:
+        """
+        Get the start time of a method call sending commands, to time the validation of its first command.
+
+        Returns:
+        --------
+            Optional[float]: The current `time.perf_counter` time, or None if the instrumentation is disabled.
+        """
+        return time.perf_counter() if self.__metrics is not None else None
+
+    def __send_batch(
+        self, frames: List[bytes], priority: Priority, start: Optional[float] = None
+    ) -> List["Future[CommandResult]"]:
+        """
+        Send the frames of a batch method, or account for the batch not changing the controller.
+
+        Args:
+        -----
+            frames (List[bytes]): The encoded frames to send, in order.
+            priority (Priority): The lane of the frames in queued mode.
+            start (Optional[float]): The start time of the method call, timing the validation of the first frame.
+
+        Returns:
+        --------
+            List[Future[CommandResult]]: Futures completing with the results of the commands.
+        """
+        if not frames:
+            return [self.__no_command()]
+
+        return [
+            self.__send_command(f, priority, start if idx == 0 else None)
+            for idx, f in enumerate(frames)
+        ]
+
+    def __verify_scene(self, scene: Scene) -> None:
+        """
+        Verify that a scene matches the channels of the controller and holds valid settings. Throws a ValueError if not.
+
+        Args:
+        -----
+            scene (Scene): The scene to verify.
+        """
+        if len(scene.channels) != self.__channel_count:
+            raise ValueError(
+                f"Scene has {len(scene.channels)} channels, controller has {self.__channel_count}"
+            )
+
+        scene.validate()
+
+    def __resolve_scene(self, scene: Union[str, Scene]) -> Scene:
+        """
+        Get a stored scene by name, or verify a scene passed directly.
+
+        Args:
+        -----
+            scene (Union[str, Scene]): The scene, or the name of a stored scene.
+
+        Returns:
+        --------
+            Scene: The verified scene.
+        """
+        if isinstance(scene, str):
+            return self.__lookup_scene(scene)
+
+        self.__verify_scene(scene)
+
+        return scene
+
+    def __set_scene(self, scene: Scene) -> None:
+        """
+        Update the local state of all channels to a verified scene, without sending any command.
+
+        Args:
+        -----
+            scene (Scene): The scene to set.
+        """
+        self.__bank.set_intensities(
+            self.__offset, [s.intensity for s in scene.channels]
+        )
+        self.__bank.set_states(self.__offset, [s.state for s in scene.channels])
+        self.__bank.set_strobe_modes(
+            self.__offset, [s.strobe_mode for s in scene.channels]
+        )
+
+        # Scenes may change the local state without sending any frame
+        self.__publish()
+
+    def __publish(self) -> None:
+        """
+        Publish the local state of all channels to the state mirror, if any.
+        """
+        if self.__mirror is not None:
+            self.__mirror.publish(
+                self.__bank.pack(self.__offset, self.__offset + self.__channel_count)
+            )
+
+    def __lookup_scene(self, name: str) -> Scene:
+        """
+        Get a stored scene by name. Throws a ValueError if no scene is stored with the name.
+
+        Args:
+        -----
+            name (str): The name of the scene.
+
+        Returns:
+        --------
+            Scene: The stored scene.
+        """
+        if name not in self.__scenes:
+            raise ValueError(f"Unknown scene: {name!r}")
+
+        return self.__scenes[name]
+
+    def __no_command(self) -> "Future[CommandResult]":
+        """
+        Result of a method call that did not need to send a command to the controller.
+
+        Returns:
+        --------
+            Future[CommandResult]: A completed future holding a result without frame and times.
+        """
+        if self.__metrics is not None:
+            self.__metrics.count_suppressed()
+
+        self.__publish()
+
+        future: "Future[CommandResult]" = Future()
+        future.set_result(NO_COMMAND)
+
+        return future
+
+    def __send_command(
+        self,
+        frame: bytes,
+        priority: Priority = Priority.NORMAL,
+        start: Optional[float] = None,
+    ) -> "Future[CommandResult]":
+        """
+        Send a frame in the VLP IP protocol format to the controller. Frames are looked up in the
+        precomputed tables of the `protocol` module, so no encoding takes place here. In queued mode
+        the frame is added to the queue of the sender thread, otherwise it is sent to the controller directly.
+        In diff-only mode, frames equal to the last frame handed to the controller for the same channel
+        and command type are skipped. The priority selects the lane of the queue.
+
+        Args:
+        -----
+            frame (bytes): The encoded frame to send to the controller.
+            priority (Priority): The lane of the frame in queued mode.
+            start (Optional[float]): The start time of the method call, if instrumented.
+
+        Returns:
+        --------
+            Future[CommandResult]: Future completing with the result of the command.
+        """
+        # Time since the method call started validating the command
+        validation = None
+        if self.__metrics is not None and start is not None:
+            validation = time.perf_counter() - start
+
+        self.__wait_ready()
+
+        return self.__dispatch(frame, priority, validation)
+
+    def __dispatch(
+        self,
+        frame: bytes,
+        priority: Priority = Priority.NORMAL,
+        validation: Optional[float] = None,
+    ) -> "Future[CommandResult]":
+        """
+        Hand a frame to the controller without waiting for the startup to finish. Refer to `__send_command`.
+
+        Args:
+        -----
+            frame (bytes): The encoded frame to send to the controller.
+            priority (Priority): The lane of the frame in queued mode.
+            validation (Optional[float]) [s]: The time spent validating the command, if instrumented.
+
+        Returns:
+        --------
+            Future[CommandResult]: Future completing with the result of the command.
+        """
+        # Channel and command type (e.g. b'00F') identify commands that may replace each other
+        key = frame[1:4]
+
+        if self.__diff_only:
+            if self.__wire.get(key) == frame:
+                return self.__no_command()
+
+            self.__wire[key] = frame
+
+        future: "Future[CommandResult]"
+
+        if self.__queue is not None:
+            # Sender threads complete the futures with the result returned by `__transmit`, never None
+            future = cast(
+                "Future[CommandResult]", self.__queue.put(frame, key, priority)
+            )
+
+            # The sending stages are timed by the sending thread
+            if self.__metrics is not None and validation is not None:
+                self.__metrics.observe(Stage.VALIDATION, validation)
+        else:
+            try:
+                future = self.__transmit(frame, validation)
+            except Exception:
+                # The state of the controller is unknown if the frame could not be sent
+                self.__wire.pop(key, None)
+                raise
+
+        if self.__metrics is not None:
+            self.__metrics.count_sent()
+
+        if self.__diff_only:
+            future.add_done_callback(partial(self.__check_sent, key))
+
+        if not future.done():
+            with self.__pending_lock:
+                self.__pending.add(future)
+            future.add_done_callback(self.__settle)
+
+        self.__publish()
+
+        return future
+
+    def __settle(self, future: "Future[CommandResult]") -> None:
+        """
+        Forget a settled command, called when its future completes.
+
+        Args:
+        -----
+            future (Future[CommandResult]): The completed future of the command.
+        """
+        with self.__pending_lock:
+            self.__pending.discard(future)
+
+    def __check_sent(self, key: bytes, future: "Future[CommandResult]") -> None:
+        """
+        Forget the last frame sent for a channel and command type if the frame was not sent or not
+        acknowledged, so the next command of that type is sent regardless of its value.
+
+        Args:
+        -----
+            key (bytes): The channel and command type of the frame, e.g. b'00F'.
+            future (Future[CommandResult]): The completed future of the frame.
+        """
+        if (
+            future.cancelled()
+            or future.exception() is not None
+            or future.result().status in (ResponseStatus.NAK, ResponseStatus.TIMEOUT)
+        ):
+            self.__wire.pop(key, None)
+
+    def __transmit(
+        self, frame: bytes, validation: Optional[float] = None
+    ) -> "Future[CommandResult]":
+        """
+        Send an encoded frame to the controller once it is ready to receive a new command. When
+        reading responses, the frame is registered with the reader before it is sent, blocking while
+        the maximum number of commands await their reply. If instrumented, the time spent in each
+        stage is recorded once the frame has been sent.
+
+        Args:
+        -----
+            frame (bytes): The encoded frame to send to the controller.
+            validation (Optional[float]) [s]: The time spent validating the command, if timed by the calling thread.
+
+        Returns:
+        --------
+            Future[CommandResult]: Future completing with the result of the frame, once its reply is received when reading
+                responses, otherwise right away.
+        """
+        metrics = self.__metrics
+        if metrics is not None:
+            start = time.perf_counter()
+
+        ack = None
+        if self.__reader is not None:
+            ack = self.__reader.register(int(frame[1:3]))
+
+        with self.__send_lock:
+            if metrics is not None:
+                locked = time.perf_counter()
+
+            # Check that controller is ready to receive a new command and send when ready
+            scheduled = self.__limiter.wait()
+
+            if metrics is not None:
+                waited = time.perf_counter()
+
+            try:
+                self.__connection.send(frame)
+            except Exception as e:
+                if self.__reader is not None and ack is not None:
+                    self.__reader.discard(ack, e)
+                if metrics is not None:
+                    metrics.count_error()
+                raise
+
+            sent = time.perf_counter()
+
+            # Recorded while holding the lock, so the records are in the order the frames were sent
+            if self.__recorder is not None:
+                self.__recorder.record(self.__recorder_id, frame)
+
+        if metrics is not None:
+            metrics.record(
+                CommandTiming(
+                    frame,
+                    validation,
+                    locked - start,
+                    waited - locked,
+                    sent - waited,
+                )
+            )
 
-    def __send_command(self, cmd: str) -> None:
+        result: "Future[CommandResult]" = Future()
+        outcome = CommandResult(frame, None, scheduled, sent, None)
+
+        if ack is None:
+            result.set_result(outcome)
+        else:
+            ack.add_done_callback(partial(_acknowledge, result, outcome))
+
+        return result
+
+    def __start(
+        self,
+        queued: bool,
+        queue_size: int,
+        backpressure: Backpressure,
+        coalesce: bool,
+        engine: Optional[IOEngine],
+        reset: bool,
+    ) -> None:
         """
-        Send a command to the controller in the VLP IP protocol format. This is achieved by adding
-        a header (@), checksum, and a delimiter (<CR><LF>) to the command passed to the function,
-        before encoding it to ascii bytes and sending it to the controller.
+        Connect to the controller, start the threads of the selected mode and initialize the channels.
+        Runs in the startup thread in lazy mode. Completes the `ready` future, with the exception
+        raised if the startup fails.
 
         Args:
         -----
-            cmd (str): The command to send to the controller.
+            queued (bool): Start a sender thread.
+            queue_size (int): The maximum number of commands waiting to be sent in queued mode.
+            backpressure (Backpressure): Behaviour when a command is issued while the queue is full.
+            coalesce (bool): Replace waiting commands with newer commands of the same type for the same channel.
+            engine (Optional[IOEngine]): Engine to hand the socket to.
+            reset (bool): Send the local state of all channels, i.e. off with strobe mode 1 unless changed already.
         """
+        try:
+            # Connect to the controller
+            self.__connection.connect()
+            self.__connection.on_reconnect = self.__restore
+
+            # Start the reader thread if responses are read
+            if self.__max_in_flight:
+                self.__reader = self.__start_reader()
+
+            # Start the sender thread in queued mode, or hand the socket to the engine
+            if engine is not None:
+                self.__queue = engine.attach(self.__connection.sock)
+            elif queued:
+                self.__queue = CommandQueue(
+                    self.__transmit,
+                    queue_size,
+                    backpressure,
+                    name=f"VSTLight-sender-{self.__ip}:{self.__port}",
+                    coalesce=coalesce,
+                )
+
+            # Initialize all controller channels to intensity 0 (off)
+            if reset:
+                self.__resync()
+        except Exception as e:
+            self.__connection.close()
+            self.__ready.set_exception(e)
+            return
+
+        self.__started = True
+        self.__ready.set_result(None)
 
-        # Add header (@) and calculate checksum according to the VLP IP protocol
-        cmd = f"@{cmd}"
-        checksum = sum(ord(char) for char in cmd) % 256
+    def __wait_ready(self) -> None:
+        """
+        Block until the startup has finished. Throws the startup exception if it failed.
+        """
+        if not self.__started:
+            self.__ready.result()
 
-        # Add lowest byte of checksum and delimiter (<CR><LF>) to command
-        cmd += f"{checksum:02X}\r\n"
+    def __resync(self) -> List["Future[CommandResult]"]:
+        """
+        Send the full local state of all channels to the controller, without waiting for the startup to finish.
+
+        Returns:
+        --------
+            List[Future[CommandResult]]: Futures completing with the results of the commands.
+        """
+        self.__wire.clear()
+
+        futures: List["Future[CommandResult]"] = []
+        for channel_idx in range(self.__channel_count):
+            bank_idx = self.__offset + channel_idx
+            value = (
+                self.__bank.get_intensity(bank_idx)
+                if self.__bank.get_state(bank_idx)
+                else 0
+            )
+
+            futures.append(
+                self.__dispatch(INTENSITY_FRAMES[channel_idx][value], Priority.CRITICAL)
+            )
+            futures.append(
+                self.__dispatch(
+                    STROBE_FRAMES[channel_idx][
+                        self.__bank.get_strobe_mode(bank_idx) - 1
+                    ],
+                    Priority.CRITICAL,
+                )
+            )
+
+        return futures
+
+    def __start_reader(self) -> ResponseReader:
+        """
+        Start a reader thread for the replies on the current connection. A failure detected by the
+        reader is reported to the connection, which starts reconnecting if enabled.
+
+        Returns:
+        --------
+            ResponseReader: The started reader.
+        """
+        sock = self.__connection.sock
+
+        return ResponseReader(
+            sock,
+            self.__max_in_flight,
+            self.__response_timeout,
+            name=f"VSTLight-reader-{self.__ip}:{self.__port}",
+            on_error=partial(self.__connection.fail, sock),
+        )
+
+    def __restore(self) -> None:
+        """
+        Restore the state of the controller after reconnecting. Called from the reconnect thread.
+        The reader is moved to the new connection and the local state of all channels is sent.
+        """
+        if self.__reader is not None:
+            self.__reader.close()
+            self.__reader = self.__start_reader()
+
+        self.force_resync()
+
+
+def _acknowledge(
+    result: "Future[CommandResult]",
+    outcome: CommandResult,
+    ack: "Future[Optional[ResponseStatus]]",
+) -> None:
+    """
+    Complete the result of a command with its reply, called when the reader completes the future of the reply.
+
+    Args:
+    -----
+        result (Future[CommandResult]): The future to complete.
+        outcome (CommandResult): The result of the command when it was sent.
+        ack (Future[Optional[ResponseStatus]]): The completed future of the reply.
+    """
+    error = ack.exception()
+    if error is not None:
+        result.set_exception(error)
+        return
 
-        # Check that controller is ready to receive a new command and send when ready
-        compare_and_wait(self.__last_cmd_time, WAIT_TIME)
-        self.__last_cmd_time = time.monotonic()
+    status = ack.result()
+    acked = None if status is ResponseStatus.TIMEOUT else time.perf_counter()
 
-        self.__sock.send(cmd.encode(encoding="ascii"))
+    result.set_result(outcome._replace(status=status, acked=acked))
@@ -0,0 +1,167 @@
+from enum import Enum
+from typing import List, NamedTuple, Optional, Tuple
+
+# Size of the command space supported by the VLP controllers
+MAX_CHANNELS = 4
+MAX_INTENSITY = 255
+MAX_STROBE_MODE = 10
+
+# Waiting time between commands in seconds (5ms) to avoid overloading the controller.
+# Dictated by the VLP controller specsheet
+WAIT_TIME = 0.005
+
+
+def encode_command(cmd: str) -> bytes:
+    """
+    Encode a command in the VLP IP protocol format. This is achieved by adding a header (@),
+    checksum, and a delimiter (<CR><LF>) to the command passed to the function, before encoding
+    it to ascii bytes.
+
+    Args:
+    -----
+        cmd (str): The command to encode, e.g. `01F125` to set channel 2 to intensity 125.
+
+    Returns:
+    --------
+        bytes: The encoded frame, ready to be sent to the controller.
+    """
+    # Add header (@) and calculate checksum according to the VLP IP protocol
+    cmd = f"@{cmd}"
+    checksum = sum(ord(char) for char in cmd) % 256
+
+    # Add lowest byte of checksum and delimiter (<CR><LF>) to command
+    cmd += f"{checksum:02X}\r\n"
+
+    return cmd.encode(encoding="ascii")
+
+
+# Every frame the controllers accept, encoded once at import. Intensity frames are indexed as
+# [channel_idx][value] and strobe frames as [channel_idx][mode - 1]
+INTENSITY_FRAMES: Tuple[Tuple[bytes, ...], ...] = tuple(
+    tuple(
+        encode_command(f"{channel_idx:02}F{value:03}")
+        for value in range(MAX_INTENSITY + 1)
+    )
+    for channel_idx in range(MAX_CHANNELS)
+)
+
+STROBE_FRAMES: Tuple[Tuple[bytes, ...], ...] = tuple(
+    tuple(
+        encode_command(f"{channel_idx:02}S{mode:02}")
+        for mode in range(1, MAX_STROBE_MODE + 1)
+    )
+    for channel_idx in range(MAX_CHANNELS)
+)
+
+
+class ResponseStatus(Enum):
+    """
+    Enum representing the outcome of a command, as reported by the controller.
+    """
+
+    ACK = "ack"
+    NAK = "nak"
+    TIMEOUT = "timeout"
+
+
+class CommandResult(NamedTuple):
+    """
+    The outcome of a method call, with the `time.perf_counter` times in seconds of its command: the time it
+    was scheduled for by the rate limiter, the time `send` returned and the time its reply was received.
+    Times that are unknown are None: calls that did not need to send a command have no frame and no times,
+    the I/O engine paces the commands itself and does not report the scheduled time, and commands have no
+    reply time unless the replies are read and the controller replied.
+    """
+
+    frame: Optional[bytes]
+    status: Optional[ResponseStatus]
+    scheduled: Optional[float]
+    sent: Optional[float]
+    acked: Optional[float]
+
+    @property
+    def settled(self) -> Optional[float]:
+        """
+        Get the time the command took effect as far as known, i.e. the time of the reply if one was received,
+        otherwise the time it was sent.
+
+        Returns:
+        --------
+            Optional[float]: The `time.perf_counter` time in seconds, or None if no command was sent.
+        """
+        return self.acked if self.acked is not None else self.sent
+
+
+# Result of a method call that did not need to send a command
+NO_COMMAND = CommandResult(None, None, None, None, None)
+
+
+class Response(NamedTuple):
+    """
+    A reply received from the controller. Replies use the same framing as commands: a header (@),
+    the two digit channel, `O` (OK) or `N` (not OK) optionally followed by an error code, the
+    checksum and a delimiter (<CR><LF>), e.g. `@00O` + checksum for an accepted command on channel 1.
+    """
+
+    channel_idx: int
+    status: ResponseStatus
+    code: str
+
+
+class ResponseParser:
+    """
+    Class representing an incremental parser of controller replies. Bytes are fed to the parser
+    as they arrive from the socket, and complete replies are returned as soon as their delimiter
+    has been received. Partial replies are kept until the rest arrives.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the parser with an empty buffer.
+        """
+        self.__buffer = b""
+
+    def feed(self, data: bytes) -> List[Response]:
+        """
+        Parse the bytes received from the controller.
+
+        Args:
+        -----
+            data (bytes): The bytes received since the last call.
+
+        Returns:
+        --------
+            List[Response]: The replies completed by the bytes, in the order they were received.
+        """
+        self.__buffer += data
+
+        *lines, self.__buffer = self.__buffer.split(b"\r\n")
+
+        return [parse_response(line) for line in lines if line]
+
+
+def parse_response(line: bytes) -> Response:
+    """
+    Parse a single reply from the controller, without its delimiter. Replies that cannot be parsed
+    or have an invalid checksum are reported as not acknowledged on channel index -1.
+
+    Args:
+    -----
+        line (bytes): The reply, e.g. `@00O` followed by the checksum.
+
+    Returns:
+    --------
+        Response: The parsed reply.
+    """
+    invalid = Response(-1, ResponseStatus.NAK, line.decode("ascii", "replace"))
+
+    if len(line) < 6 or line[:1] != b"@" or not line[1:3].isdigit():
+        return invalid
+
+    body, checksum = line[:-2], line[-2:]
+    if f"{sum(body) % 256:02X}".encode("ascii") != checksum.upper():
+        return invalid
+
+    status = ResponseStatus.ACK if body[3:4] == b"O" else ResponseStatus.NAK
+
+    return Response(int(body[1:3]), status, body[4:].decode("ascii", "replace"))
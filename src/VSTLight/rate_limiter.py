@@ -0,0 +1,137 @@
+import math
+import time
+from typing import NamedTuple, Optional
+from .protocol import WAIT_TIME
+from .utils import SPIN_THRESHOLD, sleep_until
+
+
+class SpacingStats(NamedTuple):
+    """
+    Statistics of the spacing between commands delayed by a `RateLimiter`, in seconds. Commands
+    sent after a longer pause were not delayed and are not included.
+    """
+
+    samples: int
+    mean: float
+    minimum: float
+    maximum: float
+    stdev: float
+
+
+class RateLimiter:
+    """
+    Class representing the rate limit of a controller. Each call to `wait` blocks until at least
+    `interval + margin` seconds have passed since the previous call returned. The limiter sleeps
+    until shortly before the deadline and then spins on `time.perf_counter_ns`, yielding to other
+    threads in between, so commands are spaced within a few microseconds of the interval instead
+    of the 50-200µs a plain `time.sleep` overshoots by.
+
+    The spacing of every delayed command is recorded and available from `stats`. The limiter is not
+    thread-safe, calls to `wait` must be serialized by the caller.
+    """
+
+    def __init__(
+        self,
+        interval: float = WAIT_TIME,
+        margin: float = 0.0,
+        spin_threshold: float = SPIN_THRESHOLD,
+    ) -> None:
+        """
+        Initialize the RateLimiter object.
+
+        Args:
+        -----
+            interval (float) [s]: The minimum time between two commands. Defaults to the limit of the VLP controllers.
+            margin (float) [s]: Extra time added to the interval as a safety margin.
+            spin_threshold (float) [s]: The remaining time below which the limiter spins instead of sleeping.
+                0 disables spinning.
+        """
+        if interval < 0 or margin < 0 or spin_threshold < 0:
+            raise ValueError(
+                "Invalid rate limit - Interval, margin and spin threshold must be positive"
+            )
+
+        self.__interval_ns = round((interval + margin) * 1e9)
+        self.__spin_ns = round(spin_threshold * 1e9)
+        self.__last_ns: Optional[int] = None
+        self.reset_stats()
+
+    @property
+    def interval(self) -> float:
+        """
+        Get the enforced time between two commands, including the safety margin.
+
+        Returns:
+        --------
+            float: The time between two commands in seconds.
+        """
+        return self.__interval_ns / 1e9
+
+    @property
+    def stats(self) -> SpacingStats:
+        """
+        Get the statistics of the spacing between delayed commands since the last reset.
+
+        Returns:
+        --------
+            SpacingStats: The spacing statistics. All values are 0 if no command has been delayed.
+        """
+        if not self.__count:
+            return SpacingStats(0, 0.0, 0.0, 0.0, 0.0)
+
+        return SpacingStats(
+            self.__count,
+            self.__mean / 1e9,
+            self.__min / 1e9,
+            self.__max / 1e9,
+            math.sqrt(self.__m2 / self.__count) / 1e9,
+        )
+
+    def wait(self) -> float:
+        """
+        Blocking function call! Wait until the interval has passed since the previous call returned.
+        Call right before sending a command.
+
+        Returns:
+        --------
+            float: The `time.perf_counter` time in seconds the command was scheduled for, i.e. the end of
+                the interval, or the time of the call if the command was not delayed.
+        """
+        now = time.perf_counter_ns()
+        scheduled = now
+
+        if self.__last_ns is not None:
+            deadline = self.__last_ns + self.__interval_ns
+
+            if now < deadline:
+                scheduled = deadline
+                now = sleep_until(deadline, self.__spin_ns)
+                self.__record(now - self.__last_ns)
+
+        self.__last_ns = now
+        return scheduled / 1e9
+
+    def reset_stats(self) -> None:
+        """
+        Clear the spacing statistics.
+        """
+        self.__count = 0
+        self.__mean = 0.0
+        self.__m2 = 0.0
+        self.__min = math.inf
+        self.__max = 0.0
+
+    def __record(self, spacing: int) -> None:
+        """
+        Add the spacing of a delayed command to the statistics (Welford's online algorithm).
+
+        Args:
+        -----
+            spacing (int) [ns]: The time since the previous command.
+        """
+        self.__count += 1
+        delta = spacing - self.__mean
+        self.__mean += delta / self.__count
+        self.__m2 += delta * (spacing - self.__mean)
+        self.__min = min(self.__min, spacing)
+        self.__max = max(self.__max, spacing)
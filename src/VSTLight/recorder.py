@@ -0,0 +1,295 @@
+import argparse
+import mmap
+import struct
+import threading
+import time
+from typing import Dict, List, Mapping, NamedTuple, Tuple
+from .connection import ControllerConnection
+from .protocol import WAIT_TIME
+from .rate_limiter import RateLimiter
+from .utils import SPIN_THRESHOLD, sleep_until
+
+# Identifies recording files and the version of their layout
+MAGIC = b"VSTREC01"
+
+# Header: magic, number of record slots, number of records written, wall clock and monotonic time at creation [ns]
+HEADER = struct.Struct("<8sQQqq")
+
+# Name table following the header, e.g. "192.168.11.20:1000" for every registered controller
+MAX_CONTROLLERS = 64
+NAME = struct.Struct("<24s")
+
+# Record: monotonic time [ns], controller id, frame length and frame. Frames are at most 11 bytes
+RECORD = struct.Struct("<QHB13s")
+
+# Default number of record slots, about 5 minutes of commands at 200 commands/s (1.5MB)
+SLOTS = 65536
+
+
+class RecordedFrame(NamedTuple):
+    """
+    A frame sent to a controller, with the `time.monotonic_ns` time it was sent.
+    """
+
+    timestamp: int
+    controller_id: int
+    frame: bytes
+
+
+class Recording(NamedTuple):
+    """
+    The contents of a recording file. `started` and `monotonic` are the wall clock (`time.time_ns`) and
+    monotonic time the recording was created at, to convert the timestamps of the frames to wall clock
+    time. Frames are ordered from the oldest to the newest kept in the ring buffer.
+    """
+
+    started: int
+    monotonic: int
+    names: Dict[int, str]
+    frames: List[RecordedFrame]
+
+
+class Recorder:
+    """
+    Class representing a recording of the frames sent to one or more controllers. Records have a fixed
+    size and are written to a ring buffer in a memory-mapped file, overwriting the oldest records once
+    the file is full. Recording a frame is a single `struct.pack_into` without system calls, so it can
+    stay enabled at full load; the OS writes the pages to disk in the background.
+
+    ```python
+    recorder = Recorder("session.rec")
+    lights = NetworkController(4, recorder=recorder)
+    ```
+    """
+
+    def __init__(self, path: str, slots: int = SLOTS) -> None:
+        """
+        Create the recording file, replacing any existing file.
+
+        Args:
+        -----
+            path (str): The path of the recording file.
+            slots (int): The number of records kept. Must be at least 1.
+        """
+        if slots < 1:
+            raise ValueError(f"Invalid number of slots: {slots} - Must be at least 1")
+
+        self.__slots = slots
+        self.__count = 0
+        self.__names = 0
+        self.__lock = threading.Lock()
+
+        self.__records = HEADER.size + MAX_CONTROLLERS * NAME.size
+        size = self.__records + slots * RECORD.size
+
+        with open(path, "wb") as file:
+            file.truncate(size)
+
+        with open(path, "r+b") as file:
+            self.__map = mmap.mmap(file.fileno(), size)
+
+        HEADER.pack_into(
+            self.__map, 0, MAGIC, slots, 0, time.time_ns(), time.monotonic_ns()
+        )
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def register(self, name: str) -> int:
+        """
+        Add a controller to the name table of the recording.
+
+        Args:
+        -----
+            name (str): The name of the controller, at most 24 characters.
+
+        Returns:
+        --------
+            int: The id to record the frames of the controller with.
+        """
+        with self.__lock:
+            if self.__names >= MAX_CONTROLLERS:
+                raise ValueError(
+                    f"Cannot record more than {MAX_CONTROLLERS} controllers"
+                )
+
+            controller_id = self.__names
+            self.__names += 1
+
+            NAME.pack_into(
+                self.__map,
+                HEADER.size + controller_id * NAME.size,
+                name.encode("ascii"),
+            )
+
+        return controller_id
+
+    def record(self, controller_id: int, frame: bytes) -> None:
+        """
+        Record a frame sent to a controller, timestamped with `time.monotonic_ns`.
+
+        Args:
+        -----
+            controller_id (int): The id returned by `register`.
+            frame (bytes): The encoded frame.
+        """
+        timestamp = time.monotonic_ns()
+
+        with self.__lock:
+            offset = self.__records + (self.__count % self.__slots) * RECORD.size
+            RECORD.pack_into(
+                self.__map, offset, timestamp, controller_id, len(frame), frame
+            )
+
+            # Publish the record by updating the count in the header
+            self.__count += 1
+            struct.pack_into("<Q", self.__map, 16, self.__count)
+
+    def close(self) -> None:
+        """
+        Write the recording to disk and close the file.
+        """
+        with self.__lock:
+            if not self.__map.closed:
+                self.__map.flush()
+                self.__map.close()
+
+
+def read_recording(path: str) -> Recording:
+    """
+    Read a recording file, also while it is being recorded.
+
+    Args:
+    -----
+        path (str): The path of the recording file.
+
+    Returns:
+    --------
+        Recording: The contents of the recording.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+
+    magic, slots, count, started, monotonic = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Not a VSTLight recording: {path}")
+
+    names = {}
+    for controller_id in range(MAX_CONTROLLERS):
+        (name,) = NAME.unpack_from(data, HEADER.size + controller_id * NAME.size)
+
+        if name.rstrip(b"\0"):
+            names[controller_id] = name.rstrip(b"\0").decode("ascii")
+
+    # Once the ring buffer has wrapped, the oldest record is the next one to be overwritten
+    records = HEADER.size + MAX_CONTROLLERS * NAME.size
+    first = max(0, count - slots)
+
+    frames = []
+    for i in range(first, count):
+        timestamp, controller_id, length, frame = RECORD.unpack_from(
+            data, records + (i % slots) * RECORD.size
+        )
+        frames.append(RecordedFrame(timestamp, controller_id, frame[:length]))
+
+    return Recording(started, monotonic, names, frames)
+
+
+def replay(
+    recording: Recording,
+    targets: Mapping[int, Tuple[str, int]],
+    speed: float = 1.0,
+    interval: float = WAIT_TIME,
+) -> int:
+    """
+    Blocking function call! Send the frames of a recording to controllers, or simulated controllers,
+    keeping the original time between the frames divided by the speed. Frames of controllers without
+    a target are skipped. Frames are never sent closer than the interval to the same target, so a
+    replay faster than recorded does not overload a physical controller.
+
+    Args:
+    -----
+        recording (Recording): The recording to replay.
+        targets (Mapping[int, Tuple[str, int]]): The IP address and port to send the frames of each controller id to.
+        speed (float): Factor to speed up the replay by. 0 sends the frames as fast as the interval allows.
+        interval (float) [s]: The minimum time between two frames sent to the same target.
+
+    Returns:
+    --------
+        int: The number of frames sent.
+    """
+    if speed < 0:
+        raise ValueError(f"Invalid speed: {speed} - Must be positive")
+
+    frames = [f for f in recording.frames if f.controller_id in targets]
+    if not frames:
+        return 0
+
+    connections: Dict[int, ControllerConnection] = {}
+    limiters: Dict[int, RateLimiter] = {}
+
+    try:
+        for controller_id, (ip, port) in targets.items():
+            connections[controller_id] = ControllerConnection(ip, port)
+            connections[controller_id].connect()
+            limiters[controller_id] = RateLimiter(interval)
+
+        spin = round(SPIN_THRESHOLD * 1e9)
+        start = time.perf_counter_ns()
+
+        for frame in frames:
+            if speed > 0:
+                offset = (frame.timestamp - frames[0].timestamp) / speed
+                sleep_until(start + round(offset), spin)
+
+            limiters[frame.controller_id].wait()
+            connections[frame.controller_id].send(frame.frame)
+    finally:
+        for connection in connections.values():
+            connection.close()
+
+    return len(frames)
+
+
+def main() -> None:
+    """
+    Print or replay a recording from the command line:
+    `python -m VSTLight.recorder session.rec --target 0=127.0.0.1:1000 --speed 2`.
+    """
+    parser = argparse.ArgumentParser(
+        description="Print or replay a VSTLight recording."
+    )
+    parser.add_argument("path")
+    parser.add_argument(
+        "--target",
+        action="append",
+        default=[],
+        help="Replay the frames of a controller id to an address, e.g. 0=127.0.0.1:1000",
+    )
+    parser.add_argument("--speed", type=float, default=1.0)
+    args = parser.parse_args()
+
+    recording = read_recording(args.path)
+
+    if not args.target:
+        for frame in recording.frames:
+            offset = (frame.timestamp - recording.monotonic) / 1e9
+            name = recording.names.get(frame.controller_id, frame.controller_id)
+            print(f"{offset:12.6f}  {name}  {frame.frame.decode('ascii').strip()}")
+        return
+
+    targets: Dict[int, Tuple[str, int]] = {}
+    for target in args.target:
+        controller_id, address = target.split("=")
+        ip, port = address.rsplit(":", 1)
+        targets[int(controller_id)] = (ip, int(port))
+
+    sent = replay(recording, targets, args.speed)
+    print(f"Replayed {sent} frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+import select
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Deque, Optional, Tuple
+from .protocol import Response, ResponseParser, ResponseStatus
+
+# Longest time in seconds the reader thread waits for replies before checking for timeouts and shutdown
+POLL_INTERVAL = 0.05
+
+
+class ResponseReader:
+    """
+    Class representing a reader thread draining the replies of a controller. Commands are registered
+    before they are sent, and replies are matched to the registered commands in the order they were
+    sent. At most `max_in_flight` commands may await their reply at a time, so commands are pipelined
+    without a round-trip per command. Commands not answered within the timeout are reported as such.
+    If the connection fails while reading, the reader closes and calls the `on_error` callback.
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        max_in_flight: int,
+        timeout: float,
+        name: str,
+        on_error: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Initialize the reader and start the reader thread.
+
+        Args:
+        -----
+            sock (socket.socket): The connected controller socket. Only read by the reader thread.
+            max_in_flight (int): The maximum number of commands awaiting their reply. Must be at least 1.
+            timeout (float) [s]: The time to wait for the reply to a command before reporting a timeout.
+            name (str): Name of the reader thread.
+            on_error (Optional[Callable[[], None]]): Called from the reader thread if the connection fails.
+        """
+        if max_in_flight < 1:
+            raise ValueError(
+                f"Invalid number of commands in flight: {max_in_flight} - Must be at least 1"
+            )
+
+        self.__sock = sock
+        self.__max_in_flight = max_in_flight
+        self.__timeout = timeout
+        self.__parser = ResponseParser()
+        self.__condition = threading.Condition()
+        self.__closed = False
+        self.__on_error = on_error
+
+        # Commands awaiting their reply: channel index, deadline and future, in the order they were sent
+        self.__in_flight: Deque[
+            Tuple[int, float, "Future[Optional[ResponseStatus]]"]
+        ] = deque()
+
+        self.__thread = threading.Thread(target=self.__run, name=name, daemon=True)
+        self.__thread.start()
+
+    def __len__(self) -> int:
+        """
+        Returns:
+        --------
+            int: The number of commands currently awaiting their reply.
+        """
+        return len(self.__in_flight)
+
+    def register(self, channel_idx: int) -> "Future[Optional[ResponseStatus]]":
+        """
+        Register a command about to be sent. Blocks while `max_in_flight` commands await their reply.
+
+        Args:
+        -----
+            channel_idx (int): The zero-indexed channel the command is sent to.
+
+        Returns:
+        --------
+            Future[Optional[ResponseStatus]]: Future completing with the status reported for the command.
+        """
+        future: "Future[Optional[ResponseStatus]]" = Future()
+
+        with self.__condition:
+            self.__condition.wait_for(
+                lambda: len(self.__in_flight) < self.__max_in_flight or self.__closed
+            )
+
+            if self.__closed:
+                raise ConnectionError("Connection to the controller is closed")
+
+            self.__in_flight.append(
+                (channel_idx, time.monotonic() + self.__timeout, future)
+            )
+
+        return future
+
+    def discard(
+        self, future: "Future[Optional[ResponseStatus]]", error: BaseException
+    ) -> None:
+        """
+        Remove a registered command that could not be sent.
+
+        Args:
+        -----
+            future (Future[Optional[ResponseStatus]]): The future returned when the command was registered.
+            error (BaseException): The exception raised when sending the command.
+        """
+        with self.__condition:
+            for entry in self.__in_flight:
+                if entry[2] is future:
+                    self.__in_flight.remove(entry)
+                    self.__condition.notify_all()
+                    break
+
+        future.set_exception(error)
+
+    def close(self) -> None:
+        """
+        Stop the reader thread. Commands still awaiting their reply are reported as timed out.
+        """
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+
+        self.__thread.join()
+
+    def __run(self) -> None:
+        """
+        Reader thread main loop. Waits for replies and matches them to the commands in flight.
+        """
+        while not self.__closed:
+            with self.__condition:
+                deadline = self.__in_flight[0][1] if self.__in_flight else None
+
+            wait = POLL_INTERVAL
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+
+            try:
+                readable, _, _ = select.select([self.__sock], [], [], wait)
+                data = self.__sock.recv(4096) if readable else None
+            except OSError as e:
+                self.__fail(e)
+                return
+
+            if data == b"":
+                self.__fail(ConnectionError("Connection closed by the controller"))
+                return
+
+            if data:
+                for response in self.__parser.feed(data):
+                    self.__match(response)
+
+            self.__expire()
+
+        self.__fail(None)
+
+    def __match(self, response: Response) -> None:
+        """
+        Match a reply to the oldest command in flight on its channel. Older commands on other
+        channels are assumed to have lost their reply and are reported as timed out. Replies that
+        could not be parsed are matched to the oldest command in flight.
+
+        Args:
+        -----
+            response (Response): The reply received from the controller.
+        """
+        with self.__condition:
+            if response.channel_idx >= 0 and not any(
+                entry[0] == response.channel_idx for entry in self.__in_flight
+            ):
+                # Unsolicited reply, e.g. to a command that already timed out
+                return
+
+            resolved = []
+            while self.__in_flight:
+                channel_idx, _, future = self.__in_flight.popleft()
+
+                if response.channel_idx in (-1, channel_idx):
+                    resolved.append((future, response.status))
+                    break
+
+                resolved.append((future, ResponseStatus.TIMEOUT))
+
+            self.__condition.notify_all()
+
+        for future, status in resolved:
+            future.set_result(status)
+
+    def __expire(self) -> None:
+        """
+        Report the commands that have waited longer than the timeout for their reply.
+        """
+        now = time.monotonic()
+        expired = []
+
+        with self.__condition:
+            while self.__in_flight and self.__in_flight[0][1] <= now:
+                expired.append(self.__in_flight.popleft()[2])
+
+            if expired:
+                self.__condition.notify_all()
+
+        for future in expired:
+            future.set_result(ResponseStatus.TIMEOUT)
+
+    def __fail(self, error: Optional[BaseException]) -> None:
+        """
+        Close the reader and resolve all commands in flight.
+
+        Args:
+        -----
+            error (Optional[BaseException]): The error closing the connection, None if the reader was closed.
+        """
+        with self.__condition:
+            self.__closed = True
+            in_flight, self.__in_flight = self.__in_flight, deque()
+            self.__condition.notify_all()
+
+        for _, _, future in in_flight:
+            if error is None:
+                future.set_result(ResponseStatus.TIMEOUT)
+            else:
+                future.set_exception(error)
+
+        if error is not None and self.__on_error is not None:
+            self.__on_error()
@@ -0,0 +1,97 @@
+from typing import List, NamedTuple, Tuple
+from .protocol import INTENSITY_FRAMES, MAX_INTENSITY, MAX_STROBE_MODE, STROBE_FRAMES
+
+
+class ChannelSetting(NamedTuple):
+    """
+    The full state of a single channel: its intensity, on-off state and strobe mode.
+    """
+
+    intensity: int
+    state: bool
+    strobe_mode: int
+
+    @property
+    def output(self) -> int:
+        """
+        Get the intensity output by the controller, i.e. the intensity if the channel is on and 0 if it is off.
+
+        Returns:
+        --------
+            int: The output intensity of the channel.
+        """
+        return self.intensity if self.state else 0
+
+
+class Scene(NamedTuple):
+    """
+    An immutable lighting setup, holding the setting of every channel of a controller in channel order.
+
+    ```python
+    scene = Scene((ChannelSetting(200, True, 1), ChannelSetting(0, False, 1)))
+    ```
+    """
+
+    channels: Tuple[ChannelSetting, ...]
+
+    def validate(self) -> None:
+        """
+        Verify that all settings of the scene are valid. Throws a ValueError if not.
+        """
+        for setting in self.channels:
+            if not 0 <= setting.intensity <= MAX_INTENSITY:
+                raise ValueError(
+                    f"Channel intensity must be between 0 and {MAX_INTENSITY}"
+                )
+
+            if not 1 <= setting.strobe_mode <= MAX_STROBE_MODE:
+                raise ValueError(
+                    f"Strobe mode must be between 1 and {MAX_STROBE_MODE}, got: {setting.strobe_mode}"
+                )
+
+
+class CaptureStep(NamedTuple):
+    """
+    The timing of a step of a capture sequence, as `time.perf_counter` times in seconds: the start of the
+    transition, when its frames were on the wire and when the camera trigger returned.
+    """
+
+    step: int
+    frames: int
+    start: float
+    lit: float
+    done: float
+
+
+def plan_scene(current: Scene, target: Scene) -> List[bytes]:
+    """
+    Compute the frames switching a controller from one scene to another. Only the output intensity
+    and strobe mode of a channel are sent, and only if they change, so e.g. changing the intensity of
+    a channel that stays off costs no frame. To avoid visible glitches, channels getting darker are
+    updated first, then the strobe modes are changed, and channels getting brighter are updated last.
+    The light therefore never exceeds the brighter of the two scenes during the switch, and the strobe
+    modes of channels turning on are set before they light up.
+
+    Args:
+    -----
+        current (Scene): The scene currently output by the controller.
+        target (Scene): The scene to switch to. Must have the same number of channels.
+
+    Returns:
+    --------
+        List[bytes]: The encoded frames, in the order to send them.
+    """
+    darker: List[bytes] = []
+    strobes: List[bytes] = []
+    brighter: List[bytes] = []
+
+    for channel_idx, (now, new) in enumerate(zip(current.channels, target.channels)):
+        if new.output < now.output:
+            darker.append(INTENSITY_FRAMES[channel_idx][new.output])
+        elif new.output > now.output:
+            brighter.append(INTENSITY_FRAMES[channel_idx][new.output])
+
+        if new.strobe_mode != now.strobe_mode:
+            strobes.append(STROBE_FRAMES[channel_idx][new.strobe_mode - 1])
+
+    return darker + strobes + brighter
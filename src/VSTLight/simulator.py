@@ -0,0 +1,377 @@
+import argparse
+import asyncio
+import threading
+import time
+from functools import partial
+from typing import List, NamedTuple, Optional
+from .protocol import (
+    MAX_CHANNELS,
+    MAX_INTENSITY,
+    MAX_STROBE_MODE,
+    WAIT_TIME,
+    ResponseStatus,
+    encode_command,
+)
+
+# Shortfall in seconds of the spacing between two frames tolerated before flagging a violation.
+# Covers the usual delay of the event loop in reading a frame, not the stalls of a loaded machine
+TOLERANCE = 0.0005
+
+# Error codes of the simulated replies
+ERROR_COMMAND = "01"
+ERROR_CHECKSUM = "02"
+ERROR_SPACING = "03"
+
+
+class FrameRecord(NamedTuple):
+    """
+    A frame received by a virtual controller. The timestamp is taken from `time.perf_counter` when the
+    frame was read, and the spacing is the time since the previous frame (infinite for the first frame).
+    Frames are timestamped by the event loop of the simulator, not by the socket: if the loop is delayed,
+    e.g. by the GIL or the scheduler, frames sent 5ms apart are read in one go and recorded closer together.
+    """
+
+    timestamp: float
+    spacing: float
+    frame: bytes
+    status: ResponseStatus
+    code: str
+    violation: bool
+
+
+class VirtualController:
+    """
+    Class representing a simulated VLP light controller. Frames are parsed and checked in the same way
+    as by the physical unit: the checksum must match, the channel must exist and the value must be in
+    range. Valid frames update the output state of the channel. Frames arriving less than the minimum
+    spacing after the previous frame are flagged as violations, and rejected if `strict` is set.
+    Violations are measured on the receiving side and may be caused by delays of the simulator itself,
+    so the spacing produced by a sender is best checked with the statistics of its `RateLimiter`.
+    """
+
+    def __init__(
+        self,
+        channels: int = MAX_CHANNELS,
+        wait_time: float = WAIT_TIME,
+        tolerance: float = TOLERANCE,
+        strict: bool = False,
+        reply: bool = True,
+    ) -> None:
+        """
+        Initialize the virtual controller with all channels at intensity 0 and strobe mode 1.
+
+        Args:
+        -----
+            channels (int): The number of channels of the controller [1-4].
+            wait_time (float) [s]: The minimum time between two frames.
+            tolerance (float) [s]: The shortfall of the spacing tolerated before flagging a violation.
+            strict (bool): Reject frames violating the minimum spacing instead of only flagging them.
+            reply (bool): Reply to every frame. The physical unit always replies.
+        """
+        self.channels = channels
+        self.wait_time = wait_time
+        self.tolerance = tolerance
+        self.strict = strict
+        self.reply = reply
+
+        self.intensities = [0] * channels
+        self.strobe_modes = [1] * channels
+        self.records: List[FrameRecord] = []
+        self.port = 0
+
+        self.__last: Optional[float] = None
+
+    @property
+    def violations(self) -> int:
+        """
+        Get the number of frames received with less than the minimum spacing.
+
+        Returns:
+        --------
+            int: The number of spacing violations.
+        """
+        return sum(record.violation for record in self.records)
+
+    def handle(self, frame: bytes, timestamp: float) -> Optional[bytes]:
+        """
+        Process a frame received by the controller, without its delimiter.
+
+        Args:
+        -----
+            frame (bytes): The received frame, e.g. `@00F12588`.
+            timestamp (float) [s]: The `time.perf_counter` time the frame was received.
+
+        Returns:
+        --------
+            Optional[bytes]: The encoded reply, or None if the controller does not reply.
+        """
+        spacing = timestamp - self.__last if self.__last is not None else float("inf")
+        self.__last = timestamp
+
+        violation = spacing < self.wait_time - self.tolerance
+        code = self.__apply(frame, violation)
+        status = ResponseStatus.NAK if code else ResponseStatus.ACK
+
+        self.records.append(
+            FrameRecord(timestamp, spacing, frame, status, code, violation)
+        )
+
+        channel = frame[1:3]
+        if not self.reply or not channel.isdigit():
+            return None
+
+        result = f"N{code}" if code else "O"
+
+        return encode_command(f"{channel.decode('ascii')}{result}")
+
+    def __apply(self, frame: bytes, violation: bool) -> str:
+        """
+        Check a frame and update the output state of its channel if it is valid.
+
+        Args:
+        -----
+            frame (bytes): The received frame, without its delimiter.
+            violation (bool): The frame arrived too soon after the previous frame.
+
+        Returns:
+        --------
+            str: The error code, or an empty string if the frame was accepted.
+        """
+        body, checksum = frame[:-2], frame[-2:]
+
+        if len(frame) < 6 or f"{sum(body) % 256:02X}".encode("ascii") != checksum:
+            return ERROR_CHECKSUM
+
+        if violation and self.strict:
+            return ERROR_SPACING
+
+        channel, command, value = body[1:3], body[3:4], body[4:]
+        if body[:1] != b"@" or not channel.isdigit() or not value.isdigit():
+            return ERROR_COMMAND
+
+        channel_idx = int(channel)
+        if channel_idx >= self.channels:
+            return ERROR_COMMAND
+
+        if command == b"F" and len(value) == 3 and int(value) <= MAX_INTENSITY:
+            self.intensities[channel_idx] = int(value)
+        elif command == b"S" and len(value) == 2 and 1 <= int(value) <= MAX_STROBE_MODE:
+            self.strobe_modes[channel_idx] = int(value)
+        else:
+            return ERROR_COMMAND
+
+        return ""
+
+
+class Simulator:
+    """
+    Class representing a set of virtual VLP light controllers served over TCP by an asyncio server each.
+    Used to test and benchmark the library without lab hardware. Each controller accepts any number of
+    connections, with all connections sharing the state and spacing of the controller.
+
+    ```python
+    async with Simulator(controllers=4) as simulator:
+        lights = AsyncNetworkController(4, simulator.host, simulator.controllers[0].port)
+    ```
+    """
+
+    def __init__(
+        self,
+        controllers: int = 1,
+        host: str = "127.0.0.1",
+        base_port: int = 0,
+        channels: int = MAX_CHANNELS,
+        wait_time: float = WAIT_TIME,
+        tolerance: float = TOLERANCE,
+        strict: bool = False,
+        reply: bool = True,
+    ) -> None:
+        """
+        Initialize the simulator. The servers are started by `start`.
+
+        Args:
+        -----
+            controllers (int): The number of virtual controllers.
+            host (str): The address to serve the controllers on.
+            base_port (int): The port of the first controller, the following controllers use the next ports.
+                0 lets the OS choose a free port for every controller.
+            channels (int): The number of channels of every controller [1-4].
+            wait_time (float) [s]: The minimum time between two frames.
+            tolerance (float) [s]: The shortfall of the spacing tolerated before flagging a violation.
+            strict (bool): Reject frames violating the minimum spacing instead of only flagging them.
+            reply (bool): Reply to every frame.
+        """
+        if not 1 <= channels <= MAX_CHANNELS:
+            raise ValueError(
+                f"Invalid number of channels: {channels} - Must be between 1 and {MAX_CHANNELS}"
+            )
+
+        self.host = host
+        self.controllers = [
+            VirtualController(channels, wait_time, tolerance, strict, reply)
+            for _ in range(controllers)
+        ]
+
+        self.__base_port = base_port
+        self.__servers: List[asyncio.AbstractServer] = []
+
+    async def start(self) -> None:
+        """
+        Start serving all virtual controllers. The ports are available from the controllers once started.
+        """
+        for idx, controller in enumerate(self.controllers):
+            port = self.__base_port + idx if self.__base_port else 0
+
+            server = await asyncio.start_server(
+                partial(self.__serve, controller), self.host, port
+            )
+            controller.port = server.sockets[0].getsockname()[1]
+            self.__servers.append(server)
+
+    async def stop(self) -> None:
+        """
+        Stop serving the virtual controllers.
+        """
+        for server in self.__servers:
+            server.close()
+            await server.wait_closed()
+
+        self.__servers.clear()
+
+    async def __aenter__(self) -> "Simulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.stop()
+
+    async def __serve(
+        self,
+        controller: VirtualController,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """
+        Serve a connection to a virtual controller until it is closed by the client.
+
+        Args:
+        -----
+            controller (VirtualController): The controller the connection was made to.
+            reader (asyncio.StreamReader): The reader of the connection.
+            writer (asyncio.StreamWriter): The writer of the connection.
+        """
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+
+                response = controller.handle(line[:-2], time.perf_counter())
+
+                if response is not None:
+                    writer.write(response)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+class SimulatorThread:
+    """
+    Class running a `Simulator` on an event loop in a background thread, for use with the blocking
+    `NetworkController`. The virtual controllers must only be inspected while no commands are sent.
+
+    ```python
+    with SimulatorThread(Simulator(controllers=2)) as simulator:
+        lights = NetworkController(4, simulator.host, simulator.controllers[0].port)
+    ```
+    """
+
+    def __init__(self, simulator: Simulator) -> None:
+        """
+        Initialize the thread. The simulator is started by `start`.
+
+        Args:
+        -----
+            simulator (Simulator): The simulator to run.
+        """
+        self.simulator = simulator
+        self.__loop = asyncio.new_event_loop()
+        self.__thread = threading.Thread(
+            target=self.__loop.run_forever, name="VSTLight-simulator", daemon=True
+        )
+
+    def start(self) -> Simulator:
+        """
+        Start the event loop thread and the simulator. Blocks until the controllers are served.
+
+        Returns:
+        --------
+            Simulator: The started simulator.
+        """
+        self.__thread.start()
+        asyncio.run_coroutine_threadsafe(self.simulator.start(), self.__loop).result()
+
+        return self.simulator
+
+    def stop(self) -> None:
+        """
+        Stop the simulator and the event loop thread.
+        """
+        asyncio.run_coroutine_threadsafe(self.simulator.stop(), self.__loop).result()
+
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join()
+        self.__loop.close()
+
+    def __enter__(self) -> Simulator:
+        return self.start()
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+
+async def _serve_forever(simulator: Simulator) -> None:
+    """
+    Serve the virtual controllers until cancelled, printing the port of every controller.
+
+    Args:
+    -----
+        simulator (Simulator): The simulator to run.
+    """
+    async with simulator:
+        for idx, controller in enumerate(simulator.controllers):
+            print(f"Controller {idx}: {simulator.host}:{controller.port}")
+
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    """
+    Run the simulator from the command line: `python -m VSTLight.simulator --controllers 4`.
+    """
+    parser = argparse.ArgumentParser(description="Simulate VLP light controllers.")
+    parser.add_argument("--controllers", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=0)
+    parser.add_argument("--channels", type=int, default=MAX_CHANNELS)
+    parser.add_argument("--strict", action="store_true")
+    args = parser.parse_args()
+
+    simulator = Simulator(
+        args.controllers, args.host, args.base_port, args.channels, strict=args.strict
+    )
+
+    try:
+        asyncio.run(_serve_forever(simulator))
+    except KeyboardInterrupt:
+        for idx, controller in enumerate(simulator.controllers):
+            print(
+                f"Controller {idx}: {len(controller.records)} frames, "
+                f"{controller.violations} spacing violations"
+            )
+
+
+if __name__ == "__main__":
+    main()
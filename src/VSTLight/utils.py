@@ -1,5 +1,10 @@
+import asyncio
 import time
 
+# Remaining time in seconds below which waits stop sleeping and spin until the deadline.
+# Sleeping may overshoot by more than this under load, spinning hits the deadline within microseconds
+SPIN_THRESHOLD = 0.0005
+
 
 def validate_ip_format(ip: str) -> bool:
     """
@@ -24,15 +29,46 @@ def validate_ip_format(ip: str) -> bool:
     )
 
 
-def compare_and_wait(last_cmd_time: float, wait_time: float) -> None:
+def sleep_until(deadline: int, spin: int) -> int:
     """
-    Blocking function call! Compare the current time to the time of the last command
-    and wait until at least wait_time have passed since the last command was sent before returning.
+    Blocking function call! Sleep until shortly before a deadline, then spin for the rest of the
+    time, yielding to other threads in between. Returns at most a few microseconds late, where a
+    plain `time.sleep` may overshoot by hundreds of microseconds under load.
 
     Args:
     -----
-        last_cmd_time (int): The time the last command was sent.
-        wait_time (int) [s]: The minimum time to wait before returning (in seconds).
+        deadline (int) [ns]: The `time.perf_counter_ns` time to wait for.
+        spin (int) [ns]: The remaining time below which the function spins instead of sleeping.
+
+    Returns:
+    --------
+        int: The `time.perf_counter_ns` time when the function returned.
     """
-    if time.monotonic() - last_cmd_time < wait_time:
-        time.sleep(wait_time - (time.monotonic() - last_cmd_time))
+    remaining = deadline - time.perf_counter_ns()
+
+    if remaining > spin:
+        time.sleep((remaining - spin) / 1e9)
+
+    while (now := time.perf_counter_ns()) < deadline:
+        time.sleep(0)
+
+    return now
+
+
+async def async_compare_and_wait(last_cmd_time: float, wait_time: float) -> None:
+    """
+    Compare the current time to the time of the last command and suspend the calling coroutine
+    until at least wait_time have passed since the last command was sent. Other tasks on the
+    event loop keep running while waiting.
+
+    Args:
+    -----
+        last_cmd_time (float): The time the last command was sent.
+        wait_time (float) [s]: The minimum time to wait before returning (in seconds).
+    """
+    remaining = wait_time - (time.monotonic() - last_cmd_time)
+
+    # The event loop may wake up marginally early, so keep waiting until the gap is respected
+    while remaining > 0:
+        await asyncio.sleep(remaining)
+        remaining = wait_time - (time.monotonic() - last_cmd_time)
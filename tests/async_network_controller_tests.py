@@ -0,0 +1,141 @@
+import asyncio
+import time
+import unittest
+
+from src.VSTLight.async_network_controller import AsyncNetworkController
+
+# Define the localhost and port for the dummy light controller
+HOST = "127.0.0.1"
+PORT = 6090
+
+
+class TestAsyncNetworkController(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        """
+        Runs before every test.
+
+        Operations:
+        ----------
+        - Creates a mock controller by starting an asyncio server on localhost
+        - Records the arrival time and contents of every line received by the mock controller
+        - Connects an AsyncNetworkController and clears the initialization commands
+        """
+        self.received = []
+        self.server = await asyncio.start_server(self.handle_client, HOST, PORT)
+
+        self.controller = AsyncNetworkController(4, HOST, PORT)
+        await self.controller.connect()
+
+        await self.wait_for_lines(8)
+        self.received.clear()
+
+    async def asyncTearDown(self) -> None:
+        """
+        Destroy the controller and close the mock controller after each test
+        """
+        await self.controller.destroy()
+
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Store every line sent to the mock controller together with its arrival time
+        """
+        while line := await reader.readline():
+            self.received.append((time.monotonic(), line.decode(encoding="ascii")))
+
+        writer.close()
+
+    async def wait_for_lines(self, count: int) -> None:
+        """
+        Wait until the mock controller has received at least count lines
+        """
+        while len(self.received) < count:
+            await asyncio.sleep(0.001)
+
+    async def test_set_intensity_remote(self):
+        """
+        Test that the set_intensity method sends the correct frame to the controller
+        """
+        await self.controller.set_on(4)
+        await self.controller.set_intensity(4, 255)
+        await self.wait_for_lines(1)
+
+        self.assertEqual(self.received[0][1][1:7], "03F255")
+
+    async def test_checksum(self):
+        """
+        Test that the checksum is calculated correctly for the message
+        (Uses example from the VLP controller specsheet setting channel 2 to 125 intensity)
+        """
+        await self.controller.set_on(2)
+        await self.controller.set_intensity(2, 125)
+        await self.wait_for_lines(1)
+
+        self.assertEqual(self.received[0][1], "@01F1257F\r\n")
+
+    async def test_set_strobe_mode(self):
+        """
+        Test that the set_strobe_mode method changes the local and remote strobe mode of a channel
+        """
+        await self.controller.set_strobe_mode(2, 5)
+        await self.wait_for_lines(1)
+
+        self.assertEqual(self.controller.get_strobe_mode(2), 5)
+        self.assertEqual(self.received[0][1][1:6], "01S05")
+
+    async def test_command_spacing(self):
+        """
+        Test that commands are spaced by at least 5ms, also when issued concurrently from several tasks
+        """
+        start = time.monotonic()
+        await asyncio.gather(*(self.controller.set_off(i + 1) for i in range(4)))
+
+        self.assertGreaterEqual(time.monotonic() - start, 3 * 0.005)
+
+        await self.wait_for_lines(4)
+        self.assertEqual(
+            [line[1:7] for _, line in self.received],
+            ["00F000", "01F000", "02F000", "03F000"],
+        )
+
+    async def test_event_loop_not_blocked(self):
+        """
+        Test that other tasks keep running while a command waits for the 5ms gap
+        """
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.ensure_future(ticker())
+        await self.controller.set_all_off()
+        task.cancel()
+
+        self.assertGreater(ticks, 4)
+
+    async def test_bad_channel(self):
+        """
+        Test that an invalid channel ID raises a ValueError
+        """
+        with self.assertRaises(ValueError):
+            await self.controller.set_on(5)
+
+    async def test_connect_without_reset(self):
+        """
+        Test that no commands are sent when connecting without the reset
+        """
+        controller = AsyncNetworkController(1, HOST, PORT)
+        await controller.connect(reset=False)
+        await controller.set_strobe_mode(1, 2)
+        await self.wait_for_lines(1)
+
+        self.assertEqual(self.received[0][1][1:6], "00S02")
+
+        await controller.destroy()
@@ -0,0 +1,45 @@
+import unittest
+
+from benchmarks.run import compare
+
+
+def results(commands_per_s, latency_p50_ms, latency_p99_ms=10.0):
+    return {
+        "benchmarks": {
+            "single": {
+                "commands_per_s": commands_per_s,
+                "latency_p50_ms": latency_p50_ms,
+                "latency_p99_ms": latency_p99_ms,
+            }
+        }
+    }
+
+
+class TestCompare(unittest.TestCase):
+    def test_within_tolerance(self):
+        """
+        Test that changes within the tolerance, and improvements, are not flagged
+        """
+        baseline = results(200.0, 20.0)
+
+        self.assertEqual(compare(results(180.0, 22.0), baseline, 0.25), [])
+        self.assertEqual(compare(results(400.0, 5.0), baseline, 0.25), [])
+
+    def test_regressions(self):
+        """
+        Test that lower throughput and higher latency beyond the tolerance are flagged
+        """
+        regressions = compare(results(100.0, 30.0), results(200.0, 20.0), 0.25)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("single.commands_per_s"))
+        self.assertTrue(regressions[1].startswith("single.latency_p50_ms"))
+
+    def test_skipped_metrics(self):
+        """
+        Test that metrics not compared, or missing from the results, are skipped
+        """
+        baseline = results(200.0, 20.0, 10.0)
+        current = {"benchmarks": {"single": {"latency_p99_ms": 100.0}}}
+
+        self.assertEqual(compare(current, baseline, 0.25), [])
@@ -1,6 +1,7 @@
 import unittest
 
-from src.VSTLight.channel import Channel
+from src.VSTLight.channel import Channel, ChannelBank
+from src.VSTLight.scene import ChannelSetting, Scene
 
 
 class TestIPFormat(unittest.TestCase):
@@ -127,3 +128,79 @@ class TestIPFormat(unittest.TestCase):
 
         self.channel.toggle()
         self.assertTrue(self.channel.state)
+
+
+class TestChannelBank(unittest.TestCase):
+    def setUp(self) -> None:
+        """
+        Create a bank holding the channels of two controllers
+        """
+        self.bank = ChannelBank()
+        self.first = self.bank.allocate(4)
+        self.second = self.bank.allocate(2)
+
+    def test_allocate(self):
+        """
+        Test that allocated channels follow each other and start off with intensity 0 and strobe mode 1
+
+        """
+        self.assertEqual((self.first, self.second), (0, 4))
+        self.assertEqual(len(self.bank), 6)
+        self.assertEqual(self.bank.intensities(0, 6), bytes(6))
+        self.assertEqual(self.bank.states(0, 6), [False] * 6)
+        self.assertEqual(self.bank.strobe_modes(0, 6), bytes([1] * 6))
+
+    def test_accessors(self):
+        """
+        Test that the fields of a channel are set independently of each other and of other channels
+
+        """
+        self.bank.set_intensity(4, 200)
+        self.bank.set_state(4, True)
+        self.bank.set_strobe_mode(5, 10)
+
+        self.assertEqual(self.bank.get_intensity(4), 200)
+        self.assertTrue(self.bank.get_state(4))
+        self.assertEqual(self.bank.get_strobe_mode(4), 1)
+        self.assertEqual(self.bank.get_strobe_mode(5), 10)
+        self.assertEqual(self.bank.intensities(0, 4), bytes(4))
+
+    def test_batch(self):
+        """
+        Test that the batch accessors read and write a range of channels
+
+        """
+        self.bank.set_intensities(2, [10, 20, 30])
+        self.bank.set_states(2, [True, False, True])
+        self.bank.set_strobe_modes(2, [4, 5, 6])
+
+        self.assertEqual(self.bank.intensities(0, 6), bytes([0, 0, 10, 20, 30, 0]))
+        self.assertEqual(self.bank.states(2, 5), [True, False, True])
+        self.assertEqual(self.bank.strobe_modes(2, 5), bytes([4, 5, 6]))
+        self.assertEqual(
+            self.bank.capture(2, 4),
+            Scene((ChannelSetting(10, True, 4), ChannelSetting(20, False, 5))),
+        )
+        self.assertEqual(self.bank.pack(4, 5), bytes([30, 1, 6]))
+
+    def test_view(self):
+        """
+        Test that a view has the interface of a channel and validates its values
+
+        """
+        view = self.bank[5]
+        view.intensity = 128
+        view.strobe_mode = 3
+        view.toggle()
+
+        self.assertEqual(self.bank.pack(5, 6), bytes([128, 1, 3]))
+        self.assertTrue(view.state)
+
+        with self.assertRaises(ValueError):
+            view.intensity = 256
+
+        with self.assertRaises(ValueError):
+            view.strobe_mode = 0
+
+        with self.assertRaises(IndexError):
+            self.bank[6]
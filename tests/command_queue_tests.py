@@ -0,0 +1,255 @@
+import queue
+import threading
+import time
+import unittest
+
+from src.VSTLight.command_queue import Backpressure, CommandQueue, Priority
+
+
+class TestCommandQueue(unittest.TestCase):
+    def setUp(self) -> None:
+        """
+        Create a list to store sent frames and an event blocking the send function until set
+        """
+        self.sent = []
+        self.release = threading.Event()
+
+    def send(self, frame: bytes) -> None:
+        """
+        Dummy send function storing frames once released
+        """
+        self.release.wait()
+        self.sent.append(frame)
+
+    def test_frames_sent_in_order(self):
+        """
+        Test that frames are sent in the order they were added
+        """
+        self.release.set()
+        command_queue = CommandQueue(self.send)
+
+        futures = [command_queue.put(bytes([i])) for i in range(10)]
+        for future in futures:
+            future.result(timeout=1)
+
+        command_queue.close()
+        self.assertEqual(self.sent, [bytes([i]) for i in range(10)])
+
+    def test_close_sends_pending_frames(self):
+        """
+        Test that closing the queue sends all frames still waiting
+        """
+        command_queue = CommandQueue(self.send)
+
+        for i in range(5):
+            command_queue.put(bytes([i]))
+
+        self.release.set()
+        command_queue.close()
+
+        self.assertEqual(len(self.sent), 5)
+
+    def test_backpressure_raise(self):
+        """
+        Test that adding to a full queue raises queue.Full with the RAISE policy
+        """
+        command_queue = CommandQueue(self.send, 2, Backpressure.RAISE)
+
+        # The first frame is held by the sender thread, the next two fill the queue
+        command_queue.put(b"0")
+        while len(command_queue) > 0:
+            time.sleep(0.001)
+
+        command_queue.put(b"1")
+        command_queue.put(b"2")
+
+        with self.assertRaises(queue.Full):
+            command_queue.put(b"3")
+
+        self.release.set()
+        command_queue.close()
+
+    def test_backpressure_drop_oldest(self):
+        """
+        Test that adding to a full queue cancels the oldest waiting frame with the DROP_OLDEST policy
+        """
+        command_queue = CommandQueue(self.send, 2, Backpressure.DROP_OLDEST)
+
+        command_queue.put(b"0")
+        while len(command_queue) > 0:
+            time.sleep(0.001)
+
+        dropped = command_queue.put(b"1")
+        command_queue.put(b"2")
+        command_queue.put(b"3")
+
+        self.release.set()
+        command_queue.close()
+
+        self.assertTrue(dropped.cancelled())
+        self.assertEqual(self.sent, [b"0", b"2", b"3"])
+
+    def test_backpressure_block(self):
+        """
+        Test that adding to a full queue waits for a free slot with the BLOCK policy
+        """
+        command_queue = CommandQueue(self.send, 1, Backpressure.BLOCK)
+
+        command_queue.put(b"0")
+        while len(command_queue) > 0:
+            time.sleep(0.001)
+
+        command_queue.put(b"1")
+
+        threading.Timer(0.02, self.release.set).start()
+
+        start = time.monotonic()
+        command_queue.put(b"2")
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.01)
+
+        command_queue.close()
+        self.assertEqual(self.sent, [b"0", b"1", b"2"])
+
+    def test_send_exception(self):
+        """
+        Test that an exception raised while sending is stored in the future of the frame
+        """
+
+        def failing_send(frame: bytes) -> None:
+            raise ConnectionError("Controller unreachable")
+
+        command_queue = CommandQueue(failing_send)
+        future = command_queue.put(b"0")
+
+        with self.assertRaises(ConnectionError):
+            future.result(timeout=1)
+
+        command_queue.close()
+
+    def test_put_after_close(self):
+        """
+        Test that frames cannot be added to a closed queue
+        """
+        command_queue = CommandQueue(self.send)
+        command_queue.close()
+
+        with self.assertRaises(RuntimeError):
+            command_queue.put(b"0")
+
+    def test_coalesce_replaces_waiting_frame(self):
+        """
+        Test that a frame with the same key replaces the waiting frame in its place
+        """
+        command_queue = CommandQueue(self.send, coalesce=True)
+
+        command_queue.put(b"0", "held")
+        while len(command_queue) > 0:
+            time.sleep(0.001)
+
+        first = command_queue.put(b"A1", "A")
+        command_queue.put(b"B1", "B")
+        last = command_queue.put(b"A2", "A")
+
+        self.assertEqual(len(command_queue), 2)
+
+        self.release.set()
+        command_queue.close()
+
+        self.assertEqual(self.sent, [b"0", b"A2", b"B1"])
+        self.assertTrue(first.done() and last.done())
+
+    def test_coalesce_after_send(self):
+        """
+        Test that a frame is not replaced once it has been taken by the sender thread
+        """
+        command_queue = CommandQueue(self.send, coalesce=True)
+
+        command_queue.put(b"A1", "A")
+        while len(command_queue) > 0:
+            time.sleep(0.001)
+
+        command_queue.put(b"A2", "A")
+
+        self.release.set()
+        command_queue.close()
+
+        self.assertEqual(self.sent, [b"A1", b"A2"])
+
+    def test_no_coalesce_without_key(self):
+        """
+        Test that frames without a key are never replaced
+        """
+        command_queue = CommandQueue(self.send, coalesce=True)
+
+        for _ in range(3):
+            command_queue.put(b"0")
+
+        self.release.set()
+        command_queue.close()
+
+        self.assertEqual(len(self.sent), 3)
+
+    def hold(self, command_queue: CommandQueue) -> None:
+        """
+        Occupy the sender thread with a frame until released
+        """
+        command_queue.put(b"0", "held")
+        while len(command_queue) > 0:
+            time.sleep(0.001)
+
+    def test_priority_lanes(self):
+        """
+        Test that frames are sent from the most urgent lane first, in order within each lane
+        """
+        command_queue = CommandQueue(self.send)
+        self.hold(command_queue)
+
+        command_queue.put(b"B1", priority=Priority.BULK)
+        command_queue.put(b"N1")
+        command_queue.put(b"C1", priority=Priority.CRITICAL)
+        command_queue.put(b"B2", priority=Priority.BULK)
+        command_queue.put(b"C2", priority=Priority.CRITICAL)
+
+        self.release.set()
+        command_queue.close()
+
+        self.assertEqual(self.sent, [b"0", b"C1", b"C2", b"N1", b"B1", b"B2"])
+
+    def test_critical_cancels_stale_frames(self):
+        """
+        Test that a frame cancels waiting frames with the same key in less urgent lanes only
+        """
+        command_queue = CommandQueue(self.send)
+        self.hold(command_queue)
+
+        stale_bulk = command_queue.put(b"A1", "A", Priority.BULK)
+        stale_normal = command_queue.put(b"A2", "A")
+        other = command_queue.put(b"B1", "B", Priority.BULK)
+        command_queue.put(b"A3", "A", Priority.CRITICAL)
+
+        self.assertTrue(stale_bulk.cancelled() and stale_normal.cancelled())
+        self.assertFalse(other.cancelled())
+
+        self.release.set()
+        command_queue.close()
+
+        self.assertEqual(self.sent, [b"0", b"A3", b"B1"])
+
+    def test_critical_ignores_queue_size(self):
+        """
+        Test that critical frames are added to a full queue without waiting
+        """
+        command_queue = CommandQueue(self.send, 1, Backpressure.RAISE)
+        self.hold(command_queue)
+
+        command_queue.put(b"N1")
+        command_queue.put(b"C1", priority=Priority.CRITICAL)
+
+        with self.assertRaises(queue.Full):
+            command_queue.put(b"N2")
+
+        self.release.set()
+        command_queue.close()
+
+        self.assertEqual(self.sent, [b"0", b"C1", b"N1"])
@@ -0,0 +1,229 @@
+import socket
+import struct
+import time
+import unittest
+
+from src.VSTLight.connection import ControllerConnection
+from src.VSTLight.network_controller import NetworkController
+from src.VSTLight.protocol import encode_command
+
+# Define the localhost for the mock light controller. The mock controller binds to a free port
+# chosen by the OS, as the tests close connections from the controller side
+HOST = "127.0.0.1"
+
+# Short backoff to keep the tests fast
+BACKOFF = 0.01
+
+
+def reset(conn: socket.socket) -> None:
+    """
+    Close a mock connection with a reset, so the next send on the other side fails
+    """
+    conn.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+    conn.close()
+
+
+class TestControllerConnection(unittest.TestCase):
+    def setUp(self) -> None:
+        """
+        Create a mock controller and a reconnecting connection to it
+        """
+        self.mock_controller = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.mock_controller.bind((HOST, 0))
+        self.mock_controller.listen()
+        self.mock_controller.settimeout(5)
+
+        self.connection = ControllerConnection(
+            HOST,
+            self.mock_controller.getsockname()[1],
+            reconnect=True,
+            initial_backoff=BACKOFF,
+            max_backoff=BACKOFF,
+        )
+        self.connection.connect()
+        self.mock_conn = self.mock_controller.accept()[0]
+
+    def tearDown(self) -> None:
+        """
+        Close the connection and the mock controller
+        """
+        self.connection.close()
+        self.mock_conn.close()
+        self.mock_controller.close()
+
+    def trip(self) -> None:
+        """
+        Reset the mock connection and send until the connection detects the failure
+        """
+        reset(self.mock_conn)
+
+        with self.assertRaises(ConnectionError):
+            for _ in range(100):
+                self.connection.send(b"x")
+                time.sleep(0.001)
+
+    def test_send(self):
+        """
+        Test that frames are sent while connected
+        """
+        self.connection.send(b"frame")
+        self.assertEqual(self.mock_conn.recv(1024), b"frame")
+
+    def test_fails_fast_while_down(self):
+        """
+        Test that sends fail immediately while the connection is down
+        """
+        self.mock_controller.close()
+        self.trip()
+
+        self.assertFalse(self.connection.connected)
+
+        start = time.monotonic()
+        with self.assertRaises(ConnectionError):
+            self.connection.send(b"x")
+
+        self.assertLess(time.monotonic() - start, 0.1)
+
+    def test_reconnects(self):
+        """
+        Test that the connection reconnects and calls the callback
+        """
+        reconnected = []
+        self.connection.on_reconnect = lambda: reconnected.append(True)
+
+        self.trip()
+        self.mock_conn = self.mock_controller.accept()[0]
+
+        deadline = time.monotonic() + 5
+        while not reconnected and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+        self.assertEqual(reconnected, [True])
+        self.assertTrue(self.connection.connected)
+
+        self.connection.send(b"frame")
+        self.assertEqual(self.mock_conn.recv(1024), b"frame")
+
+    def test_close_stops_reconnecting(self):
+        """
+        Test that closing the connection stops reconnecting
+        """
+        self.mock_controller.close()
+        self.trip()
+
+        start = time.monotonic()
+        self.connection.close()
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertFalse(self.connection.connected)
+
+
+class TestNetworkControllerReconnect(unittest.TestCase):
+    def setUp(self) -> None:
+        """
+        Create a mock controller and a reconnecting controller connected to it
+        """
+        self.mock_controller = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.mock_controller.bind((HOST, 0))
+        self.mock_controller.listen()
+        self.mock_controller.settimeout(5)
+
+        self.controller = NetworkController(
+            2,
+            HOST,
+            self.mock_controller.getsockname()[1],
+            reconnect=True,
+            initial_backoff=BACKOFF,
+            max_backoff=BACKOFF,
+        )
+        self.mock_conn = self.mock_controller.accept()[0]
+        self.mock_conn.settimeout(5)
+
+    def tearDown(self) -> None:
+        """
+        Destroy the controller and close the mock controller
+        """
+        self.controller.destroy()
+        self.mock_conn.close()
+        self.mock_controller.close()
+
+    def receive(self, count: int) -> list:
+        """
+        Read from the mock connection until count frames have been received
+        """
+        data = b""
+        while data.count(b"\n") < count:
+            data += self.mock_conn.recv(1024)
+
+        return [line + b"\n" for line in data.split(b"\n")[:count]]
+
+    def test_restores_state_after_reconnect(self):
+        """
+        Test that the local state, including changes made while down, is sent after reconnecting
+        """
+        self.controller.set_intensity(1, 100)
+        self.controller.set_on(1)
+        self.receive(4 + 1)
+        reset(self.mock_conn)
+
+        # Commands fail while the connection is down, but the local state is still updated
+        with self.assertRaises(ConnectionError):
+            for _ in range(100):
+                self.controller.set_strobe_mode(2, 3)
+                time.sleep(0.001)
+
+        self.mock_conn = self.mock_controller.accept()[0]
+        self.mock_conn.settimeout(5)
+
+        self.assertEqual(
+            self.receive(4),
+            [
+                encode_command("00F100"),
+                encode_command("00S01"),
+                encode_command("01F000"),
+                encode_command("01S03"),
+            ],
+        )
+
+    def test_reconnects_when_reading_responses(self):
+        """
+        Test that a connection closed by the controller is detected by the reader and restored
+        """
+        self.controller.destroy()
+        self.mock_conn.close()
+
+        self.controller = NetworkController(
+            2,
+            HOST,
+            self.mock_controller.getsockname()[1],
+            max_in_flight=2,
+            response_timeout=0.01,
+            reconnect=True,
+            initial_backoff=BACKOFF,
+            max_backoff=BACKOFF,
+            reset=False,
+        )
+        self.mock_conn = self.mock_controller.accept()[0]
+        self.mock_conn.settimeout(5)
+
+        self.controller.set_intensity(1, 100)
+        self.controller.set_on(1)
+        self.assertEqual(self.receive(1), [encode_command("00F100")])
+
+        # The controller closes the connection without any command failing to send
+        self.mock_conn.close()
+        self.mock_conn = self.mock_controller.accept()[0]
+        self.mock_conn.settimeout(5)
+
+        self.assertEqual(
+            self.receive(4),
+            [
+                encode_command("00F100"),
+                encode_command("00S01"),
+                encode_command("01F000"),
+                encode_command("01S01"),
+            ],
+        )
+
+        self.controller.set_strobe_mode(2, 3)
+        self.assertEqual(self.receive(1), [encode_command("01S03")])
@@ -0,0 +1,203 @@
+import array
+import os
+import tempfile
+import time
+import unittest
+
+from src.VSTLight.client import ControllerClient
+from src.VSTLight.daemon import ControllerDaemon
+from src.VSTLight.ipc import REQUEST, Method, pack_value, send_message, unpack_value
+from src.VSTLight.network_controller import NetworkController
+from src.VSTLight.protocol import CommandResult, ResponseStatus, encode_command
+from src.VSTLight.scene import ChannelSetting, Scene
+from src.VSTLight.simulator import Simulator, SimulatorThread
+
+
+class Integral:
+    """
+    Integer type that is not an `int`, like the NumPy integer types
+    """
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    def __index__(self) -> int:
+        return self.value
+
+
+class TestIPC(unittest.TestCase):
+    def test_round_trip(self):
+        """
+        Test that every supported value is decoded to the value encoded
+        """
+        scene = Scene((ChannelSetting(200, True, 3), ChannelSetting(0, False, 1)))
+        result = CommandResult(
+            encode_command("00F200"), ResponseStatus.ACK, 1.5, 1.75, None
+        )
+        value = [None, True, -3, 0.25, "inspection", scene, result, {1: 255, 4: 0}]
+
+        self.assertEqual(
+            unpack_value(pack_value(value)), (value, len(pack_value(value)))
+        )
+
+    def test_integral_values(self):
+        """
+        Test that other integral values and sequences, e.g. of NumPy or `array`, are decoded as ints and lists
+        """
+        value = [Integral(7), array.array("h", [1, -2]), range(3)]
+
+        self.assertEqual(unpack_value(pack_value(value))[0], [7, [1, -2], [0, 1, 2]])
+
+    def test_unsupported_type(self):
+        """
+        Test that encoding an unsupported type raises a ValueError
+        """
+        with self.assertRaises(ValueError):
+            pack_value(object())
+
+
+class TestControllerDaemon(unittest.TestCase):
+    def setUp(self) -> None:
+        """
+        Serve a thread-safe controller connected to a simulated controller on a temporary socket
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "vstlight.sock")
+
+        self.simulator = SimulatorThread(Simulator())
+        self.virtual = self.simulator.start().controllers[0]
+
+        self.lights = NetworkController(
+            4, "127.0.0.1", self.virtual.port, queued=True, thread_safe=True
+        )
+        self.daemon = ControllerDaemon([self.lights], self.path)
+
+    def tearDown(self) -> None:
+        self.daemon.close()
+        self.lights.destroy()
+        self.simulator.stop()
+        self.directory.cleanup()
+
+    def test_commands(self):
+        """
+        Test that the commands of a client are sent to the controller and resolve to their results
+        """
+        with ControllerClient(self.path) as client:
+            proxy = client[0]
+
+            proxy.set_on(2)
+            result = proxy.set_intensity(2, 90).result(timeout=1)
+            results = proxy.set_all_strobe_modes(4).result(timeout=1)
+
+            self.assertEqual(result.frame, encode_command("01F090"))
+            self.assertLessEqual(result.scheduled, result.sent)
+            self.assertEqual(len(results), 4)
+            self.assertEqual(proxy.get_intensity(2), 90)
+            self.assertEqual(proxy.get_strobe_mode(4), 4)
+
+        deadline = time.monotonic() + 1
+        while self.virtual.strobe_modes != [4] * 4 and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+        self.assertEqual(self.virtual.intensities, [0, 90, 0, 0])
+        self.assertEqual(self.virtual.strobe_modes, [4] * 4)
+
+    def test_array_arguments(self):
+        """
+        Test that arrays and integers of other types, e.g. NumPy arrays and integers, are accepted through the daemon
+        """
+        with ControllerClient(self.path) as client:
+            proxy = client[0]
+
+            proxy.set_intensities(array.array("B", [10, 20, 30, 40])).result(timeout=1)
+            proxy.set_strobe_modes([Integral(m) for m in (2, 3, 4, 5)]).result(
+                timeout=1
+            )
+            proxy.set_intensity(1, Integral(50)).result(timeout=1)
+
+            self.assertEqual(proxy.get_intensity(1), 50)
+            self.assertEqual(proxy.get_intensity(3), 30)
+            self.assertEqual(proxy.get_strobe_mode(4), 5)
+
+    def test_pipelined(self):
+        """
+        Test that requests are sent before the replies to earlier requests arrive
+        """
+        with ControllerClient(self.path) as client:
+            proxy = client[0]
+
+            start = time.perf_counter()
+            futures = [proxy.set_strobe_mode(1, i % 10 + 1) for i in range(20)]
+            issued = time.perf_counter() - start
+
+            results = [future.result(timeout=2) for future in futures]
+
+        # The 20 commands take 100ms to send at 5ms each
+        self.assertLess(issued, 0.05)
+        self.assertEqual([r.frame[4:6] for r in results][:3], [b"01", b"02", b"03"])
+
+    def test_shared_between_clients(self):
+        """
+        Test that several clients share a controller, and see the state set by each other
+        """
+        with ControllerClient(self.path) as first, ControllerClient(
+            self.path
+        ) as second:
+            first[0].set_intensity(3, 120)
+            second[0].set_on(3).result(timeout=1)
+
+            self.assertEqual(first[0].get_intensity(3), 120)
+            self.assertTrue(second[0].capture_scene().channels[2].state)
+            self.assertTrue(first[0].wait_settled(time.perf_counter() + 1))
+
+    def test_errors(self):
+        """
+        Test that errors raised by the controller are raised by the client
+        """
+        with ControllerClient(self.path) as client:
+            with self.assertRaises(ValueError):
+                client[0].set_intensity(5, 10).result(timeout=1)
+
+            with self.assertRaises(ValueError):
+                client[0].apply_scene("missing").result(timeout=1)
+
+            with self.assertRaises(ValueError):
+                client[1].set_on(1).result(timeout=1)
+
+    def test_scenes(self):
+        """
+        Test that scenes are stored in the daemon and applied through the client
+        """
+        scene = Scene(tuple(ChannelSetting(50 * i, True, i + 1) for i in range(4)))
+
+        with ControllerClient(self.path) as client:
+            proxy = client[0]
+
+            self.assertEqual(proxy.save_scene("ramp", scene), scene)
+            proxy.apply_scene("ramp").result(timeout=1)
+
+            self.assertEqual(proxy.capture_scene(), scene)
+            proxy.delete_scene("ramp")
+            self.assertEqual(self.lights.scenes, {})
+
+    def test_unmatched_reply(self):
+        """
+        Test that a reply to an unknown request is ignored, and later replies are still matched
+        """
+        with ControllerClient(self.path) as client:
+            sock = client._ControllerClient__sock
+            send_message(
+                sock,
+                REQUEST.pack(0xFFFFFFFF, Method.GET_INTENSITY.value, 0)
+                + pack_value([1]),
+            )
+
+            future = client.request(0, Method.GET_INTENSITY, 1)
+            self.assertEqual(future.result(timeout=1), 0)
+
+    def test_unreachable(self):
+        """
+        Test that connecting without a daemon raises a ConnectionError
+        """
+        with self.assertRaises(ConnectionError):
+            ControllerClient(os.path.join(self.directory.name, "missing.sock"))
@@ -0,0 +1,90 @@
+import math
+import unittest
+
+from src.VSTLight.fade import plan_ramp
+
+# Command interval used by the tests, matching the limit of the VLP controllers
+INTERVAL = 0.005
+
+
+class TestPlanRamp(unittest.TestCase):
+    def test_single_channel(self):
+        """
+        Test that a single channel fade ends on its target within the duration
+        """
+        steps = plan_ramp({0: 0}, {0: 100}, 0.1, INTERVAL)
+
+        self.assertEqual(steps[-1].value, 100)
+        self.assertLessEqual(steps[-1].offset, 0.1)
+        self.assertEqual(len(steps), 20)
+
+    def test_linear_values(self):
+        """
+        Test that every step before the last turn of a channel sets the value due at the end of its slot
+        """
+        steps = plan_ramp({0: 0, 1: 0}, {0: 200, 1: 200}, 0.1, INTERVAL)
+
+        for step in steps[:-2]:
+            due = 200 * (step.offset + INTERVAL) / 0.1
+            self.assertEqual(step.value, round(due))
+
+        self.assertEqual([step.value for step in steps[:4]], [10, 20, 30, 40])
+        self.assertEqual(
+            [(s.channel_idx, s.value) for s in steps[-2:]], [(0, 200), (1, 200)]
+        )
+
+    def test_monotonic_values(self):
+        """
+        Test that the values of a fade only move towards the target
+        """
+        steps = plan_ramp({0: 200}, {0: 50}, 0.2, INTERVAL)
+        values = [step.value for step in steps]
+
+        self.assertEqual(values, sorted(values, reverse=True))
+        self.assertEqual(values[-1], 50)
+
+    def test_channels_interleaved(self):
+        """
+        Test that channels take turns and never share a slot
+        """
+        steps = plan_ramp({0: 0, 1: 0}, {0: 255, 1: 255}, 0.1, INTERVAL)
+        offsets = [step.offset for step in steps]
+
+        self.assertEqual(len(set(offsets)), len(offsets))
+        self.assertEqual(
+            [step.channel_idx for step in steps[:4]],
+            [0, 1, 0, 1],
+        )
+        self.assertEqual(
+            {step.channel_idx: step.value for step in steps},
+            {0: 255, 1: 255},
+        )
+
+    def test_no_repeated_values(self):
+        """
+        Test that steps not changing the intensity are left out
+        """
+        steps = plan_ramp({0: 0}, {0: 3}, 0.1, INTERVAL)
+
+        self.assertEqual([step.value for step in steps], [1, 2, 3])
+
+    def test_short_fade(self):
+        """
+        Test that every channel reaches its target when the fade is shorter than one round
+        """
+        steps = plan_ramp({0: 0, 1: 0, 2: 0}, {0: 10, 1: 20, 2: 30}, INTERVAL, INTERVAL)
+
+        self.assertEqual([step.value for step in steps], [10, 20, 30])
+        self.assertTrue(all(step.offset <= INTERVAL for step in steps))
+
+    def test_next_offsets(self):
+        """
+        Test that every step is linked to the next step of its channel
+        """
+        steps = plan_ramp({0: 0, 1: 0}, {0: 100, 1: 100}, 0.1, INTERVAL)
+
+        for i, step in enumerate(steps):
+            later = [
+                s.offset for s in steps[i + 1 :] if s.channel_idx == step.channel_idx
+            ]
+            self.assertEqual(step.next_offset, later[0] if later else math.inf)
@@ -0,0 +1,221 @@
+import select
+import socket
+import time
+import unittest
+
+from src.VSTLight.fleet import ControllerFleet
+from src.VSTLight.network_controller import NetworkController
+
+# Define the localhost and ports for the dummy light controllers of the fleet
+HOST = "127.0.0.1"
+PORTS = [6100, 6101, 6102]
+
+
+class TestControllerFleet(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Runs once before all tests in class.
+
+        Operations:
+        ----------
+        - Creates a mock controller for each port by opening a socket on localhost
+        - Initializes a NetworkController object for each mock controller and accepts its connection
+        - Creates a fleet of the controllers named 'a', 'b' and 'c'
+        """
+        cls.mock_controllers = []
+        cls.mock_conns = []
+        controllers = {}
+
+        for name, port in zip("abc", PORTS):
+            mock_controller = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            mock_controller.bind((HOST, port))
+            mock_controller.listen()
+
+            controllers[name] = NetworkController(4, HOST, port)
+
+            mock_conn, _ = mock_controller.accept()
+            cls.mock_controllers.append(mock_controller)
+            cls.mock_conns.append(mock_conn)
+
+        cls.fleet = ControllerFleet(controllers)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Runs once after all tests have been completed.
+        - Destroy the fleet
+        - Close the mock connections and mock controller sockets
+        """
+        cls.fleet.destroy()
+
+        for mock_conn, mock_controller in zip(cls.mock_conns, cls.mock_controllers):
+            mock_conn.close()
+            mock_controller.close()
+
+    def setUp(self) -> None:
+        """
+        Clear the input buffers of the mock connections before each test
+        """
+        for mock_conn in self.mock_conns:
+            while select.select([mock_conn], [], [], 0.001)[0]:
+                mock_conn.recv(1024)
+
+    def receive(self, idx: int) -> list:
+        """
+        Return all frames received by a mock connection within 10ms
+        """
+        data = b""
+        while select.select([self.mock_conns[idx]], [], [], 0.01)[0]:
+            data += self.mock_conns[idx].recv(1024)
+
+        return data.decode(encoding="ascii").split("\r\n")[:-1]
+
+    def test_get_controller(self):
+        """
+        Test that controllers can be looked up by name
+        """
+        self.assertIsInstance(self.fleet["b"], NetworkController)
+        self.assertEqual(len(self.fleet), 3)
+
+    def test_unknown_controller(self):
+        """
+        Test that addressing an unknown controller raises a ValueError before anything is sent
+        """
+        with self.assertRaises(ValueError):
+            self.fleet.set_off([("a", 1), ("d", 1)])
+
+        self.assertEqual(self.receive(0), [])
+
+    def test_invalid_channel(self):
+        """
+        Test that addressing a channel a controller does not have raises a ValueError before anything is sent
+        """
+        for channel_id in (0, 5):
+            with self.assertRaises(ValueError):
+                self.fleet.set_strobe_modes({("a", 1): 2, ("b", channel_id): 2})
+
+        self.assertEqual(self.receive(0), [])
+
+    def test_commands_grouped_per_controller(self):
+        """
+        Test that each controller receives its own commands in order
+        """
+        self.fleet.set_strobe_modes({("a", 1): 2, ("c", 3): 4, ("a", 2): 5})
+
+        self.assertEqual([f[1:6] for f in self.receive(0)], ["00S02", "01S05"])
+        self.assertEqual(self.receive(1), [])
+        self.assertEqual([f[1:6] for f in self.receive(2)], ["02S04"])
+
+    def test_intensities(self):
+        """
+        Test that intensities are set on the addressed channels
+        """
+        self.fleet.set_on([("b", 4)])
+        self.fleet.set_intensities({("b", 4): 200})
+
+        self.assertEqual(self.fleet["b"].get_intensity(4), 200)
+        self.assertEqual(self.receive(1)[-1][1:7], "03F200")
+
+    def test_apply_scene(self):
+        """
+        Test that a scene stored on every controller is applied to all of them
+        """
+        self.fleet.set_all_off()
+        for name in "abc":
+            self.fleet[name].save_scene("dark")
+
+        self.fleet.set_on([("a", 1), ("c", 1)])
+        self.fleet.set_intensities({("a", 1): 100, ("c", 1): 100})
+        for idx in range(3):
+            self.receive(idx)
+
+        self.fleet.apply_scene("dark")
+
+        self.assertEqual([f[1:7] for f in self.receive(0)], ["00F000"])
+        self.assertEqual(self.receive(1), [])
+        self.assertEqual([f[1:7] for f in self.receive(2)], ["00F000"])
+
+    def test_controllers_run_concurrently(self):
+        """
+        Test that updating all channels of the fleet takes about as long as updating one controller
+        """
+        time.sleep(0.01)
+
+        start = time.monotonic()
+        self.fleet.set_all_strobe_modes(3)
+        elapsed = time.monotonic() - start
+
+        # Sequentially, 12 commands would take at least 55ms
+        self.assertLess(elapsed, 0.045)
+
+        for idx in range(3):
+            self.assertEqual(len(self.receive(idx)), 4)
+
+    def test_ramp(self):
+        """
+        Test that a ramp over several controllers runs concurrently and reaches the targets
+        """
+        self.fleet.set_on([("a", 2), ("c", 2)])
+        self.receive(0)
+        self.receive(2)
+
+        start = time.monotonic()
+        self.fleet.ramp({("a", 2): 80, ("c", 2): 40}, 0.05)
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 0.09)
+        self.assertEqual(self.fleet["a"].get_intensity(2), 80)
+        self.assertEqual(self.receive(2)[-1][1:7], "01F040")
+
+
+class TestQueuedControllerFleet(unittest.TestCase):
+    def setUp(self) -> None:
+        """
+        Create two mock controllers on free ports chosen by the OS and a fleet of queued controllers connected to them
+        """
+        self.mock_controllers = []
+        self.mock_conns = []
+        controllers = []
+
+        for _ in range(2):
+            mock_controller = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            mock_controller.bind((HOST, 0))
+            mock_controller.listen()
+
+            controllers.append(
+                NetworkController(
+                    4,
+                    HOST,
+                    mock_controller.getsockname()[1],
+                    queued=True,
+                    reset=False,
+                )
+            )
+
+            self.mock_conns.append(mock_controller.accept()[0])
+            self.mock_controllers.append(mock_controller)
+
+        self.fleet = ControllerFleet(controllers)
+
+    def tearDown(self) -> None:
+        """
+        Destroy the fleet and close the mock controllers
+        """
+        self.fleet.destroy()
+
+        for mock_conn, mock_controller in zip(self.mock_conns, self.mock_controllers):
+            mock_conn.close()
+            mock_controller.close()
+
+    def test_waits_until_sent(self):
+        """
+        Test that fleet calls return once the queued commands have been sent, not once they are queued
+        """
+        start = time.monotonic()
+        self.fleet.set_all_strobe_modes(3)
+
+        # 4 commands per controller are spaced by at least 15ms
+        self.assertGreaterEqual(time.monotonic() - start, 0.015)
+        for idx in range(2):
+            self.assertTrue(self.fleet[idx].wait_settled(time.perf_counter()))
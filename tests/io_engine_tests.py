@@ -0,0 +1,257 @@
+import socket
+import threading
+import time
+import unittest
+from concurrent.futures import Future
+
+from src.VSTLight.command_queue import Priority
+from src.VSTLight.io_engine import IOEngine
+from src.VSTLight.network_controller import NetworkController
+from src.VSTLight.protocol import encode_command
+
+# Define the localhost and number of dummy light controllers. The mock controllers bind to free
+# ports chosen by the OS, as some tests close connections from the controller side, leaving the
+# controller ports in TIME_WAIT
+HOST = "127.0.0.1"
+CONTROLLERS = 20
+
+
+class TestIOEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Runs once before all tests in class.
+
+        Operations:
+        ----------
+        - Creates the mock controllers by opening sockets on localhost
+        """
+        cls.mock_controllers = []
+
+        for _ in range(CONTROLLERS):
+            mock_controller = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            mock_controller.bind((HOST, 0))
+            mock_controller.listen()
+            cls.mock_controllers.append(mock_controller)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Runs once after all tests have been completed.
+        - Close the mock controller sockets
+        """
+        for mock_controller in cls.mock_controllers:
+            mock_controller.close()
+
+    def setUp(self) -> None:
+        """
+        Start an engine and attach a connected socket for every mock controller
+        """
+        self.engine = IOEngine()
+        self.connections = []
+        self.mock_conns = []
+
+        for mock_controller in self.mock_controllers:
+            sock = socket.create_connection(mock_controller.getsockname())
+            self.connections.append(self.engine.attach(sock))
+            self.mock_conns.append(mock_controller.accept()[0])
+
+    def tearDown(self) -> None:
+        """
+        Stop the engine and close the mock connections
+        """
+        self.engine.shutdown()
+
+        for mock_conn in self.mock_conns:
+            mock_conn.close()
+
+    def receive(self, idx: int, count: int) -> list:
+        """
+        Read from a mock connection until count frames have been received
+        """
+        data = b""
+        while data.count(b"\n") < count:
+            data += self.mock_conns[idx].recv(1024)
+
+        return data.split(b"\n")[:count]
+
+    def test_frames_in_order(self):
+        """
+        Test that frames sent on a connection arrive in order
+        """
+        futures = [self.connections[0].put(f"{i}\n".encode()) for i in range(5)]
+
+        for i, future in enumerate(futures):
+            self.assertEqual(future.result(timeout=1).frame, f"{i}\n".encode())
+
+        self.assertEqual(self.receive(0, 5), [b"0", b"1", b"2", b"3", b"4"])
+
+    def test_frames_spaced(self):
+        """
+        Test that frames on the same connection are spaced by at least 5ms
+        """
+        start = time.monotonic()
+        futures = [self.connections[0].put(b"x\n") for _ in range(5)]
+        futures[-1].result(timeout=1)
+
+        self.assertGreaterEqual(time.monotonic() - start, 4 * 0.005)
+
+    def test_connections_run_in_parallel(self):
+        """
+        Test that many connections are served at the same time from a single thread
+        """
+        threads = threading.active_count()
+
+        start = time.monotonic()
+        futures = [c.put(b"x\n") for c in self.connections for _ in range(5)]
+        for future in futures:
+            future.result(timeout=1)
+        elapsed = time.monotonic() - start
+
+        # Sequentially, 100 frames would take at least 495ms
+        self.assertLess(elapsed, 0.1)
+        self.assertEqual(threading.active_count(), threads)
+
+        for idx in range(len(self.connections)):
+            self.assertEqual(len(self.receive(idx, 5)), 5)
+
+    def test_close_flushes_pending(self):
+        """
+        Test that closing a connection sends the frames still waiting before closing the socket
+        """
+        for i in range(3):
+            self.connections[1].put(f"{i}\n".encode())
+
+        self.connections[1].close()
+
+        self.assertEqual(self.receive(1, 3), [b"0", b"1", b"2"])
+        self.assertEqual(self.mock_conns[1].recv(1024), b"")
+
+        with self.assertRaises(RuntimeError):
+            self.connections[1].put(b"x\n")
+
+    def test_controller_closed_connection(self):
+        """
+        Test that a connection closed by the controller is closed by the engine and accepts no more frames
+        """
+        self.mock_conns[2].close()
+
+        self.assertTrue(self.connections[2].closed.wait(1))
+
+        with self.assertRaises(RuntimeError):
+            self.connections[2].put(b"x\n")
+
+    def test_critical_frames_first(self):
+        """
+        Test that critical frames are sent before the other waiting frames, in order
+        """
+        futures = [self.connections[0].put(f"{i}\n".encode()) for i in range(4)]
+        futures.append(self.connections[0].put(b"c1\n", priority=Priority.CRITICAL))
+        futures.append(self.connections[0].put(b"c2\n", priority=Priority.CRITICAL))
+
+        for future in futures:
+            future.result(timeout=1)
+
+        frames = self.receive(0, 6)
+        self.assertLess(frames.index(b"c1"), frames.index(b"c2"))
+        self.assertLess(frames.index(b"c2"), frames.index(b"3"))
+
+    def test_critical_cancels_stale_frames(self):
+        """
+        Test that a critical frame cancels the waiting frames with the same key
+        """
+        self.connections[0].put(b"0\n").result(timeout=1)
+
+        # Frames are spaced by 5ms, so these are still waiting when the critical frame is added
+        stale = [
+            self.connections[0].put(b"A1\n", "A"),
+            self.connections[0].put(b"A2\n", "A"),
+        ]
+        other = self.connections[0].put(b"B1\n", "B")
+        self.connections[0].put(b"A3\n", "A", Priority.CRITICAL)
+
+        self.assertTrue(all(future.cancelled() for future in stale))
+        other.result(timeout=1)
+
+        self.assertEqual(self.receive(0, 3), [b"0", b"A3", b"B1"])
+
+
+class TestNetworkControllerEngine(unittest.TestCase):
+    def test_network_controller_with_engine(self):
+        """
+        Test that a NetworkController using an engine returns futures and sends its commands
+        """
+        mock_controller = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        mock_controller.bind((HOST, 0))
+        mock_controller.listen()
+
+        engine = IOEngine()
+        port = mock_controller.getsockname()[1]
+        controller = NetworkController(4, HOST, port, engine=engine)
+        mock_conn, _ = mock_controller.accept()
+
+        future = controller.set_strobe_mode(2, 7)
+        self.assertIsInstance(future, Future)
+        future.result(timeout=1)
+
+        data = b""
+        while b"01S07" not in data:
+            data += mock_conn.recv(1024)
+
+        controller.destroy()
+        engine.shutdown()
+
+        mock_conn.close()
+        mock_controller.close()
+
+    def test_off_cancels_waiting_intensities(self):
+        """
+        Test that turning a channel off cancels its waiting intensity commands, which would turn it back on
+        """
+        mock_controller = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        mock_controller.bind((HOST, 0))
+        mock_controller.listen()
+
+        engine = IOEngine()
+        port = mock_controller.getsockname()[1]
+        controller = NetworkController(1, HOST, port, engine=engine)
+        mock_conn, _ = mock_controller.accept()
+
+        # The reset frames are still waiting, so none of these have been sent yet
+        controller.set_intensity(1, 10)
+        stale = [controller.set_on(1), controller.set_intensity(1, 200)]
+        controller.set_off(1).result(timeout=1)
+
+        self.assertTrue(all(future.cancelled() for future in stale))
+
+        controller.destroy()
+        engine.shutdown()
+
+        data = b""
+        while True:
+            chunk = mock_conn.recv(1024)
+            if not chunk:
+                break
+            data += chunk
+
+        # Reset, off and the off sent when destroying the controller
+        self.assertEqual(
+            data,
+            encode_command("00F000")
+            + encode_command("00S01")
+            + encode_command("00F000") * 2,
+        )
+
+        mock_conn.close()
+        mock_controller.close()
+
+    def test_engine_excludes_queued_mode(self):
+        """
+        Test that a NetworkController cannot use both an engine and queued mode
+        """
+        engine = IOEngine()
+
+        with self.assertRaises(ValueError):
+            NetworkController(4, HOST, 1000, queued=True, engine=engine)
+
+        engine.shutdown()
@@ -0,0 +1,72 @@
+import math
+import unittest
+
+from src.VSTLight.metrics import CommandTiming, Metrics, Stage
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.metrics = Metrics(labels={"controller": "lab"})
+
+    def test_histogram_buckets(self):
+        """
+        Test that observations are counted in cumulative buckets
+        """
+        self.metrics.observe(Stage.LIMITER, 0.003)
+        self.metrics.observe(Stage.LIMITER, 0.005)
+        self.metrics.observe(Stage.LIMITER, 1.0)
+
+        histogram = self.metrics.histogram(Stage.LIMITER)
+        buckets = dict(histogram.buckets)
+
+        self.assertEqual(buckets[2.5e-3], 0)
+        self.assertEqual(buckets[5e-3], 2)
+        self.assertEqual(buckets[0.5], 2)
+        self.assertEqual(buckets[math.inf], 3)
+        self.assertEqual(histogram.samples, 3)
+        self.assertAlmostEqual(histogram.total, 1.008)
+        self.assertEqual(self.metrics.histogram(Stage.SEND).samples, 0)
+
+    def test_record_calls_hooks(self):
+        """
+        Test that recording a command fills the histograms of its stages and calls the hooks
+        """
+        timings = []
+        self.metrics.add_hook(timings.append)
+
+        timing = CommandTiming(b"@00F12588\r\n", None, 0.0, 0.004, 0.00002)
+        self.metrics.record(timing)
+
+        self.metrics.remove_hook(timings.append)
+        self.metrics.record(timing)
+
+        self.assertEqual(timings, [timing])
+        self.assertEqual(self.metrics.histogram(Stage.VALIDATION).samples, 0)
+        self.assertEqual(self.metrics.histogram(Stage.SEND).samples, 2)
+
+    def test_prometheus(self):
+        """
+        Test the Prometheus text format of the counters and histograms
+        """
+        self.metrics.count_sent()
+        self.metrics.count_sent()
+        self.metrics.count_suppressed()
+        self.metrics.observe(Stage.SEND, 0.00002)
+
+        lines = self.metrics.prometheus().splitlines()
+
+        self.assertIn("# TYPE vstlight_commands_sent_total counter", lines)
+        self.assertIn('vstlight_commands_sent_total{controller="lab"} 2', lines)
+        self.assertIn('vstlight_commands_suppressed_total{controller="lab"} 1', lines)
+        self.assertIn(
+            'vstlight_command_stage_seconds_bucket{controller="lab",stage="send",le="5e-05"} 1',
+            lines,
+        )
+        self.assertIn(
+            'vstlight_command_stage_seconds_bucket{controller="lab",stage="send",le="+Inf"} 1',
+            lines,
+        )
+        self.assertIn(
+            'vstlight_command_stage_seconds_count{controller="lab",stage="lock"} 0',
+            lines,
+        )
@@ -0,0 +1,191 @@
+import subprocess
+import sys
+import threading
+import unittest
+
+from src.VSTLight.channel import ChannelBank
+from src.VSTLight.mirror import StateMirror
+from src.VSTLight.network_controller import NetworkController
+from src.VSTLight.scene import ChannelSetting, Scene
+from src.VSTLight.simulator import Simulator, SimulatorThread
+
+
+class TestStateMirror(unittest.TestCase):
+    def setUp(self) -> None:
+        """
+        Create a mirror of a 4 channel controller and attach a reader to it
+        """
+        self.mirror = StateMirror(4)
+        self.reader = StateMirror.attach(self.mirror.name)
+
+    def tearDown(self) -> None:
+        self.reader.close()
+        self.mirror.close()
+
+    def test_defaults(self):
+        """
+        Test that a new mirror holds channels that are off with intensity 0 and strobe mode 1
+        """
+        self.assertEqual(self.reader.channels, 4)
+        self.assertEqual(self.reader.read(), Scene((ChannelSetting(0, False, 1),) * 4))
+
+    def test_publish(self):
+        """
+        Test that published channel states are read by the attached reader
+        """
+        bank = ChannelBank(4)
+        bank[1].intensity = 180
+        bank[1].on()
+        bank[3].strobe_mode = 7
+
+        self.mirror.publish(bank.pack(0, 4))
+
+        self.assertEqual(self.reader.get_intensity(2), 180)
+        self.assertTrue(self.reader.get_state(2))
+        self.assertFalse(self.reader.get_state(1))
+        self.assertEqual(self.reader.get_strobe_mode(4), 7)
+
+    def test_consistent_reads(self):
+        """
+        Test that readers never see an update that is partially written
+        """
+        stop = threading.Event()
+
+        def write() -> None:
+            bank = ChannelBank(4)
+            value = 0
+            while not stop.is_set():
+                value = (value + 1) % 256
+                bank.set_intensities(0, [value] * 4)
+                self.mirror.publish(bank.pack(0, 4))
+
+        writer = threading.Thread(target=write)
+        writer.start()
+
+        try:
+            for _ in range(20000):
+                intensities = {s.intensity for s in self.reader.read().channels}
+                self.assertEqual(len(intensities), 1)
+        finally:
+            stop.set()
+            writer.join()
+
+    def test_invalid_channel_id(self):
+        """
+        Test that reading a channel outside the mirrored channels raises a ValueError
+        """
+        for channel_id in (0, 5):
+            with self.assertRaises(ValueError):
+                self.reader.get_intensity(channel_id)
+
+            with self.assertRaises(ValueError):
+                self.reader.get_strobe_mode(channel_id)
+
+            with self.assertRaises(ValueError):
+                self.reader.get_state(channel_id)
+
+    def test_reader_cannot_publish(self):
+        """
+        Test that publishing from an attached reader raises a RuntimeError
+        """
+        with self.assertRaises(RuntimeError):
+            self.reader.publish(ChannelBank(4).pack(0, 4))
+
+    def test_publish_wrong_size(self):
+        """
+        Test that publishing the state of a different number of channels raises a ValueError
+        """
+        with self.assertRaises(ValueError):
+            self.mirror.publish(ChannelBank(2).pack(0, 2))
+
+    def test_invalid_channels(self):
+        """
+        Test that a mirror with an invalid number of channels raises a ValueError
+        """
+        with self.assertRaises(ValueError):
+            StateMirror(5)
+
+
+class TestNetworkControllerMirror(unittest.TestCase):
+    def setUp(self) -> None:
+        """
+        Start a simulated controller and a mirror of its channel state
+        """
+        self.simulator = SimulatorThread(Simulator())
+        self.virtual = self.simulator.start().controllers[0]
+        self.mirror = StateMirror(4)
+
+    def tearDown(self) -> None:
+        self.mirror.close()
+        self.simulator.stop()
+
+    def test_published(self):
+        """
+        Test that the controller publishes its state to the mirror with every change
+        """
+        lights = NetworkController(
+            4, "127.0.0.1", self.virtual.port, mirror=self.mirror
+        )
+
+        # Setting the intensity of a channel that is off sends no command
+        lights.set_intensity(1, 120)
+        self.assertEqual(self.mirror.get_intensity(1), 120)
+
+        lights.set_on(1)
+        lights.set_strobe_mode(3, 5)
+        self.assertEqual(self.mirror.read(), lights.capture_scene())
+
+        lights.destroy()
+
+    def test_scenes_published(self):
+        """
+        Test that scenes changing the local state without sending a frame are published
+        """
+        lights = NetworkController(
+            4, "127.0.0.1", self.virtual.port, mirror=self.mirror
+        )
+
+        dim = Scene(
+            (ChannelSetting(200, False, 1),) + (ChannelSetting(0, False, 1),) * 3
+        )
+        lights.apply_scene(dim)
+        self.assertEqual(self.mirror.get_intensity(1), 200)
+
+        dimmer = Scene((ChannelSetting(50, False, 1),) + dim.channels[1:])
+        lights.capture_sequence([dimmer], lambda step: None)
+        self.assertEqual(self.mirror.read(), dimmer)
+
+        lights.destroy()
+
+    def test_other_process(self):
+        """
+        Test that another process attaching by name reads the state of the controller
+        """
+        lights = NetworkController(
+            4, "127.0.0.1", self.virtual.port, queued=True, mirror=self.mirror
+        )
+        lights.set_on(2)
+        lights.set_intensity(2, 77)
+
+        code = (
+            "from src.VSTLight.mirror import StateMirror; "
+            f"mirror = StateMirror.attach({self.mirror.name!r}); "
+            "print(mirror.get_intensity(2), mirror.get_state(2)); "
+            "mirror.close()"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        self.assertEqual(output.stdout.split(), ["77", "True"])
+        self.assertEqual(output.stderr, "")
+
+        lights.destroy()
+
+    def test_mismatched_channels(self):
+        """
+        Test that a mirror with a different number of channels raises a ValueError
+        """
+        with StateMirror(2) as mirror:
+            with self.assertRaises(ValueError):
+                NetworkController(4, "127.0.0.1", self.virtual.port, mirror=mirror)
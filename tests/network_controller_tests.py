@@ -1,15 +1,28 @@
 import unittest
+import random
 import socket
 import select
+import threading
 import time
+from concurrent.futures import Future
 
+from src.VSTLight.channel import ChannelBank
+from src.VSTLight.metrics import Metrics, Stage
 from src.VSTLight.network_controller import NetworkController
+from src.VSTLight.scene import ChannelSetting, Scene
+from src.VSTLight.protocol import NO_COMMAND, ResponseStatus, encode_command
+from src.VSTLight.rate_limiter import RateLimiter
+from src.VSTLight.simulator import Simulator, SimulatorThread
 
-# Define the localhost and ports for the dummy light controller. Two different ports are used to
-# ensure that the two test classes do not interfere with each other by trying to bind to the same port.
+# Define the localhost and ports for the dummy light controller. Different ports are used to
+# ensure that the test classes do not interfere with each other by trying to bind to the same port.
 HOST = "127.0.0.1"
 PORT_A = 6070
 PORT_B = 6080
+PORT_C = 6081
+PORT_D = 6082
+PORT_E = 6083
+PORT_F = 6084
 
 # Define the wait time for the socket to receive data
 WAIT_TIME = 0.0001
@@ -70,6 +83,13 @@ class TestNetworkControllerInitialization(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.controller = NetworkController(4, HOST, -1)
 
+    def test_network_controller_initialization_with_coalesce_without_queue(self):
+        """
+        Test that the NetworkController object cannot be initialized with coalescing outside queued mode
+        """
+        with self.assertRaises(ValueError):
+            self.controller = NetworkController(4, HOST, PORT_A, coalesce=True)
+
     def test_network_controller_destruction(self):
         """
         Test that the NetworkController object can be destroyed
@@ -143,7 +163,7 @@ class TestNetworkControllerFunctions(unittest.TestCase):
         Test that the set_intensity method changes the local intensity of a channel
         """
         self.controller.set_intensity(1, 255)
-        self.assertEqual(self.controller._NetworkController__channels[0].intensity, 255)
+        self.assertEqual(self.controller._NetworkController__bank[0].intensity, 255)
 
     def test_set_intensity_remote(self):
         """
@@ -156,12 +176,25 @@ class TestNetworkControllerFunctions(unittest.TestCase):
 
         self.assertEqual(cmd[1:7], "03F255")
 
+    def test_result_times(self):
+        """
+        Test that a command sent directly returns a completed result with its scheduled and send times
+        """
+        self.controller.set_on(3)
+        result = self.controller.set_intensity(3, 40).result(timeout=0)
+
+        self.assertEqual(result.frame[1:7], b"02F040")
+        self.assertIsNone(result.acked)
+        self.assertLessEqual(result.scheduled, result.sent)
+        self.assertEqual(result.settled, result.sent)
+        self.assertTrue(self.controller.wait_settled(time.perf_counter()))
+
     def test_set_on_local(self):
         """
         Test that the set_on method changes the local state of a channel
         """
         self.controller.set_on(1)
-        self.assertTrue(self.controller._NetworkController__channels[0].state)
+        self.assertTrue(self.controller._NetworkController__bank[0].state)
 
     def test_set_on_remote(self):
         """
@@ -181,7 +214,7 @@ class TestNetworkControllerFunctions(unittest.TestCase):
         """
         self.controller.set_off(3)
 
-        self.assertFalse(self.controller._NetworkController__channels[2].state)
+        self.assertFalse(self.controller._NetworkController__bank[2].state)
 
     def test_set_off_remote(self):
         """
@@ -206,7 +239,7 @@ class TestNetworkControllerFunctions(unittest.TestCase):
         Test that the set_strobe_mode method changes the local strobe mode of a channel
         """
         self.controller.set_strobe_mode(1, 5)
-        self.assertEqual(self.controller._NetworkController__channels[0].strobe_mode, 5)
+        self.assertEqual(self.controller._NetworkController__bank[0].strobe_mode, 5)
 
     def test_set_strobe_mode_remote(self):
         """
@@ -225,3 +258,981 @@ class TestNetworkControllerFunctions(unittest.TestCase):
         self.controller.set_strobe_mode(1, 5)
 
         self.assertEqual(self.controller.get_strobe_mode(1), 5)
+
+
+class TestNetworkControllerQueued(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Runs once before all tests in class.
+
+        Operations:
+        ----------
+        - Creates a mock controller by opening a socket on localhost
+        - Initializes a NetworkController object in queued mode
+        - Accepts the incoming connection from the NetworkController
+        - Waits for the initialization commands and clears the input buffer of the mock connection
+        """
+        cls.mock_controller = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        cls.mock_controller.bind((HOST, PORT_C))
+        cls.mock_controller.listen()
+
+        cls.controller = NetworkController(4, HOST, PORT_C, queued=True)
+
+        cls.mock_conn, _ = cls.mock_controller.accept()
+
+        # 8 initialization commands and 4 off commands
+        cls.controller.set_all_off()[-1].result()
+
+        data = b""
+        while data.count(b"\r\n") < 12:
+            data += cls.mock_conn.recv(1024)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Runs once after all tests have been completed.
+        - Destroy the NetworkController object
+        - Close the mock connection
+        - Close the mock controller socket
+        """
+        cls.controller.destroy()
+
+        cls.mock_conn.close()
+        cls.mock_controller.close()
+
+    def receive_frames(self, count: int) -> list:
+        """
+        Read from the mock connection until count frames have been received
+        """
+        data = b""
+        while data.count(b"\r\n") < count:
+            data += self.mock_conn.recv(1024)
+
+        return data.decode(encoding="ascii").split("\r\n")[:count]
+
+    def test_returns_future(self):
+        """
+        Test that methods return a future completing once the command has been sent
+        """
+        future = self.controller.set_off(1)
+
+        self.assertIsInstance(future, Future)
+        self.assertEqual(future.result(timeout=1).frame, b"@00F00076\r\n")
+        self.assertEqual(self.receive_frames(1)[0][1:7], "00F000")
+
+    def test_non_blocking(self):
+        """
+        Test that updating all channels returns immediately instead of waiting 5ms per command
+        """
+        start = time.monotonic()
+        futures = self.controller.set_all_strobe_modes(3)
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 0.005)
+        self.assertEqual(len(futures), 4)
+
+        for future in futures:
+            future.result(timeout=1)
+
+        frames = self.receive_frames(4)
+        self.assertEqual(
+            [frame[1:6] for frame in frames], ["00S03", "01S03", "02S03", "03S03"]
+        )
+
+    def test_local_state_updated_immediately(self):
+        """
+        Test that the local channel state is updated before the command has been sent
+        """
+        self.controller.set_intensity(3, 42)
+        future = self.controller.set_on(3)
+
+        self.assertTrue(self.controller._NetworkController__bank[2].state)
+        self.assertEqual(self.controller.get_intensity(3), 42)
+
+        future.result(timeout=1)
+        self.assertEqual(self.receive_frames(1)[0][1:7], "02F042")
+
+    def test_no_command_future(self):
+        """
+        Test that a call not sending any command returns a completed future
+        """
+        self.controller.set_off(2).result(timeout=1)
+        self.receive_frames(1)
+
+        future = self.controller.set_intensity(2, 10)
+
+        self.assertTrue(future.done())
+
+    def test_wait_settled(self):
+        """
+        Test that wait_settled waits for all queued commands to be sent, or times out at the deadline
+        """
+        futures = self.controller.set_all_strobe_modes(3)
+
+        self.assertFalse(self.controller.wait_settled(time.perf_counter()))
+        self.assertTrue(self.controller.wait_settled(time.perf_counter() + 1))
+        self.assertTrue(all(future.done() for future in futures))
+        self.receive_frames(len(futures))
+
+    def test_off_preempts_bulk_commands(self):
+        """
+        Test that off commands are sent before waiting strobe mode changes
+        """
+        for mode in (2, 3, 4):
+            self.controller.set_all_strobe_modes(mode)
+
+        futures = self.controller.set_all_off()
+        for future in futures:
+            future.result(timeout=1)
+
+        frames = self.receive_frames(16)
+        off = [i for i, frame in enumerate(frames) if frame[3:7] == "F000"]
+
+        self.assertEqual(len(off), 4)
+        self.assertLess(max(off), 6)
+
+
+class TestNetworkControllerCoalesce(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Runs once before all tests in class.
+
+        Operations:
+        ----------
+        - Creates a mock controller by opening a socket on localhost
+        - Initializes a NetworkController object in queued mode with coalescing
+        - Accepts the incoming connection from the NetworkController
+        - Waits for the initialization commands and clears the input buffer of the mock connection
+        """
+        cls.mock_controller = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        cls.mock_controller.bind((HOST, PORT_D))
+        cls.mock_controller.listen()
+
+        cls.controller = NetworkController(4, HOST, PORT_D, queued=True, coalesce=True)
+
+        cls.mock_conn, _ = cls.mock_controller.accept()
+
+        # Coalescing leaves one intensity and one strobe command per channel
+        cls.controller.set_strobe_mode(4, 1).result()
+
+        data = b""
+        while data.count(b"\r\n") < 8:
+            data += cls.mock_conn.recv(1024)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Runs once after all tests have been completed.
+        - Destroy the NetworkController object
+        - Close the mock connection
+        - Close the mock controller socket
+        """
+        cls.controller.destroy()
+
+        cls.mock_conn.close()
+        cls.mock_controller.close()
+
+    def test_slider_updates_coalesced(self):
+        """
+        Test that rapid intensity updates of a channel only send the latest value
+        """
+        self.controller.set_on(1)
+        futures = [self.controller.set_intensity(1, value) for value in range(1, 101)]
+        futures[-1].result(timeout=1)
+
+        data = b""
+        while not data.endswith(b"\r\n") or b"00F100" not in data:
+            data += self.mock_conn.recv(1024)
+
+        frames = data.decode(encoding="ascii").split("\r\n")[:-1]
+
+        self.assertLessEqual(len(frames), 3)
+        self.assertEqual(frames[-1][1:7], "00F100")
+        self.assertTrue(all(future.done() for future in futures))
+
+
+class TestNetworkControllerDiffOnly(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Runs once before all tests in class.
+
+        Operations:
+        ----------
+        - Creates a mock controller by opening a socket on localhost
+        - Initializes a NetworkController object in diff-only mode
+        - Accepts the incoming connection from the NetworkController
+        - Clears the initialization commands from the input buffer of the mock connection
+        """
+        cls.mock_controller = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        cls.mock_controller.bind((HOST, PORT_E))
+        cls.mock_controller.listen()
+
+        cls.controller = NetworkController(4, HOST, PORT_E, diff_only=True)
+
+        cls.mock_conn, _ = cls.mock_controller.accept()
+
+        data = b""
+        while data.count(b"\r\n") < 8:
+            data += cls.mock_conn.recv(1024)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Runs once after all tests have been completed.
+        - Destroy the NetworkController object
+        - Close the mock connection
+        - Close the mock controller socket
+        """
+        cls.controller.destroy()
+
+        cls.mock_conn.close()
+        cls.mock_controller.close()
+
+    def tearDown(self) -> None:
+        """
+        Turn all channels off and clear the input buffer of the mock connection after each test
+        """
+        self.controller.set_all_off()
+        self.controller.set_all_strobe_modes(1)
+
+        while select.select([self.mock_conn], [], [], 0.01)[0]:
+            self.mock_conn.recv(1024)
+
+    def receive(self) -> str:
+        """
+        Return all data received by the mock connection within 10ms
+        """
+        data = b""
+        while select.select([self.mock_conn], [], [], 0.01)[0]:
+            data += self.mock_conn.recv(1024)
+
+        return data.decode(encoding="ascii")
+
+    def test_off_when_off_suppressed(self):
+        """
+        Test that turning off a channel that is already off sends no command
+        """
+        self.controller.set_off(1)
+
+        self.assertEqual(self.receive(), "")
+
+    def test_same_strobe_mode_suppressed(self):
+        """
+        Test that setting the current strobe mode sends no command
+        """
+        self.controller.set_strobe_mode(2, 1)
+
+        self.assertEqual(self.receive(), "")
+
+    def test_changed_value_sent(self):
+        """
+        Test that commands changing the output are still sent, and repeated ones are not
+        """
+        self.controller.set_intensity(3, 50)
+        self.controller.set_on(3)
+        self.controller.set_intensity(3, 50)
+        self.controller.set_on(3)
+
+        self.assertEqual(self.receive()[1:7], "02F050")
+
+    def test_intensity_equal_to_off(self):
+        """
+        Test that setting an intensity of 0 on a channel that is on but dark sends no command
+        """
+        self.controller.set_on(4)
+        self.controller.set_intensity(4, 0)
+
+        self.assertEqual(self.receive(), "")
+
+    def test_force_resync(self):
+        """
+        Test that force_resync sends the full local state of all channels
+        """
+        self.controller.force_resync()
+
+        frames = self.receive().split("\r\n")[:-1]
+
+        self.assertEqual(len(frames), 8)
+        self.assertEqual(frames[0][1:7], "00F000")
+        self.assertEqual(frames[1][1:6], "00S01")
+
+
+class TestNetworkControllerResponses(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Runs once before all tests in class.
+
+        Operations:
+        ----------
+        - Creates a mock controller by opening a socket on localhost
+        - Starts a thread replying to every frame, acknowledging all channels except channel 3
+        - Initializes a NetworkController object reading the responses
+        """
+        cls.mock_controller = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        cls.mock_controller.bind((HOST, PORT_F))
+        cls.mock_controller.listen()
+
+        cls.responder = threading.Thread(target=cls.respond, daemon=True)
+        cls.responder.start()
+
+        cls.controller = NetworkController(4, HOST, PORT_F, max_in_flight=2)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Runs once after all tests have been completed.
+        - Destroy the NetworkController object
+        - Wait for the responder to finish and close the mock controller socket
+        """
+        cls.controller.destroy()
+
+        cls.responder.join()
+        cls.mock_controller.close()
+
+    @classmethod
+    def respond(cls) -> None:
+        """
+        Reply to every frame received by the mock controller, not acknowledging channel 3
+        """
+        mock_conn, _ = cls.mock_controller.accept()
+
+        with mock_conn:
+            data = b""
+            while chunk := mock_conn.recv(1024):
+                data += chunk
+                *frames, data = data.split(b"\r\n")
+
+                for frame in frames:
+                    channel = frame[1:3].decode(encoding="ascii")
+                    status = "N" if channel == "02" else "O"
+                    mock_conn.send(encode_command(f"{channel}{status}"))
+
+    def test_ack(self):
+        """
+        Test that an acknowledged command reports ResponseStatus.ACK
+        """
+        future = self.controller.set_strobe_mode(1, 4)
+
+        self.assertIsInstance(future, Future)
+        result = future.result(timeout=1)
+
+        self.assertEqual(result.status, ResponseStatus.ACK)
+        self.assertLessEqual(result.sent, result.acked)
+
+    def test_nak(self):
+        """
+        Test that a rejected command reports ResponseStatus.NAK
+        """
+        future = self.controller.set_off(3)
+
+        self.assertEqual(future.result(timeout=1).status, ResponseStatus.NAK)
+
+    def test_all_channels(self):
+        """
+        Test that every command of a method updating all channels reports its own status
+        """
+        futures = self.controller.set_all_strobe_modes(2)
+
+        self.assertEqual(
+            [future.result(timeout=1).status for future in futures],
+            [
+                ResponseStatus.ACK,
+                ResponseStatus.ACK,
+                ResponseStatus.NAK,
+                ResponseStatus.ACK,
+            ],
+        )
+
+    def test_no_command(self):
+        """
+        Test that a call not sending any command returns a completed future
+        """
+        self.controller.set_off(1)
+        future = self.controller.set_intensity(1, 20)
+
+        self.assertTrue(future.done())
+        self.assertIsNone(future.result().frame)
+
+
+class TestNetworkControllerStartup(unittest.TestCase):
+    def setUp(self) -> None:
+        """
+        Create a mock controller on a free port chosen by the OS
+        """
+        self.mock_controller = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.mock_controller.bind((HOST, 0))
+        self.mock_controller.listen()
+        self.mock_controller.settimeout(5)
+        self.port = self.mock_controller.getsockname()[1]
+
+    def tearDown(self) -> None:
+        """
+        Destroy the NetworkController object if it exists and close the mock controller
+        """
+        if hasattr(self, "controller"):
+            self.controller.destroy()
+
+        if hasattr(self, "mock_conn"):
+            self.mock_conn.close()
+
+        self.mock_controller.close()
+
+    def accept(self) -> None:
+        """
+        Accept the connection of the NetworkController object
+        """
+        self.mock_conn = self.mock_controller.accept()[0]
+        self.mock_conn.settimeout(5)
+
+    def receive(self, count: int) -> list:
+        """
+        Read from the mock connection until count frames have been received
+        """
+        data = b""
+        while data.count(b"\n") < count:
+            data += self.mock_conn.recv(1024)
+
+        return [line + b"\n" for line in data.split(b"\n")[:count]]
+
+    def test_eager_ready(self):
+        """
+        Test that the ready future has completed when init returns
+        """
+        self.controller = NetworkController(1, HOST, self.port)
+        self.accept()
+
+        self.assertTrue(self.controller.ready.done())
+        self.assertIsNone(self.controller.ready.result())
+
+    def test_lazy_startup(self):
+        """
+        Test that a lazy controller connects in the background and sends the reset sequence
+        """
+        self.controller = NetworkController(2, HOST, self.port, lazy=True)
+        self.accept()
+
+        self.assertIsNone(self.controller.ready.result(timeout=5))
+        self.assertEqual(
+            self.receive(4),
+            [
+                encode_command("00F000"),
+                encode_command("00S01"),
+                encode_command("01F000"),
+                encode_command("01S01"),
+            ],
+        )
+
+    def test_lazy_commands_wait_for_ready(self):
+        """
+        Test that commands issued during a lazy startup are sent after the reset sequence
+        """
+        self.controller = NetworkController(1, HOST, self.port, lazy=True)
+        self.controller.set_strobe_mode(1, 5)
+        self.accept()
+
+        self.assertEqual(self.receive(3)[-1], encode_command("00S05"))
+
+    def test_skip_reset(self):
+        """
+        Test that no commands are sent on startup when the reset is skipped
+        """
+        self.controller = NetworkController(1, HOST, self.port, reset=False)
+        self.controller.set_strobe_mode(1, 5)
+        self.accept()
+
+        self.assertEqual(self.receive(1), [encode_command("00S05")])
+
+    def test_lazy_unreachable(self):
+        """
+        Test that a failed lazy startup is reported by the ready future and by later commands
+        """
+        self.mock_controller.close()
+
+        start = time.monotonic()
+        controller = NetworkController(1, HOST, self.port, lazy=True)
+        self.assertLess(time.monotonic() - start, 0.1)
+
+        self.assertIsInstance(controller.ready.exception(timeout=5), ConnectionError)
+
+        with self.assertRaises(ConnectionError):
+            controller.set_strobe_mode(1, 5)
+
+        controller.destroy()
+
+
+class TestNetworkControllerFade(unittest.TestCase):
+    def setUp(self) -> None:
+        """
+        Create a mock controller on a free port chosen by the OS and connect a thread-safe NetworkController object
+        """
+        self.mock_controller = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.mock_controller.bind((HOST, 0))
+        self.mock_controller.listen()
+
+        self.controller = NetworkController(
+            4,
+            HOST,
+            self.mock_controller.getsockname()[1],
+            reset=False,
+            thread_safe=True,
+        )
+        self.mock_conn, _ = self.mock_controller.accept()
+
+    def tearDown(self) -> None:
+        """
+        Destroy the NetworkController object and close the mock controller
+        """
+        self.controller.destroy()
+        self.mock_conn.close()
+        self.mock_controller.close()
+
+    def receive(self) -> list:
+        """
+        Return all frames received by the mock connection within 10ms
+        """
+        data = b""
+        while select.select([self.mock_conn], [], [], 0.01)[0]:
+            data += self.mock_conn.recv(1024)
+
+        return data.decode(encoding="ascii").split("\r\n")[:-1]
+
+    def test_fade_ends_on_time(self):
+        """
+        Test that a fade reaches its target within the duration, stepping through intermediate values
+        """
+        self.controller.set_on(1)
+        self.receive()
+
+        start = time.monotonic()
+        self.controller.fade(1, 200, 0.1)
+        elapsed = time.monotonic() - start
+
+        frames = self.receive()
+        values = [int(frame[4:7]) for frame in frames]
+
+        # A fade stretched by sending every step would take over a second
+        self.assertLess(elapsed, 0.1 + 0.03)
+        self.assertEqual(values[-1], 200)
+        self.assertEqual(values, sorted(values))
+        self.assertGreater(len(values), 10)
+        self.assertEqual(self.controller.get_intensity(1), 200)
+
+    def test_ramp_interleaves_channels(self):
+        """
+        Test that a ramp of several channels steps all channels to their targets
+        """
+        self.controller.set_all_on()
+        self.receive()
+
+        self.controller.ramp({1: 100, 2: 50}, 0.05)
+        frames = self.receive()
+
+        last = {frame[1:3]: frame[4:7] for frame in frames}
+
+        self.assertEqual(last, {"00": "100", "01": "050"})
+        self.assertEqual(self.controller.get_intensity(1), 100)
+        self.assertEqual(self.controller.get_intensity(2), 50)
+
+    def test_ramp_stops_when_turned_off(self):
+        """
+        Test that a channel turned off by another thread during a ramp is not turned back on
+        """
+        self.controller.set_all_on()
+        self.receive()
+
+        stop = threading.Timer(0.03, self.controller.set_off, (1,))
+        stop.start()
+        self.controller.ramp({1: 255, 2: 255}, 0.1)
+        stop.join()
+
+        frames = self.receive()
+        last = {frame[1:3]: frame[4:7] for frame in frames}
+
+        self.assertEqual(last, {"00": "000", "01": "255"})
+        self.assertFalse(self.controller.capture_scene().channels[0].state)
+        self.assertEqual(self.controller.get_intensity(2), 255)
+
+    def test_fade_off_channel(self):
+        """
+        Test that fading a channel that is off sets the intensity locally without waiting
+        """
+        start = time.monotonic()
+        self.controller.fade(3, 120, 1)
+
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertEqual(self.controller.get_intensity(3), 120)
+        self.assertEqual(self.receive(), [])
+
+    def test_fade_bad_arguments(self):
+        """
+        Test that fades with bad arguments are rejected
+        """
+        with self.assertRaises(ValueError):
+            self.controller.fade(5, 100, 1)
+
+        with self.assertRaises(ValueError):
+            self.controller.fade(1, 256, 1)
+
+        with self.assertRaises(ValueError):
+            self.controller.fade(1, 100, -1)
+
+
+class TestNetworkControllerMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        """
+        Create a mock controller on a free port chosen by the OS and connect an instrumented NetworkController object
+        """
+        self.mock_controller = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.mock_controller.bind((HOST, 0))
+        self.mock_controller.listen()
+
+        self.metrics = Metrics()
+        self.controller = NetworkController(
+            4, HOST, self.mock_controller.getsockname()[1], metrics=self.metrics
+        )
+        self.mock_conn, _ = self.mock_controller.accept()
+
+    def tearDown(self) -> None:
+        """
+        Destroy the NetworkController object and close the mock controller
+        """
+        self.controller.destroy()
+        self.mock_conn.close()
+        self.mock_controller.close()
+
+    def test_command_timing(self):
+        """
+        Test that the stages of a command are timed and passed to the hooks
+        """
+        timings = []
+        self.metrics.add_hook(timings.append)
+
+        self.controller.set_intensity(1, 100)
+        self.controller.set_on(1)
+        self.controller.set_strobe_mode(1, 2)
+
+        self.assertEqual(
+            [timing.frame[1:6] for timing in timings], [b"00F10", b"00S02"]
+        )
+        self.assertIsNotNone(timings[0].validation)
+        self.assertGreater(timings[1].limiter, 0.003)
+        self.assertGreaterEqual(timings[1].send, 0)
+        self.assertIs(self.controller.metrics, self.metrics)
+
+    def test_counters(self):
+        """
+        Test that sent and suppressed commands are counted, including the initialization commands
+        """
+        self.controller.set_intensity(2, 100)
+        self.controller.set_on(2)
+
+        self.assertEqual(self.metrics.sent, 9)
+        self.assertEqual(self.metrics.suppressed, 1)
+        self.assertEqual(self.metrics.errors, 0)
+        self.assertEqual(self.metrics.histogram(Stage.VALIDATION).samples, 1)
+        self.assertEqual(self.metrics.histogram(Stage.SEND).samples, 9)
+
+    def test_validation_of_own_call(self):
+        """
+        Test that the validation time only covers the method call sending the command
+        """
+        self.controller.get_intensity(1)
+        time.sleep(0.1)
+
+        self.controller.apply_scene(
+            Scene((ChannelSetting(50, True, 2),) + (ChannelSetting(0, False, 1),) * 3)
+        )
+
+        validation = self.metrics.histogram(Stage.VALIDATION)
+        self.assertEqual(validation.samples, 1)
+        self.assertLess(validation.total, 0.05)
+
+
+class TestNetworkControllerScenes(unittest.TestCase):
+    def setUp(self) -> None:
+        """
+        Create a mock controller on a free port chosen by the OS and connect a NetworkController object
+        """
+        self.mock_controller = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.mock_controller.bind((HOST, 0))
+        self.mock_controller.listen()
+
+        self.controller = NetworkController(
+            2, HOST, self.mock_controller.getsockname()[1], reset=False
+        )
+        self.mock_conn, _ = self.mock_controller.accept()
+
+    def tearDown(self) -> None:
+        """
+        Destroy the NetworkController object and close the mock controller
+        """
+        self.controller.destroy()
+        self.mock_conn.close()
+        self.mock_controller.close()
+
+    def receive(self) -> list:
+        """
+        Return all frames received by the mock connection within 10ms
+        """
+        data = b""
+        while select.select([self.mock_conn], [], [], 0.01)[0]:
+            data += self.mock_conn.recv(1024)
+
+        # Frames without header and checksum, e.g. "00F200" or "00S01"
+        frames = data.decode(encoding="ascii").split("\r\n")[:-1]
+
+        return [frame[1:-2] for frame in frames]
+
+    def test_save_and_apply(self):
+        """
+        Test that a saved scene is restored by sending only the changed values
+        """
+        self.controller.set_intensity(1, 200)
+        self.controller.set_on(1)
+        self.controller.set_strobe_mode(2, 3)
+        self.controller.save_scene("backlight")
+
+        self.controller.set_intensity(1, 20)
+        self.controller.set_strobe_mode(1, 5)
+        self.receive()
+
+        self.controller.apply_scene("backlight")
+
+        self.assertEqual(self.receive(), ["00S01", "00F200"])
+        self.assertEqual(self.controller.get_strobe_mode(1), 1)
+        self.assertEqual(
+            self.controller.capture_scene(), self.controller.scenes["backlight"]
+        )
+
+    def test_apply_updates_local_state(self):
+        """
+        Test that applying a scene updates the local state of channels without sending unchanged output
+        """
+        scene = Scene((ChannelSetting(0, False, 1), ChannelSetting(90, False, 2)))
+
+        self.controller.apply_scene(scene)
+
+        self.assertEqual(self.receive(), ["01S02"])
+        self.assertEqual(self.controller.get_intensity(2), 90)
+
+    def test_apply_unchanged(self):
+        """
+        Test that applying the current scene sends nothing and returns a single result without frame
+        """
+        self.controller.set_intensity(1, 60)
+        self.receive()
+
+        futures = self.controller.apply_scene(self.controller.capture_scene())
+
+        self.assertEqual(len(futures), 1)
+        self.assertEqual(futures[0].result(), NO_COMMAND)
+        self.assertEqual(self.receive(), [])
+
+    def test_invalid_scenes(self):
+        """
+        Test that unknown names and scenes not matching the controller are rejected
+        """
+        with self.assertRaises(ValueError):
+            self.controller.apply_scene("dome")
+
+        with self.assertRaises(ValueError):
+            self.controller.save_scene("dome", Scene((ChannelSetting(0, False, 1),)))
+
+        self.controller.save_scene("dark")
+        self.controller.delete_scene("dark")
+
+        with self.assertRaises(ValueError):
+            self.controller.delete_scene("dark")
+
+    def test_capture_sequence(self):
+        """
+        Test that the camera is triggered once the frames of each step have been sent, at the top rate
+        """
+        scenes = [
+            Scene((ChannelSetting(100, True, 1), ChannelSetting(0, False, 1))),
+            Scene((ChannelSetting(0, False, 1), ChannelSetting(100, True, 1))),
+            "dark",
+        ]
+        self.controller.save_scene("dark")
+
+        received = []
+        steps = self.controller.capture_sequence(
+            scenes, lambda step: received.append(self.receive())
+        )
+
+        self.assertEqual(received, [["00F100"], ["00F000", "01F100"], ["01F000"]])
+        self.assertEqual([step.frames for step in steps], [1, 2, 1])
+        self.assertEqual([step.step for step in steps], [0, 1, 2])
+
+        # The second frame of a step waits for its 5ms slot, the first was due during the exposure
+        self.assertGreater(steps[1].lit - steps[1].start, 0.004)
+        self.assertLess(steps[1].lit - steps[1].start, 0.009)
+        self.assertLess(steps[0].lit, steps[0].done)
+        self.assertEqual(
+            self.controller.capture_scene(), self.controller.scenes["dark"]
+        )
+
+
+class TestNetworkControllerBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        """
+        Create a mock controller on a free port chosen by the OS and connect a NetworkController object
+        """
+        self.mock_controller = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.mock_controller.bind((HOST, 0))
+        self.mock_controller.listen()
+
+        self.controller = NetworkController(
+            4, HOST, self.mock_controller.getsockname()[1], reset=False
+        )
+        self.mock_conn, _ = self.mock_controller.accept()
+
+    def tearDown(self) -> None:
+        """
+        Destroy the NetworkController object and close the mock controller
+        """
+        self.controller.destroy()
+        self.mock_conn.close()
+        self.mock_controller.close()
+
+    def receive(self) -> list:
+        """
+        Return all frames received by the mock connection within 10ms, without header and checksum
+        """
+        data = b""
+        while select.select([self.mock_conn], [], [], 0.01)[0]:
+            data += self.mock_conn.recv(1024)
+
+        return [
+            frame[1:-2] for frame in data.decode(encoding="ascii").split("\r\n")[:-1]
+        ]
+
+    def test_set_intensities(self):
+        """
+        Test that only the changed intensities of channels that are on are sent
+        """
+        self.controller.set_all_intensities(10)
+        self.controller.set_on(1)
+        self.controller.set_on(2)
+        self.controller.set_on(3)
+        self.receive()
+
+        self.controller.set_intensities([10, 20, 30, 40])
+
+        self.assertEqual(self.receive(), ["01F020", "02F030"])
+        self.assertEqual(self.controller.get_intensity(4), 40)
+
+    def test_set_strobe_modes(self):
+        """
+        Test that only the changed strobe modes are sent
+        """
+        self.controller.set_strobe_modes((1, 2, 1, 10))
+
+        self.assertEqual(self.receive(), ["01S02", "03S10"])
+        self.assertEqual(self.controller.get_strobe_mode(4), 10)
+
+    def test_invalid_batch(self):
+        """
+        Test that invalid batches are rejected before any channel is updated
+        """
+        for values in ([1, 2, 3], [0, 0, 0, 256], [0, -1, 0, 0]):
+            with self.assertRaises(ValueError):
+                self.controller.set_intensities(values)
+
+        with self.assertRaises(TypeError):
+            self.controller.set_intensities([0, 0, 0, 1.5])
+
+        with self.assertRaises(ValueError):
+            self.controller.set_strobe_modes([1, 1, 0, 1])
+
+        self.assertEqual(self.controller.get_intensity(1), 0)
+        self.assertEqual(self.receive(), [])
+
+
+class TestNetworkControllerThreadSafe(unittest.TestCase):
+    def test_concurrent_producers(self):
+        """
+        Test that the state of the controller matches the local state after 16 threads changed it at once
+        """
+        with SimulatorThread(Simulator(wait_time=0.0005, reply=False)) as simulator:
+            virtual = simulator.controllers[0]
+            lights = NetworkController(
+                4,
+                simulator.host,
+                virtual.port,
+                queued=True,
+                coalesce=True,
+                limiter=RateLimiter(0.0005),
+                thread_safe=True,
+            )
+
+            def produce(seed: int) -> None:
+                rng = random.Random(seed)
+
+                for _ in range(50):
+                    channel_id = rng.randint(1, 4)
+                    rng.choice(
+                        [
+                            lambda: lights.set_intensity(
+                                channel_id, rng.randint(0, 255)
+                            ),
+                            lambda: lights.toggle(channel_id),
+                            lambda: lights.set_strobe_mode(
+                                channel_id, rng.randint(1, 10)
+                            ),
+                            lambda: lights.set_all_intensities(rng.randint(0, 255)),
+                            lambda: lights.set_intensities([rng.randint(0, 255)] * 4),
+                        ]
+                    )()
+
+            threads = [threading.Thread(target=produce, args=(i,)) for i in range(16)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertTrue(lights.wait_settled(time.perf_counter() + 5))
+
+            scene = lights.capture_scene()
+            outputs = [setting.output for setting in scene.channels]
+            modes = [setting.strobe_mode for setting in scene.channels]
+
+            deadline = time.monotonic() + 1
+            while virtual.intensities != outputs and time.monotonic() < deadline:
+                time.sleep(0.001)
+
+            self.assertEqual(virtual.intensities, outputs)
+            self.assertEqual(virtual.strobe_modes, modes)
+            lights.destroy()
+
+
+class TestNetworkControllerBank(unittest.TestCase):
+    def test_shared_bank(self):
+        """
+        Test that controllers sharing a bank store their channels in consecutive ranges of it
+        """
+        bank = ChannelBank()
+
+        with SimulatorThread(Simulator(controllers=2)) as simulator:
+            left, right = (
+                NetworkController(channels, simulator.host, virtual.port, bank=bank)
+                for channels, virtual in zip((4, 2), simulator.controllers)
+            )
+
+            left.set_intensities([10, 20, 30, 40])
+            right.set_on(2)
+            right.set_intensity(2, 99)
+            right.set_strobe_mode(1, 6)
+
+            self.assertEqual(len(bank), 6)
+            self.assertEqual(bank.intensities(0, 6), bytes([10, 20, 30, 40, 0, 99]))
+            self.assertEqual(bank.states(0, 6), [False] * 5 + [True])
+            self.assertEqual(right.capture_scene(), bank.capture(4, 6))
+            self.assertEqual(simulator.controllers[1].intensities[:2], [0, 99])
+
+            left.destroy()
+            right.destroy()
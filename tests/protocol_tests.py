@@ -0,0 +1,125 @@
+import unittest
+
+from src.VSTLight.protocol import (
+    INTENSITY_FRAMES,
+    STROBE_FRAMES,
+    Response,
+    ResponseParser,
+    ResponseStatus,
+    encode_command,
+)
+
+
+class TestEncodeCommand(unittest.TestCase):
+    def test_checksum(self):
+        """
+        Test that the checksum is calculated correctly for the message
+        (Uses example from the VLP controller specsheet setting channel 2 to 125 intensity)
+        """
+        self.assertEqual(encode_command("01F125"), b"@01F1257F\r\n")
+
+    def test_frame_format(self):
+        """
+        Test that the frame consists of header, command, checksum and delimiter
+        """
+        frame = encode_command("03S10")
+
+        self.assertTrue(frame.startswith(b"@03S10"))
+        self.assertTrue(frame.endswith(b"\r\n"))
+        self.assertEqual(len(frame), 10)
+
+
+class TestFrameTables(unittest.TestCase):
+    def test_table_sizes(self):
+        """
+        Test that the tables cover every channel, intensity and strobe mode
+        """
+        self.assertEqual(len(INTENSITY_FRAMES), 4)
+        self.assertTrue(all(len(frames) == 256 for frames in INTENSITY_FRAMES))
+
+        self.assertEqual(len(STROBE_FRAMES), 4)
+        self.assertTrue(all(len(frames) == 10 for frames in STROBE_FRAMES))
+
+    def test_all_intensity_frames(self):
+        """
+        Test that every precomputed intensity frame matches the encoded command
+        """
+        for channel_idx in range(4):
+            for value in range(256):
+                self.assertEqual(
+                    INTENSITY_FRAMES[channel_idx][value],
+                    encode_command(f"{channel_idx:02}F{value:03}"),
+                )
+
+    def test_all_strobe_frames(self):
+        """
+        Test that every precomputed strobe frame matches the encoded command
+        """
+        for channel_idx in range(4):
+            for mode in range(1, 11):
+                self.assertEqual(
+                    STROBE_FRAMES[channel_idx][mode - 1],
+                    encode_command(f"{channel_idx:02}S{mode:02}"),
+                )
+
+    def test_frames_are_immutable(self):
+        """
+        Test that the precomputed frames are immutable bytes objects
+        """
+        self.assertIsInstance(INTENSITY_FRAMES[0][0], bytes)
+        self.assertIsInstance(STROBE_FRAMES[0][0], bytes)
+
+
+class TestResponseParser(unittest.TestCase):
+    def setUp(self) -> None:
+        self.parser = ResponseParser()
+
+    def test_ack(self):
+        """
+        Test that an OK reply is parsed as acknowledged on its channel
+        """
+        responses = self.parser.feed(encode_command("02O"))
+
+        self.assertEqual(responses, [Response(2, ResponseStatus.ACK, "")])
+
+    def test_nak_with_code(self):
+        """
+        Test that a not OK reply is parsed with its error code
+        """
+        responses = self.parser.feed(encode_command("01N3"))
+
+        self.assertEqual(responses, [Response(1, ResponseStatus.NAK, "3")])
+
+    def test_partial_reply(self):
+        """
+        Test that a reply split over several reads is only returned once complete
+        """
+        frame = encode_command("00O")
+
+        self.assertEqual(self.parser.feed(frame[:3]), [])
+        self.assertEqual(self.parser.feed(frame[3:-1]), [])
+        self.assertEqual(
+            self.parser.feed(frame[-1:]), [Response(0, ResponseStatus.ACK, "")]
+        )
+
+    def test_several_replies(self):
+        """
+        Test that several replies received at once are returned in order
+        """
+        data = encode_command("00O") + encode_command("01N") + encode_command("03O")[:4]
+
+        responses = self.parser.feed(data)
+
+        self.assertEqual([r.channel_idx for r in responses], [0, 1])
+        self.assertEqual(
+            [r.status for r in responses], [ResponseStatus.ACK, ResponseStatus.NAK]
+        )
+
+    def test_bad_checksum(self):
+        """
+        Test that a reply with an invalid checksum is reported as not acknowledged on no channel
+        """
+        responses = self.parser.feed(b"@00O00\r\n")
+
+        self.assertEqual(responses[0].channel_idx, -1)
+        self.assertEqual(responses[0].status, ResponseStatus.NAK)
@@ -0,0 +1,116 @@
+import time
+import unittest
+
+from src.VSTLight.rate_limiter import RateLimiter
+
+# Interval used by the tests, matching the limit of the VLP controllers
+INTERVAL = 0.005
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_first_call_does_not_wait(self):
+        """
+        Test that the first call returns immediately
+        """
+        limiter = RateLimiter(INTERVAL)
+
+        start = time.perf_counter()
+        limiter.wait()
+
+        self.assertLess(time.perf_counter() - start, INTERVAL)
+
+    def test_spacing(self):
+        """
+        Test that consecutive calls are spaced by at least the interval
+        """
+        limiter = RateLimiter(INTERVAL)
+
+        limiter.wait()
+        start = time.perf_counter()
+
+        for _ in range(4):
+            limiter.wait()
+
+        self.assertGreaterEqual(time.perf_counter() - start, 4 * INTERVAL)
+        self.assertGreaterEqual(limiter.stats.minimum, INTERVAL)
+
+    def test_scheduled_time(self):
+        """
+        Test that a delayed call returns the end of the interval as its scheduled time
+        """
+        limiter = RateLimiter(INTERVAL)
+
+        first = limiter.wait()
+        second = limiter.wait()
+
+        self.assertAlmostEqual(second - first, INTERVAL, delta=1e-4)
+        self.assertLessEqual(second, time.perf_counter())
+
+    def test_margin(self):
+        """
+        Test that the margin is added to the interval
+        """
+        limiter = RateLimiter(INTERVAL, margin=0.001)
+        self.assertAlmostEqual(limiter.interval, INTERVAL + 0.001)
+
+        limiter.wait()
+        start = time.perf_counter()
+        limiter.wait()
+
+        self.assertGreaterEqual(time.perf_counter() - start, INTERVAL + 0.0009)
+
+    def test_stats(self):
+        """
+        Test that the spacing of delayed calls is recorded
+        """
+        limiter = RateLimiter(INTERVAL)
+
+        for _ in range(4):
+            limiter.wait()
+
+        stats = limiter.stats
+        self.assertEqual(stats.samples, 3)
+        self.assertGreaterEqual(stats.minimum, INTERVAL)
+        self.assertGreaterEqual(stats.maximum, stats.mean)
+        self.assertGreaterEqual(stats.mean, stats.minimum)
+        self.assertGreaterEqual(stats.stdev, 0)
+
+    def test_stats_skip_pauses(self):
+        """
+        Test that calls made after a longer pause are not recorded, and that stats can be reset
+        """
+        limiter = RateLimiter(INTERVAL)
+        limiter.wait()
+        time.sleep(2 * INTERVAL)
+        limiter.wait()
+
+        self.assertEqual(limiter.stats.samples, 0)
+
+        limiter.wait()
+        self.assertEqual(limiter.stats.samples, 1)
+
+        limiter.reset_stats()
+        self.assertEqual(limiter.stats.samples, 0)
+        self.assertEqual(limiter.stats.mean, 0.0)
+
+    def test_without_spinning(self):
+        """
+        Test that the interval is respected when spinning is disabled
+        """
+        limiter = RateLimiter(INTERVAL, spin_threshold=0)
+
+        limiter.wait()
+        start = time.perf_counter()
+        limiter.wait()
+
+        self.assertGreaterEqual(time.perf_counter() - start, INTERVAL * 0.9)
+
+    def test_invalid_arguments(self):
+        """
+        Test that negative arguments are rejected
+        """
+        with self.assertRaises(ValueError):
+            RateLimiter(-1)
+
+        with self.assertRaises(ValueError):
+            RateLimiter(INTERVAL, margin=-0.001)
@@ -0,0 +1,115 @@
+import os
+import tempfile
+import time
+import unittest
+
+from src.VSTLight.network_controller import NetworkController
+from src.VSTLight.protocol import encode_command
+from src.VSTLight.recorder import (
+    Recorder,
+    RecordedFrame,
+    Recording,
+    read_recording,
+    replay,
+)
+from src.VSTLight.simulator import Simulator, SimulatorThread
+
+
+class TestRecorder(unittest.TestCase):
+    def setUp(self) -> None:
+        """
+        Create a temporary directory for the recording files
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.rec")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_read_back(self):
+        """
+        Test that recorded frames and controller names are read back in order
+        """
+        with Recorder(self.path) as recorder:
+            left = recorder.register("10.0.0.1:1000")
+            right = recorder.register("10.0.0.2:1000")
+
+            recorder.record(left, encode_command("00F100"))
+            recorder.record(right, encode_command("01S02"))
+
+        recording = read_recording(self.path)
+
+        self.assertEqual(recording.names, {0: "10.0.0.1:1000", 1: "10.0.0.2:1000"})
+        self.assertEqual(
+            [(f.controller_id, f.frame) for f in recording.frames],
+            [(0, encode_command("00F100")), (1, encode_command("01S02"))],
+        )
+        self.assertLessEqual(
+            recording.frames[0].timestamp, recording.frames[1].timestamp
+        )
+        self.assertGreaterEqual(recording.frames[0].timestamp, recording.monotonic)
+
+    def test_ring_buffer(self):
+        """
+        Test that the oldest records are overwritten once the file is full
+        """
+        with Recorder(self.path, slots=4) as recorder:
+            controller_id = recorder.register("lights")
+
+            for value in range(10):
+                recorder.record(controller_id, encode_command(f"00F{value:03}"))
+
+        frames = read_recording(self.path).frames
+
+        self.assertEqual(
+            [f.frame for f in frames],
+            [encode_command(f"00F{value:03}") for value in range(6, 10)],
+        )
+
+    def test_controller_records_frames(self):
+        """
+        Test that a NetworkController records every frame it sends, including the initialization
+        """
+        with SimulatorThread(Simulator()) as simulator:
+            port = simulator.controllers[0].port
+
+            with Recorder(self.path) as recorder:
+                lights = NetworkController(2, simulator.host, port, recorder=recorder)
+                lights.set_intensity(1, 100)
+                lights.set_on(1)
+                lights.destroy()
+
+        recording = read_recording(self.path)
+        frames = [f.frame for f in recording.frames]
+
+        self.assertEqual(recording.names, {0: f"{simulator.host}:{port}"})
+        self.assertEqual(len(frames), 7)
+        self.assertEqual(frames[4], encode_command("00F100"))
+
+    def test_replay(self):
+        """
+        Test that a replay keeps the timing of the recording divided by the speed
+        """
+        frames = [
+            RecordedFrame(i * 20_000_000, 0, encode_command(f"00F{i:03}"))
+            for i in range(5)
+        ]
+        recording = Recording(0, 0, {0: "lights"}, frames)
+
+        with SimulatorThread(Simulator()) as simulator:
+            target = {0: (simulator.host, simulator.controllers[0].port)}
+
+            start = time.monotonic()
+            sent = replay(recording, target, speed=2.0)
+            elapsed = time.monotonic() - start
+
+            # Wait for the simulator to read all frames
+            deadline = time.monotonic() + 1
+            virtual = simulator.controllers[0]
+            while len(virtual.records) < 5 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        self.assertEqual(sent, 5)
+        self.assertGreaterEqual(elapsed, 0.04)
+        self.assertLess(elapsed, 0.08)
+        self.assertEqual(virtual.intensities[0], 4)
@@ -0,0 +1,97 @@
+import socket
+import threading
+import time
+import unittest
+
+from src.VSTLight.protocol import ResponseStatus, encode_command
+from src.VSTLight.response_reader import ResponseReader
+
+
+class TestResponseReader(unittest.TestCase):
+    def setUp(self) -> None:
+        """
+        Create a connected socket pair, reading replies from one end and writing them to the other
+        """
+        self.sock, self.mock_conn = socket.socketpair()
+        self.reader = ResponseReader(self.sock, 4, 0.05, "test-reader")
+
+    def tearDown(self) -> None:
+        """
+        Stop the reader and close the sockets
+        """
+        self.reader.close()
+
+        self.sock.close()
+        self.mock_conn.close()
+
+    def test_replies_matched_in_order(self):
+        """
+        Test that replies are matched to the registered commands in the order they were sent
+        """
+        first = self.reader.register(0)
+        second = self.reader.register(1)
+
+        self.mock_conn.send(encode_command("00O") + encode_command("01N"))
+
+        self.assertEqual(first.result(timeout=1), ResponseStatus.ACK)
+        self.assertEqual(second.result(timeout=1), ResponseStatus.NAK)
+        self.assertEqual(len(self.reader), 0)
+
+    def test_timeout(self):
+        """
+        Test that a command without a reply is reported as timed out
+        """
+        future = self.reader.register(2)
+
+        self.assertEqual(future.result(timeout=1), ResponseStatus.TIMEOUT)
+
+    def test_lost_reply(self):
+        """
+        Test that a command is reported as timed out when a reply to a later command arrives first
+        """
+        lost = self.reader.register(0)
+        answered = self.reader.register(3)
+
+        self.mock_conn.send(encode_command("03O"))
+
+        self.assertEqual(answered.result(timeout=1), ResponseStatus.ACK)
+        self.assertEqual(lost.result(timeout=1), ResponseStatus.TIMEOUT)
+
+    def test_window_blocks(self):
+        """
+        Test that registering blocks while the maximum number of commands are in flight
+        """
+        for _ in range(4):
+            self.reader.register(0)
+
+        threading.Timer(0.01, self.mock_conn.send, [encode_command("00O")]).start()
+
+        start = time.monotonic()
+        self.reader.register(0)
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.005)
+        self.assertLessEqual(len(self.reader), 4)
+
+    def test_discard(self):
+        """
+        Test that a command that could not be sent is removed and holds the exception
+        """
+        future = self.reader.register(0)
+        self.reader.discard(future, OSError("Failed"))
+
+        self.assertEqual(len(self.reader), 0)
+        with self.assertRaises(OSError):
+            future.result(timeout=1)
+
+    def test_connection_closed(self):
+        """
+        Test that commands in flight fail when the controller closes the connection
+        """
+        future = self.reader.register(0)
+        self.mock_conn.close()
+
+        with self.assertRaises(ConnectionError):
+            future.result(timeout=1)
+
+        with self.assertRaises(ConnectionError):
+            self.reader.register(0)
@@ -0,0 +1,54 @@
+import unittest
+
+from src.VSTLight.protocol import encode_command
+from src.VSTLight.scene import ChannelSetting, Scene, plan_scene
+
+# Two channel scenes used by the tests
+DARK = Scene((ChannelSetting(0, False, 1), ChannelSetting(0, False, 1)))
+BACKLIGHT = Scene((ChannelSetting(200, True, 1), ChannelSetting(0, False, 1)))
+DOME = Scene((ChannelSetting(50, True, 3), ChannelSetting(120, True, 4)))
+
+
+class TestPlanScene(unittest.TestCase):
+    def test_unchanged_scene(self):
+        """
+        Test that switching to the current scene sends nothing
+        """
+        self.assertEqual(plan_scene(DOME, DOME), [])
+
+    def test_only_output_changes_sent(self):
+        """
+        Test that changing the intensity of a channel that stays off sends nothing
+        """
+        target = Scene((ChannelSetting(200, True, 1), ChannelSetting(90, False, 1)))
+
+        self.assertEqual(plan_scene(BACKLIGHT, target), [])
+        self.assertEqual(plan_scene(DARK, BACKLIGHT), [encode_command("00F200")])
+
+    def test_glitch_free_order(self):
+        """
+        Test that channels getting darker are updated first and channels getting brighter last
+        """
+        frames = plan_scene(BACKLIGHT, DOME)
+
+        self.assertEqual(
+            frames,
+            [
+                encode_command("00F050"),
+                encode_command("00S03"),
+                encode_command("01S04"),
+                encode_command("01F120"),
+            ],
+        )
+
+    def test_validate(self):
+        """
+        Test that scenes with invalid settings are rejected
+        """
+        DOME.validate()
+
+        with self.assertRaises(ValueError):
+            Scene((ChannelSetting(256, True, 1),)).validate()
+
+        with self.assertRaises(ValueError):
+            Scene((ChannelSetting(0, True, 11),)).validate()
@@ -0,0 +1,145 @@
+import asyncio
+import time
+import unittest
+
+from src.VSTLight.async_network_controller import AsyncNetworkController
+from src.VSTLight.network_controller import NetworkController
+from src.VSTLight.protocol import ResponseStatus, encode_command, parse_response
+from src.VSTLight.simulator import (
+    ERROR_CHECKSUM,
+    ERROR_COMMAND,
+    ERROR_SPACING,
+    Simulator,
+    SimulatorThread,
+    VirtualController,
+)
+
+# Generous tolerance for the spacing checks, as the test machine may be under load
+TOLERANCE = 0.002
+
+
+class TestVirtualController(unittest.TestCase):
+    def setUp(self) -> None:
+        """
+        Create a virtual controller with two channels
+        """
+        self.controller = VirtualController(channels=2)
+
+    def handle(self, cmd: str, timestamp: float = 0.0):
+        """
+        Pass an encoded command to the virtual controller and parse the reply
+        """
+        reply = self.controller.handle(encode_command(cmd)[:-2], timestamp)
+
+        return parse_response(reply[:-2])
+
+    def test_intensity(self):
+        """
+        Test that a valid intensity frame is acknowledged and updates the output
+        """
+        response = self.handle("01F125")
+
+        self.assertEqual(response.status, ResponseStatus.ACK)
+        self.assertEqual(response.channel_idx, 1)
+        self.assertEqual(self.controller.intensities, [0, 125])
+
+    def test_strobe_mode(self):
+        """
+        Test that a valid strobe frame is acknowledged and updates the strobe mode
+        """
+        self.assertEqual(self.handle("00S07").status, ResponseStatus.ACK)
+        self.assertEqual(self.controller.strobe_modes, [7, 1])
+
+    def test_invalid_values(self):
+        """
+        Test that frames with unknown channels, commands or values are rejected
+        """
+        for cmd in ["02F100", "00F256", "00S00", "00S11", "00X100"]:
+            response = self.handle(cmd)
+
+            self.assertEqual(response.status, ResponseStatus.NAK)
+            self.assertEqual(response.code, ERROR_COMMAND)
+
+        self.assertEqual(self.controller.intensities, [0, 0])
+
+    def test_bad_checksum(self):
+        """
+        Test that a frame with a wrong checksum is rejected
+        """
+        reply = self.controller.handle(b"@00F10000", 0.0)
+        response = parse_response(reply[:-2])
+
+        self.assertEqual(response.status, ResponseStatus.NAK)
+        self.assertEqual(response.code, ERROR_CHECKSUM)
+
+    def test_spacing_violation(self):
+        """
+        Test that frames arriving too soon are flagged, and only rejected in strict mode
+        """
+        self.handle("00F001", 0.0)
+        self.assertEqual(self.handle("00F002", 0.001).status, ResponseStatus.ACK)
+        self.handle("00F003", 0.010)
+
+        self.assertEqual(self.controller.violations, 1)
+        self.assertEqual(
+            [record.violation for record in self.controller.records],
+            [False, True, False],
+        )
+
+        self.controller.strict = True
+        response = self.handle("00F004", 0.011)
+
+        self.assertEqual(response.code, ERROR_SPACING)
+        self.assertEqual(self.controller.intensities, [3, 0])
+
+
+class TestSimulatorThread(unittest.TestCase):
+    def test_network_controller(self):
+        """
+        Test that a NetworkController reading responses runs against the simulator within the spacing
+        """
+        with SimulatorThread(Simulator(2, tolerance=TOLERANCE)) as simulator:
+            virtual = simulator.controllers[1]
+            lights = NetworkController(4, simulator.host, virtual.port, max_in_flight=2)
+
+            lights.set_intensity(3, 90)
+            future = lights.set_on(3)
+
+            self.assertEqual(future.result(timeout=1).status, ResponseStatus.ACK)
+            lights.destroy()
+
+            # 8 initialization commands, 1 intensity command and 4 off commands
+            deadline = time.monotonic() + 1
+            while len(virtual.records) < 13 and time.monotonic() < deadline:
+                time.sleep(0.001)
+
+            self.assertEqual(len(virtual.records), 13)
+
+            # Single timestamps are subject to the scheduling of the simulator thread, the total is not
+            elapsed = virtual.records[-1].timestamp - virtual.records[0].timestamp
+            self.assertGreaterEqual(elapsed, 12 * 0.005 - TOLERANCE)
+
+            # The spacing of single frames is checked on the sending side
+            self.assertGreaterEqual(lights.limiter.stats.minimum, 0.005)
+            self.assertEqual(virtual.intensities, [0, 0, 0, 0])
+            self.assertEqual(simulator.controllers[0].records, [])
+
+
+class TestSimulator(unittest.IsolatedAsyncioTestCase):
+    async def test_async_network_controller(self):
+        """
+        Test that an AsyncNetworkController updates the state of a virtual controller
+        """
+        async with Simulator(tolerance=TOLERANCE) as simulator:
+            virtual = simulator.controllers[0]
+            lights = AsyncNetworkController(4, simulator.host, virtual.port)
+
+            await lights.connect()
+            await lights.set_strobe_mode(2, 5)
+            await lights.destroy()
+
+            # 8 initialization commands, 1 strobe command and 4 off commands
+            while len(virtual.records) < 13:
+                await asyncio.sleep(0.001)
+
+        self.assertEqual(virtual.strobe_modes, [1, 5, 1, 1])